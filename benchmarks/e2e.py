@@ -0,0 +1,209 @@
+"""
+End-to-end turn benchmark against the offline fake model server.
+
+Starts `fake_model_server.py` in a subprocess, points `BASE_URL` at it and
+runs representative flows through `HealthWellnessPlannerAgent`: goal, meal
+plan, workout, injury handoff and nutrition handoff. For every flow it
+reports turn latency, time to first token (streaming), process CPU per turn
+and model calls per turn. With the model's latency fixed by the server, the
+CPU and the latency above it are this system's own overhead.
+
+Usage:
+    PYTHONPATH=. python benchmarks/e2e.py
+    PYTHONPATH=. python benchmarks/e2e.py --turns 20 --latency 0.05 --flows goal workout
+    PYTHONPATH=. python benchmarks/e2e.py --no-stream --speculative --json e2e.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_model_server import ServerConfig, add_server_arguments, config_from_arguments, running_server
+
+
+FLOWS: Dict[str, str] = {
+    "goal": "My goal is to lose 5 kg in 2 months",
+    "meal_plan": "Please make me a vegetarian meal plan with 1800 calories a day",
+    "workout": "Recommend a beginner workout I can do three times a week",
+    "injury_handoff": "I have a knee injury from running, which exercises are still safe?",
+    "nutrition_handoff": "I have diabetes and need help planning what I eat",
+}
+
+
+@dataclass
+class FlowResult:
+    latencies: List[float] = field(default_factory=list)
+    ttfts: List[float] = field(default_factory=list)
+    cpu: List[float] = field(default_factory=list)
+    model_calls: List[int] = field(default_factory=list)
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "turns": len(self.latencies),
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "latency_ms": summarize(self.latencies),
+            "ttft_ms": summarize(self.ttfts),
+            "cpu_ms": summarize(self.cpu),
+            "model_calls_per_turn": round(statistics.mean(self.model_calls), 2) if self.model_calls else 0,
+        }
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def summarize(seconds: List[float]) -> Dict[str, float]:
+    if not seconds:
+        return {}
+    return {
+        "p50": round(percentile(seconds, 50) * 1000, 1),
+        "p95": round(percentile(seconds, 95) * 1000, 1),
+        "p99": round(percentile(seconds, 99) * 1000, 1),
+        "mean": round(statistics.mean(seconds) * 1000, 1),
+    }
+
+
+def configure_environment(base_url: str):
+    """Point the app at the fake server; must run before anything imports src.config."""
+
+    os.environ["BASE_URL"] = base_url
+    # initialize() only checks these are set
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("LOGFIRE_TOKEN", "benchmark")
+    os.environ.setdefault("LOGFIRE_SEND_TO_LOGFIRE", "false")
+    os.environ.setdefault("LOGFIRE_CONSOLE", "false")
+    os.environ.setdefault("TELEMETRY_CONSOLE", "false")
+    os.environ.setdefault("SESSION_STORE_ENABLED", "false")
+
+
+async def run_turn(flow: str, prompt: str, turn: int, stream: bool, speculative: bool) -> Dict[str, object]:
+    from src.agent import HealthWellnessPlannerAgent
+    from src.context import UserSessionContext
+
+    # A fresh user per turn, so every turn takes the same path
+    user = UserSessionContext(name="Benchmark", uid=f"benchmark-{flow}-{turn}")
+    agent = HealthWellnessPlannerAgent(user, speculative=speculative)
+
+    ttft = None
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    # Guardrails and tools print as they go
+    with contextlib.redirect_stdout(io.StringIO()):
+        if stream:
+            response = agent.streaming(prompt)
+            async for _ in response.chunks():
+                pass
+            ttft = response.metrics.time_to_first_token
+            if response.metrics.outcome != "completed":
+                raise RuntimeError(f"stream ended as {response.metrics.outcome}")
+        else:
+            await agent.chat(prompt)
+
+    return {
+        "latency": time.perf_counter() - started,
+        "cpu": time.process_time() - cpu_started,
+        "ttft": ttft,
+    }
+
+
+async def run_benchmark(args: argparse.Namespace, stats_url: str) -> Dict[str, FlowResult]:
+    import httpx
+
+    from src.config import HTTP_WARMUP_CONNECTIONS, initialize
+    from src.telemetry import telemetry
+    from src.transport import warm_up_connections
+
+    await warm_up_connections(initialize(), HTTP_WARMUP_CONNECTIONS)
+
+    results: Dict[str, FlowResult] = {}
+    async with httpx.AsyncClient() as stats_client:
+        for flow in args.flows:
+            result = results[flow] = FlowResult()
+            for turn in range(args.warmup + args.turns):
+                await stats_client.post(f"{stats_url}/reset")
+                try:
+                    measured = await run_turn(flow, FLOWS[flow], turn, args.stream, args.speculative)
+                except Exception as e:
+                    result.failures += 1
+                    result.last_error = f"{type(e).__name__}: {e}"
+                    continue
+                if turn < args.warmup:
+                    continue
+
+                calls = (await stats_client.get(stats_url)).json()["requests"]
+                result.latencies.append(measured["latency"])
+                result.cpu.append(measured["cpu"])
+                result.model_calls.append(calls)
+                if measured["ttft"] is not None:
+                    result.ttfts.append(measured["ttft"])
+
+    await telemetry.aclose()
+    return results
+
+
+def print_report(results: Dict[str, FlowResult], config: ServerConfig, stream: bool):
+    print(f"\nModel latency {config.latency * 1000:.0f}ms per call, {config.chunk_delay * 1000:.0f}ms between chunks, "
+          f"{'streaming' if stream else 'non-streaming'} turns")
+    print(f"\n{'flow':<18} {'turns':>5} {'calls':>5} {'p50 ms':>8} {'p95 ms':>8} {'ttft p50':>9} "
+          f"{'ttft p95':>9} {'cpu ms':>7} {'fail':>5}")
+    for flow, result in results.items():
+        summary = result.as_dict()
+        latency, ttft, cpu = summary["latency_ms"], summary["ttft_ms"], summary["cpu_ms"]
+        print(f"{flow:<18} {summary['turns']:>5} {summary['model_calls_per_turn']:>5} "
+              f"{latency.get('p50', 0):>8} {latency.get('p95', 0):>8} {ttft.get('p50', '-'):>9} "
+              f"{ttft.get('p95', '-'):>9} {cpu.get('mean', 0):>7} {summary['failures']:>5}")
+        if result.last_error:
+            print(f"  last error: {result.last_error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", nargs="+", choices=list(FLOWS), default=list(FLOWS))
+    parser.add_argument("--turns", type=int, default=10, help="measured turns per flow")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured turns per flow")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--speculative", action="store_true", help="run guardrails alongside the model call")
+    parser.add_argument("--json", help="also write the results to this file")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    config = config_from_arguments(args)
+    with running_server(config) as base_url:
+        configure_environment(base_url)
+        stats_url = base_url.removesuffix("v1/") + "stats"
+        results = asyncio.run(run_benchmark(args, stats_url))
+
+    print_report(results, config, args.stream)
+    if args.json:
+        report = {
+            "server": vars(config),
+            "stream": args.stream,
+            "speculative": args.speculative,
+            "flows": {flow: result.as_dict() for flow, result in results.items()},
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+    if any(result.failures for result in results.values()):
+        raise SystemExit("Some turns failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+Offline stand-in for the OpenAI-compatible chat-completions API.
+
+Point `BASE_URL` at it to run the whole agent system without reaching
+generativelanguage.googleapis.com. Replies are scripted, not generated:
+
+- Requests with a `response_format` JSON schema (guardrails, goal analyzer,
+  workout planner, ...) get a valid instance of the schema. Booleans are
+  `true`, so every guardrail passes; a few outputs have realistic overrides.
+- Requests with tools follow the scenario picked by a keyword in the latest
+  user message (see `SCENARIOS`): each step is a tool call, made once per
+  turn by the first agent that has the tool. Handoffs are tool calls too.
+- Everything else gets a canned text reply, streamed in chunks when
+  `stream` is set.
+
+Latency before the first byte, between stream chunks and its jitter are
+configurable. `GET /stats` reports the requests served, `POST /stats/reset`
+clears them.
+
+Usage:
+    python benchmarks/fake_model_server.py --port 8099 --latency 0.3 --chunk-delay 0.02
+    BASE_URL=http://127.0.0.1:8099/v1/ python -m src.cli.main
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+# Scenario keyword (matched in the latest user message) -> tool calls made in order
+SCENARIOS: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {
+    "goal": [
+        ("goal_analyzer", {"raw_text": "lose 5 kg in 2 months"}),
+    ],
+    "meal plan": [
+        ("meal_planner", {"preferences": {"diet": "vegetarian", "calories_per_day": 1800}}),
+    ],
+    "workout": [
+        ("workout_recommender", {"experience": "beginner"}),
+    ],
+    "injury": [
+        ("transfer_to_injurysupportagent", {}),
+        ("add_injury_note", {
+            "injury_description": "Knee pain when running",
+            "severity_level": "mild",
+            "affected_body_parts": ["knee"],
+            "restrictions": ["running", "jumping"],
+        }),
+    ],
+    "diabetes": [
+        ("transfer_to_nutritionexpertagent", {}),
+        ("medical_meal_planner", {"request": {
+            "condition": "diabetes",
+            "severity": "moderate",
+            "restrictions": ["added sugar"],
+            "requirements": {},
+        }}),
+    ],
+}
+
+# Structured outputs by schema title, merged over the generated instance
+STRUCTURED_OVERRIDES: Dict[str, Dict[str, Any]] = {
+    "Goal": {"action": "lose", "quantity": 5, "unit": "kg", "duration": 2, "timeframe_unit": "months"},
+    "HealthQueryValidation": {"query_category": "general_health", "confidence_score": 0.95},
+    "InjuryInput": {"injury_type": "knee pain", "severity_level": "mild"},
+    "NutritionInput": {"medical_condition": "diabetes", "severity": "moderate"},
+}
+
+REPLY = (
+    "Here is your plan. Start gently, stay consistent and listen to your body. "
+    "Drink plenty of water, sleep at least seven hours and log your progress every week "
+    "so we can adjust the plan together. You've got this!"
+)
+
+
+@dataclass
+class ServerConfig:
+    latency: float = 0.2
+    """Seconds before the first byte of every response."""
+    chunk_delay: float = 0.01
+    """Seconds between streamed chunks."""
+    chunk_chars: int = 12
+    jitter: float = 0.0
+    """Uniform random extra delay, as a fraction of each delay."""
+    reply_words: int = 0
+    """Length of text replies; 0 uses the canned reply as is."""
+    seed: Optional[int] = None
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    streamed: int = 0
+    structured: int = 0
+    tool_calls: int = 0
+    text_replies: int = 0
+    by_scenario: Dict[str, int] = field(default_factory=dict)
+
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "streamed": self.streamed,
+            "structured": self.structured,
+            "tool_calls": self.tool_calls,
+            "text_replies": self.text_replies,
+            "by_scenario": dict(self.by_scenario),
+        }
+
+
+#  ----------------------------- Scripting -----------------------------
+
+
+def instance_of(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """A value satisfying a JSON schema: first enum value, `true`, 1, one array item, ..."""
+
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return instance_of(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    for union in ("anyOf", "oneOf"):
+        if union in schema:
+            options = [option for option in schema[union] if option.get("type") != "null"]
+            return instance_of(options[0], defs) if options else None
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((item for item in kind if item != "null"), "null")
+    if kind == "object" or "properties" in schema:
+        return {name: instance_of(prop, defs) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [instance_of(schema.get("items", {}), defs)]
+    if kind == "boolean":
+        return True
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "string":
+        return "benchmark"
+    return None
+
+
+def structured_output(response_format: Dict[str, Any]) -> Dict[str, Any]:
+    schema = response_format.get("json_schema", {}).get("schema", {})
+    value = instance_of(schema)
+    if isinstance(value, dict):
+        value.update(STRUCTURED_OVERRIDES.get(schema.get("title", ""), {}))
+    return value
+
+
+def latest_user_text(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            content = message.get("content")
+            if isinstance(content, list):
+                return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+            return content or ""
+    return ""
+
+
+def tools_called_this_turn(messages: List[Dict[str, Any]]) -> set:
+    called = set()
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            break
+        for call in message.get("tool_calls") or []:
+            called.add(call["function"]["name"])
+    return called
+
+
+def next_tool_call(body: Dict[str, Any]) -> Tuple[Optional[str], Optional[Tuple[str, Dict[str, Any]]]]:
+    """(scenario, next step) for a request with tools; the step is None when the turn is done."""
+
+    messages = body.get("messages", [])
+    text = latest_user_text(messages).lower()
+    scenario = next((keyword for keyword in SCENARIOS if keyword in text), None)
+    if scenario is None:
+        return None, None
+
+    available = {tool["function"]["name"] for tool in body.get("tools") or [] if tool.get("type") == "function"}
+    called = tools_called_this_turn(messages)
+    for name, arguments in SCENARIOS[scenario]:
+        if name in available and name not in called:
+            return scenario, (name, arguments)
+    return scenario, None
+
+
+def reply_text(config: ServerConfig) -> str:
+    if not config.reply_words:
+        return REPLY
+    words = REPLY.split()
+    return " ".join(words[index % len(words)] for index in range(config.reply_words))
+
+
+def estimate_tokens(value: Any) -> int:
+    return max(1, len(json.dumps(value)) // 4)
+
+
+#  ----------------------------- Responses -----------------------------
+
+
+def create_app(config: ServerConfig) -> FastAPI:
+    app = FastAPI(title="Fake chat-completions model")
+    stats = ServerStats()
+    rng = random.Random(config.seed)
+
+
+    async def delay(seconds: float):
+        if config.jitter:
+            seconds += seconds * config.jitter * rng.random()
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+
+    @app.get("/v1/models")
+    async def models() -> Dict[str, Any]:
+        return {"object": "list", "data": [{"id": "gemini-2.0-flash", "object": "model", "owned_by": "benchmark"}]}
+
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, Any]:
+        return stats.as_dict()
+
+
+    @app.post("/stats/reset")
+    async def reset_stats() -> Dict[str, Any]:
+        nonlocal stats
+        stats = ServerStats()
+        return stats.as_dict()
+
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.requests += 1
+
+        content: Optional[str] = None
+        tool_call: Optional[Dict[str, Any]] = None
+
+        if body.get("response_format", {}).get("type") == "json_schema":
+            stats.structured += 1
+            content = json.dumps(structured_output(body["response_format"]))
+        else:
+            scenario, step = next_tool_call(body) if body.get("tools") else (None, None)
+            if scenario is not None:
+                stats.by_scenario[scenario] = stats.by_scenario.get(scenario, 0) + 1
+            if step is not None:
+                stats.tool_calls += 1
+                name, arguments = step
+                tool_call = {
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(arguments)},
+                }
+            else:
+                stats.text_replies += 1
+                content = reply_text(config)
+
+        usage = {
+            "prompt_tokens": estimate_tokens(body.get("messages", [])),
+            "completion_tokens": estimate_tokens(content or tool_call),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = body.get("model", "gemini-2.0-flash")
+
+        await delay(config.latency)
+
+        if body.get("stream"):
+            stats.streamed += 1
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(
+                stream_chunks(completion_id, model, content, tool_call, usage if include_usage else None),
+                media_type="text/event-stream",
+            )
+
+        message: Dict[str, Any] = {"role": "assistant", "content": content}
+        if tool_call is not None:
+            message["tool_calls"] = [tool_call]
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if tool_call else "stop",
+            }],
+            "usage": usage,
+        })
+
+
+    async def stream_chunks(
+        completion_id: str,
+        model: str,
+        content: Optional[str],
+        tool_call: Optional[Dict[str, Any]],
+        usage: Optional[Dict[str, int]],
+    ) -> AsyncIterator[str]:
+        created = int(time.time())
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        if tool_call is not None:
+            yield chunk({"role": "assistant", "tool_calls": [{"index": 0, **tool_call}]})
+            yield chunk({}, "tool_calls")
+        else:
+            text = content or ""
+            for start in range(0, len(text), config.chunk_chars):
+                if start:
+                    await delay(config.chunk_delay)
+                delta = {"content": text[start:start + config.chunk_chars]}
+                if not start:
+                    delta["role"] = "assistant"
+                yield chunk(delta)
+            yield chunk({}, "stop")
+
+        if usage is not None:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage,
+            }
+            yield f"data: {json.dumps(payload)}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+    return app
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", type=float, default=ServerConfig.latency, help="seconds before the first byte")
+    parser.add_argument("--chunk-delay", type=float, default=ServerConfig.chunk_delay, help="seconds between stream chunks")
+    parser.add_argument("--chunk-chars", type=int, default=ServerConfig.chunk_chars, help="characters per stream chunk")
+    parser.add_argument("--jitter", type=float, default=ServerConfig.jitter, help="random extra delay, fraction of each delay")
+    parser.add_argument("--reply-words", type=int, default=ServerConfig.reply_words, help="words per text reply")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the jitter")
+
+
+def config_from_arguments(args: argparse.Namespace) -> ServerConfig:
+    return ServerConfig(
+        latency=args.latency,
+        chunk_delay=args.chunk_delay,
+        chunk_chars=max(1, args.chunk_chars),
+        jitter=args.jitter,
+        reply_words=args.reply_words,
+        seed=args.seed,
+    )
+
+
+@contextmanager
+def running_server(config: ServerConfig, startup_timeout: float = 15.0) -> Iterator[str]:
+    """Run the server in a subprocess, so it doesn't share the caller's CPU; yields its base URL."""
+
+    import httpx
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    command = [
+        sys.executable, __file__, "--port", str(port),
+        "--latency", str(config.latency),
+        "--chunk-delay", str(config.chunk_delay),
+        "--chunk-chars", str(config.chunk_chars),
+        "--jitter", str(config.jitter),
+        "--reply-words", str(config.reply_words),
+    ]
+    if config.seed is not None:
+        command += ["--seed", str(config.seed)]
+
+    process = subprocess.Popen(command)
+    root = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                httpx.get(f"{root}/stats", timeout=1.0).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Fake model server did not start")
+                time.sleep(0.1)
+        yield f"{root}/v1/"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(config_from_arguments(args)), host=args.host, port=args.port, log_level="warning")
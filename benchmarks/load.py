@@ -0,0 +1,212 @@
+"""
+Multi-session load generator: how many concurrent users one process can hold.
+
+Starts `fake_model_server.py` in a subprocess and keeps a growing population
+of simulated users, each with its own `HealthWellnessPlannerAgent` (history,
+hooks and context), alive for the whole run, as a Chainlit or API process
+does. At every step the population grows to the next size and every user
+takes `--turns` turns, at most `--concurrency` turns at a time. Each step
+reports throughput, turn latency percentiles, event-loop lag and resident
+memory per session.
+
+Usage:
+    PYTHONPATH=. python benchmarks/load.py
+    PYTHONPATH=. python benchmarks/load.py --sessions 1000 2000 5000 --concurrency 500 --latency 0.2
+    PYTHONPATH=. python benchmarks/load.py --sessions 200 --tracemalloc --json load.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from e2e import FLOWS, configure_environment, summarize
+from fake_model_server import add_server_arguments, config_from_arguments, running_server
+
+
+LOOP_LAG_INTERVAL = 0.05
+
+
+def resident_memory() -> int:
+    """Current resident set size in bytes (peak RSS where /proc is unavailable)."""
+
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StepResult:
+    sessions: int
+    turns: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+    wall_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    loop_lags: List[float] = field(default_factory=list)
+    rss_bytes: int = 0
+    heap_bytes: Optional[int] = None
+
+
+    def as_dict(self, baseline_rss: int, baseline_heap: Optional[int]) -> Dict[str, object]:
+        result = {
+            "sessions": self.sessions,
+            "turns": self.turns,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "throughput_turns_per_second": round(self.turns / self.wall_seconds, 1) if self.wall_seconds else 0.0,
+            "latency_ms": summarize(self.latencies),
+            "loop_lag_ms": {**summarize(self.loop_lags), "max": round(max(self.loop_lags, default=0.0) * 1000, 1)},
+            "rss_mb": round(self.rss_bytes / 2**20, 1),
+            "rss_per_session_kb": round((self.rss_bytes - baseline_rss) / self.sessions / 1024, 1),
+        }
+        if self.heap_bytes is not None and baseline_heap is not None:
+            result["heap_per_session_kb"] = round((self.heap_bytes - baseline_heap) / self.sessions / 1024, 1)
+        return result
+
+
+async def monitor_loop_lag(samples: List[float]):
+    """How late the event loop wakes a task that sleeps for a fixed interval."""
+
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - started - LOOP_LAG_INTERVAL))
+
+
+async def run_session_turns(agent, index: int, turn_offset: int, args: argparse.Namespace, limit: asyncio.Semaphore, step: StepResult):
+    from src.admission import current_uid
+
+    # Fair queuing for model calls is per user
+    current_uid.set(agent.user.uid)
+    prompts = list(FLOWS.values())
+
+    for turn in range(args.turns):
+        prompt = prompts[(index + turn_offset + turn) % len(prompts)]
+        async with limit:
+            started = time.perf_counter()
+            try:
+                if args.stream:
+                    response = agent.streaming(prompt)
+                    async for _ in response.chunks():
+                        pass
+                else:
+                    await agent.chat(prompt)
+            except Exception as e:
+                step.failures += 1
+                step.last_error = f"{type(e).__name__}: {e}"
+                continue
+            step.latencies.append(time.perf_counter() - started)
+            step.turns += 1
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, object]:
+    from src.agent import HealthWellnessPlannerAgent
+    from src.config import HTTP_WARMUP_CONNECTIONS, initialize
+    from src.context import UserSessionContext
+    from src.telemetry import telemetry
+    from src.transport import warm_up_connections
+
+    await warm_up_connections(initialize(), HTTP_WARMUP_CONNECTIONS)
+
+    gc.collect()
+    baseline_rss = resident_memory()
+    baseline_heap = tracemalloc.get_traced_memory()[0] if args.tracemalloc else None
+
+    agents: List[HealthWellnessPlannerAgent] = []
+    steps: List[StepResult] = []
+    limit = asyncio.Semaphore(args.concurrency)
+
+    for step_index, sessions in enumerate(sorted(args.sessions)):
+        while len(agents) < sessions:
+            user = UserSessionContext(name=f"Load User {len(agents)}", uid=f"load-{len(agents)}")
+            agents.append(HealthWellnessPlannerAgent(user, speculative=args.speculative))
+
+        step = StepResult(sessions=sessions)
+        monitor = asyncio.create_task(monitor_loop_lag(step.loop_lags))
+        started = time.perf_counter()
+        # Guardrails and tools print as they go
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*(
+                run_session_turns(agent, index, step_index * args.turns, args, limit, step)
+                for index, agent in enumerate(agents)
+            ))
+        step.wall_seconds = time.perf_counter() - started
+        monitor.cancel()
+
+        gc.collect()
+        step.rss_bytes = resident_memory()
+        if args.tracemalloc:
+            step.heap_bytes = tracemalloc.get_traced_memory()[0]
+        steps.append(step)
+        print_step(step.as_dict(baseline_rss, baseline_heap), first=step_index == 0)
+
+    await telemetry.aclose()
+    return {
+        "baseline_rss_mb": round(baseline_rss / 2**20, 1),
+        "steps": [step.as_dict(baseline_rss, baseline_heap) for step in steps],
+    }
+
+
+def print_step(step: Dict[str, object], first: bool):
+    if first:
+        print(f"\n{'sessions':>8} {'turns':>7} {'turns/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'lag p99':>8} {'lag max':>8} {'rss MB':>8} {'KB/sess':>8} {'heap KB':>8} {'fail':>5}")
+    latency, lag = step["latency_ms"], step["loop_lag_ms"]
+    print(f"{step['sessions']:>8} {step['turns']:>7} {step['throughput_turns_per_second']:>8} "
+          f"{latency.get('p50', 0):>8} {latency.get('p95', 0):>8} {latency.get('p99', 0):>8} "
+          f"{lag.get('p99', 0):>8} {lag['max']:>8} {step['rss_mb']:>8} {step['rss_per_session_kb']:>8} "
+          f"{step.get('heap_per_session_kb', '-'):>8} {step['failures']:>5}")
+    if step["last_error"]:
+        print(f"  last error: {step['last_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 500, 1000, 2000],
+                        help="population sizes to step through")
+    parser.add_argument("--turns", type=int, default=1, help="turns every session takes at each step")
+    parser.add_argument("--concurrency", type=int, default=200, help="turns in flight at once")
+    parser.add_argument("--llm-concurrency", type=int, default=None,
+                        help="LLM_MAX_CONCURRENCY for this run (defaults to the environment's)")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--speculative", action="store_true", help="run guardrails alongside the model call")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report Python heap per session (slower)")
+    parser.add_argument("--json", help="also write the results to this file")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    if args.llm_concurrency is not None:
+        os.environ["LLM_MAX_CONCURRENCY"] = str(args.llm_concurrency)
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    config = config_from_arguments(args)
+    with running_server(config) as base_url:
+        configure_environment(base_url)
+        print(f"Model latency {config.latency * 1000:.0f}ms per call, {args.concurrency} turns in flight, "
+              f"{args.turns} turn(s) per session per step")
+        report = asyncio.run(run_load(args))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"server": vars(config), **report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
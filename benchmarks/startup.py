@@ -0,0 +1,99 @@
+"""
+Cold-start benchmark: how long importing an entry point takes, and which modules it costs.
+
+Each run imports the target module in a fresh interpreter with `-X importtime`
+and parses the per-module timings. Reports the median total, the slowest
+modules by cumulative time, and whether any deferred dependency was imported.
+
+Usage:
+    PYTHONPATH=. python benchmarks/startup.py
+    PYTHONPATH=. python benchmarks/startup.py --module src.api.server --runs 10 --top 30
+    PYTHONPATH=. python benchmarks/startup.py --max-ms 1500   # non-zero exit above the budget
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+# Imported on first use only; an entry point importing any of these has regressed
+DEFERRED_MODULES = ("google_auth_oauthlib", "googleapiclient", "ics", "logfire", "numpy")
+
+
+def import_times(module: str, initialize: bool) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Wall time in ms, and module -> (self us, cumulative us) for one cold import."""
+
+    code = f"import {module}"
+    if initialize:
+        code += "; import src.config; src.config.initialize()"
+
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    # initialize() only checks these are set
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env.setdefault("LOGFIRE_TOKEN", "benchmark")
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return wall_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.cli.main", help="entry point module to import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20, help="slowest modules to list")
+    parser.add_argument("--initialize", action="store_true", help="also time src.config.initialize()")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median wall time exceeds this")
+    args = parser.parse_args()
+
+    walls: List[float] = []
+    cumulative: Dict[str, List[int]] = defaultdict(list)
+    self_times: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        wall_ms, modules = import_times(args.module, args.initialize)
+        walls.append(wall_ms)
+        for name, (self_us, cumulative_us) in modules.items():
+            self_times[name].append(self_us)
+            cumulative[name].append(cumulative_us)
+
+    median_wall = statistics.median(walls)
+    print(f"{args.module}: median {median_wall:.0f}ms wall over {args.runs} runs "
+          f"(min {min(walls):.0f}ms, max {max(walls):.0f}ms), {len(cumulative)} modules imported")
+
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    slowest = sorted(cumulative, key=lambda name: statistics.median(cumulative[name]), reverse=True)
+    for name in slowest[:args.top]:
+        print(f"{statistics.median(cumulative[name]) / 1000:>14.1f} {statistics.median(self_times[name]) / 1000:>9.1f}  {name}")
+
+    print(f"\n{'cumulative ms':>14}  project module")
+    for name in slowest:
+        if name == "src" or name.startswith("src."):
+            print(f"{statistics.median(cumulative[name]) / 1000:>14.1f}  {name}")
+
+    deferred = sorted(name for name in cumulative if name.split(".")[0] in DEFERRED_MODULES and "." not in name)
+    print(f"\nDeferred dependencies imported at startup: {', '.join(deferred) if deferred else 'none'}")
+
+    if args.max_ms is not None and median_wall > args.max_ms:
+        raise SystemExit(f"Median start-up {median_wall:.0f}ms exceeds the {args.max_ms:.0f}ms budget")
+
+
+if __name__ == "__main__":
+    main()
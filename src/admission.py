@@ -0,0 +1,202 @@
+"""
+Global admission control for outbound model calls.
+
+Every request the shared OpenAI-compatible client sends goes through
+`AdmissionTransport`, which holds one of a fixed number of slots for the
+lifetime of the HTTP exchange (including a streamed body). Waiting calls are
+queued per user and granted round-robin across users, so one user with many
+concurrent guardrail and tool calls cannot starve everyone else. Entry points
+check `saturated` before starting a turn and reject with a retry hint instead
+of growing the queue without bound. The shared controller is
+`src.config.admission_controller`.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict
+
+import httpx
+
+
+# The user on whose behalf the current task calls the model; inherited by tasks the Runner spawns
+current_uid: ContextVar[str] = ContextVar("llm_admission_uid", default="anonymous")
+
+# Smoothing factor of the moving average of model call durations
+CALL_DURATION_ALPHA = 0.2
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    queued: int = 0
+    rejected: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.queued, 4) if self.queued else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 4),
+        }
+
+
+class FairAdmissionController:
+    """Concurrency limit with per-user FIFO queues served round-robin."""
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.stats = AdmissionStats()
+        self.active = 0
+        self.waiting = 0
+        self._queues: "OrderedDict[str, deque[asyncio.Future[None]]]" = OrderedDict()
+        self._avg_call_seconds = 1.0
+
+
+    @property
+    def saturated(self) -> bool:
+        """True when new work should be turned away rather than queued."""
+        return self.waiting >= self.max_queue
+
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain."""
+        rounds = (self.waiting + 1) / self.max_concurrency
+        return max(1, round(rounds * self._avg_call_seconds))
+
+
+    def reject(self):
+        self.stats.rejected += 1
+
+
+    async def acquire(self, key: str):
+        if self.active < self.max_concurrency and not self.waiting:
+            self.active += 1
+            self.stats.admitted += 1
+            return
+
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        self.waiting += 1
+        self.stats.queued += 1
+        queued_at = time.perf_counter()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot on
+                self.release()
+            else:
+                self._discard(key, future)
+            raise
+
+        waited = time.perf_counter() - queued_at
+        self.stats.admitted += 1
+        self.stats.total_wait_seconds += waited
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+
+
+    def release(self):
+        self.active -= 1
+        self._grant_next()
+
+
+    def record_call(self, seconds: float):
+        self._avg_call_seconds += CALL_DURATION_ALPHA * (seconds - self._avg_call_seconds)
+
+
+    def _grant_next(self):
+        while self.active < self.max_concurrency and self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            self.waiting -= 1
+            # Serve the next user on the following grant
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+
+            self.active += 1
+            future.set_result(None)
+
+
+    def _discard(self, key: str, future: "asyncio.Future[None]"):
+        queue = self._queues.get(key)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        self.waiting -= 1
+        if not queue:
+            del self._queues[key]
+
+
+class _SlotReleasingStream(httpx.AsyncByteStream):
+    """Response body that gives the admission slot back once it is consumed or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class AdmissionTransport(httpx.AsyncBaseTransport):
+    """httpx transport that admits requests through a `FairAdmissionController`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, controller: "FairAdmissionController"):
+        self._transport = transport
+        self._controller = controller
+
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        controller = self._controller
+        await controller.acquire(current_uid.get())
+        started = time.perf_counter()
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                controller.record_call(time.perf_counter() - started)
+                controller.release()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        if response.is_closed:
+            # Body already read in full (e.g. a prebuilt response)
+            release()
+        else:
+            # Streamed completions keep their slot until the body is closed
+            response.stream = _SlotReleasingStream(response.stream, release)
+        return response
+
+
+    async def aclose(self):
+        await self._transport.aclose()
+
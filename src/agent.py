@@ -1,16 +1,22 @@
+import asyncio
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
-from typing import Callable, List
+from typing import Callable, List, Optional
 
-from agents import InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered, RawResponsesStreamEvent, Runner, TResponseInputItem
+from agents import InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered, RawResponsesStreamEvent, RunConfig, RunContextWrapper, RunResult, Runner, TResponseInputItem
+from agents.result import RunResultBase
 from openai.types.responses import ResponseTextDeltaEvent
 
+from src.config import SPECULATIVE_EXECUTION, initialize
 from src.context import UserSessionContext
+from src.history import ConversationHistory
 from src.hooks import HealthWellnessHooks
+from src.latency import StreamMetrics
+from src.session_store import SessionStore
 from src.my_agents.main_agent import main_agent
 from src.guardrails.guardrail_exceptions import handle_guardrail_exception
-import src.config
+from src.speculation import SpeculationGate, SpeculativeModelProvider, run_input_guardrails, withhold_until_verdict
 
 
 @dataclass
@@ -20,30 +26,48 @@ class Stream:
     
     final_output: str
     """The complete final output string from the stream. This is None until the agent has finished running."""
+    
+    metrics: StreamMetrics = field(default_factory=StreamMetrics)
+    """Time to first token, inter-chunk gaps, duration and chunk/byte counts, filled in while `chunks` is consumed."""
 
 class HealthWellnessPlannerAgent:
     """Agent for health and wellness planning with streaming capabilities and guardrail protection."""
 
-    def __init__(self, user: UserSessionContext):
+    def __init__(
+        self,
+        user: UserSessionContext,
+        speculative: Optional[bool] = None,
+        session_store: Optional[SessionStore] = None,
+    ):
+        # No-op when the entry point already initialized
+        initialize()
         self.agent = main_agent
         self.user = user
-        self.history: List[TResponseInputItem] = []
-        self.hooks = HealthWellnessHooks()
+        self.history = ConversationHistory()
+        # Tool and agent hooks persist the session's changes to the store
+        self.hooks = HealthWellnessHooks(session_store=session_store)
+        
+        # Speculative mode starts the model call alongside the input guardrails
+        self.speculative = SPECULATIVE_EXECUTION if speculative is None else speculative
+        self._speculative_agent = main_agent.clone(input_guardrails=[])
  
     
     async def chat(self, prompt: str) -> str:
         """Process a chat message and return the agent's response."""
 
-        new_history = self.history + [{"role": "user", "content": prompt}]
+        new_history = self.history.build_input(prompt)
         try:
-            result = await Runner.run(
-                starting_agent=self.agent,
-                input=new_history,
-                context=self.user,
-                hooks=self.hooks,
-            )
+            if self.speculative:
+                result = await self._run_speculative(new_history)
+            else:
+                result = await Runner.run(
+                    starting_agent=self.agent,
+                    input=new_history,
+                    context=self.user,
+                    hooks=self.hooks,
+                )
             
-            self.history += result.to_input_list()
+            self._record_turn(prompt, result)
             return result.final_output
 
         except (InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered) as e:
@@ -63,23 +87,46 @@ class HealthWellnessPlannerAgent:
     def streaming(self, prompt: str) -> Stream:
         """Process a chat message and return a streaming response with chunks."""
 
-        new_history = self.history + [{"role": "user", "content": prompt}]
+        # Started before the run so time to first token includes the whole request
+        metrics = StreamMetrics()
+        new_history = self.history.build_input(prompt)
         
-        result = Runner.run_streamed(
-            starting_agent=self.agent,
-            input=new_history,
-            context=self.user,
-            hooks=self.hooks,
-        )
+        if self.speculative:
+            gate = SpeculationGate()
+            result = Runner.run_streamed(
+                starting_agent=self._speculative_agent,
+                input=new_history,
+                context=self.user,
+                hooks=self.hooks,
+                run_config=RunConfig(model_provider=SpeculativeModelProvider(gate)),
+            )
+            verdict = asyncio.create_task(
+                run_input_guardrails(self.agent, new_history, RunContextWrapper(context=self.user))
+            )
+            events = withhold_until_verdict(result, verdict, gate, self.hooks.speculation)
+        else:
+            result = Runner.run_streamed(
+                starting_agent=self.agent,
+                input=new_history,
+                context=self.user,
+                hooks=self.hooks,
+            )
+            events = result.stream_events()
         
         async def chunks() -> AsyncIterator[str]:
+            outcome = "cancelled"
             try:
-                async for event in result.stream_events():
+                async for event in events:
                     if isinstance(event, RawResponsesStreamEvent) and isinstance(event.data, ResponseTextDeltaEvent):
                         chunk = event.data.delta
+                        metrics.record_chunk(chunk)
                         yield chunk
+                
+                outcome = "completed"
+                self._record_turn(prompt, result)
                         
             except (InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered) as e:
+                outcome = "guardrail"
                 # Handle guardrail exceptions that occur during streaming
                 agent_name = e.run_data.last_agent.name if e.run_data else self.agent.name
                 
@@ -93,10 +140,53 @@ class HealthWellnessPlannerAgent:
                     user_uid=self.user.uid
                 )
                 
-                # Yield the error message as chunks
+                # Yield the error message as chunks; they are not model output, so
+                # they stay out of the time to first token and inter-chunk gaps
                 for word in response_message.split(' '):
                     yield word + ' '
+            
+            except Exception:
+                outcome = "error"
+                raise
+            
+            finally:
+                if metrics.ended_at is None:
+                    metrics.finish(outcome)
+                    self.hooks.record_stream(metrics)
         
-        self.history += result.to_input_list()
-        return Stream(chunks=chunks, final_output=result.final_output)
+        return Stream(chunks=chunks, final_output=result.final_output, metrics=metrics)
+
+
+    def _record_turn(self, prompt: str, result: RunResultBase):
+        """Store only the items generated this turn; compaction, if over budget, runs in the background."""
+        
+        self.history.record_turn(prompt, [item.to_input_item() for item in result.new_items])
+        self.history.schedule_compaction()
+
+
+    async def _run_speculative(self, new_history: List[TResponseInputItem]) -> RunResult:
+        """Run the main agent concurrently with its input guardrails, committing only on a pass."""
 
+        gate = SpeculationGate()
+        run_task = asyncio.create_task(
+            Runner.run(
+                starting_agent=self._speculative_agent,
+                input=new_history,
+                context=self.user,
+                hooks=self.hooks,
+                run_config=RunConfig(model_provider=SpeculativeModelProvider(gate)),
+            )
+        )
+        
+        try:
+            await run_input_guardrails(self.agent, new_history, RunContextWrapper(context=self.user))
+        except BaseException:
+            gate.reject()
+            self.hooks.speculation.record_abort(gate)
+            run_task.cancel()
+            await asyncio.gather(run_task, return_exceptions=True)
+            raise
+        
+        gate.open()
+        self.hooks.speculation.record_commit(gate)
+        return await run_task
@@ -0,0 +1,229 @@
+"""
+HTTP and WebSocket API serving many users concurrently.
+
+Turns of the same user are serialized with a per-uid lock, while turns of
+different users run concurrently. Only a few turns of one user may wait for
+that lock; more are rejected with 429. Model calls are admitted through the shared
+fair-queuing `admission_controller`; when its queue is full new turns are
+rejected with 429 and a Retry-After hint instead of queueing indefinitely.
+
+Run with:
+    uvicorn src.api.server:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+from src.admission import current_uid
+from src.agent import HealthWellnessPlannerAgent
+from src.config import HTTP_WARMUP_CONNECTIONS, admission_controller, initialize
+from src.context import UserSessionContext
+from src.latency import span_metrics
+from src.session_store import get_session_store
+from src.telemetry import telemetry
+from src.transport import transport_stats, warm_up_connections
+
+
+# Agents (and their in-memory conversation history) kept in memory at once
+MAX_ACTIVE_SESSIONS = int(os.getenv("API_MAX_ACTIVE_SESSIONS", "1000"))
+# Turns of one user allowed to wait behind the one in progress
+MAX_WAITING_TURNS_PER_USER = int(os.getenv("API_MAX_WAITING_TURNS_PER_USER", "2"))
+# Retry-After hint for a user whose turn queue is full
+USER_BUSY_RETRY_AFTER_SECONDS = 1
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ChatRequest(BaseModel):
+    uid: str
+    message: str
+    name: Optional[str] = None
+
+
+class ChatResponse(BaseModel):
+    uid: str
+    response: str
+
+
+class UserBusy(Exception):
+    """The user already has as many turns waiting as allowed."""
+
+
+class SessionRegistry:
+    """In-memory agents per uid, each guarded by a lock so a user's turns never interleave."""
+
+    def __init__(self, max_sessions: int = MAX_ACTIVE_SESSIONS, max_waiting_turns: int = MAX_WAITING_TURNS_PER_USER):
+        self.max_sessions = max_sessions
+        self.max_waiting_turns = max_waiting_turns
+        self._agents: "OrderedDict[str, HealthWellnessPlannerAgent]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiting: Dict[str, int] = {}
+
+
+    @asynccontextmanager
+    async def turn(self, uid: str, name: Optional[str] = None) -> AsyncIterator[HealthWellnessPlannerAgent]:
+        """Run a turn of `uid` once its earlier turns are done; raises `UserBusy` if too many are waiting."""
+
+        lock = self._locks.setdefault(uid, asyncio.Lock())
+        waiting = self._waiting.get(uid, 0)
+        if lock.locked() and waiting >= self.max_waiting_turns:
+            raise UserBusy(uid)
+
+        self._waiting[uid] = waiting + 1
+        try:
+            await lock.acquire()
+        finally:
+            if self._waiting[uid] == 1:
+                del self._waiting[uid]
+            else:
+                self._waiting[uid] -= 1
+
+        try:
+            agent = await self._get_agent(uid, name)
+            token = current_uid.set(uid)
+            try:
+                yield agent
+            finally:
+                current_uid.reset(token)
+        finally:
+            lock.release()
+
+
+    async def _get_agent(self, uid: str, name: Optional[str]) -> HealthWellnessPlannerAgent:
+        agent = self._agents.get(uid)
+        if agent is None:
+            store = get_session_store()
+            user = (await store.aload(uid) if store else None) or UserSessionContext(name=name or "Friend", uid=uid)
+            agent = HealthWellnessPlannerAgent(user, session_store=store)
+            self._agents[uid] = agent
+            self._evict()
+        self._agents.move_to_end(uid)
+
+        if name and agent.user.name != name:
+            agent.user.name = name
+        return agent
+
+
+    def _evict(self):
+        # Least recently used first, skipping users with a turn in progress or waiting
+        for uid in list(self._agents):
+            if len(self._agents) <= self.max_sessions:
+                return
+            lock = self._locks.get(uid)
+            if (lock is not None and lock.locked()) or uid in self._waiting:
+                continue
+            del self._agents[uid]
+            self._locks.pop(uid, None)
+            store = get_session_store()
+            if store is not None:
+                store.forget(uid)
+
+
+registry = SessionRegistry()
+
+
+def _admission_error() -> Optional[int]:
+    """Retry-After seconds if the model queue is full, else None."""
+    if not admission_controller.saturated:
+        return None
+    admission_controller.reject()
+    return admission_controller.retry_after()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_connections(initialize(), HTTP_WARMUP_CONNECTIONS)
+    yield
+    await telemetry.aclose()
+
+
+app = FastAPI(title="Health & Wellness Planner API", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health() -> Dict[str, object]:
+    return {
+        "status": "ok",
+        "active_model_calls": admission_controller.active,
+        "queued_model_calls": admission_controller.waiting,
+        "admission": admission_controller.stats.as_dict(),
+        "connection_pool": transport_stats.as_dict(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Agent, tool and handoff latency histograms of every session, for Prometheus to scrape."""
+    return PlainTextResponse(span_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest) -> ChatResponse:
+    retry_after = _admission_error()
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests in flight, please retry later.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    try:
+        async with registry.turn(request.uid, request.name) as agent:
+            response = await agent.chat(request.message)
+    except UserBusy:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many messages from this user are waiting, please retry later.",
+            headers={"Retry-After": str(USER_BUSY_RETRY_AFTER_SECONDS)},
+        )
+
+    return ChatResponse(uid=request.uid, response=response)
+
+
+@app.websocket("/ws/{uid}")
+async def chat_stream(websocket: WebSocket, uid: str):
+    """
+    Streaming chat. Send `{"message": "...", "name": "..."}`; receive `{"type": "chunk", "text": ...}`
+    messages followed by `{"type": "done"}`, or `{"type": "error", "status": 429, "retry_after": ...}`
+    when the service or this user's turn queue is full, or `{"type": "error", "status": 500}` when the
+    turn failed. The connection stays open after an error.
+    """
+
+    await websocket.accept()
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            message = payload.get("message", "")
+
+            retry_after = _admission_error()
+            if retry_after is not None:
+                await websocket.send_json({"type": "error", "status": 429, "retry_after": retry_after})
+                continue
+
+            try:
+                async with registry.turn(uid, payload.get("name")) as agent:
+                    stream = agent.streaming(message)
+                    async for chunk in stream.chunks():
+                        await websocket.send_json({"type": "chunk", "text": chunk})
+            except UserBusy:
+                await websocket.send_json({"type": "error", "status": 429, "retry_after": USER_BUSY_RETRY_AFTER_SECONDS})
+                continue
+            except WebSocketDisconnect:
+                raise
+            except Exception:
+                logger.exception("Turn of %s failed", uid)
+                await websocket.send_json({"type": "error", "status": 500, "detail": "The message could not be processed."})
+                continue
+
+            await websocket.send_json({"type": "done"})
+
+    except WebSocketDisconnect:
+        pass
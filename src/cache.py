@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Generic, Hashable, Optional, Protocol, TypeVar
+
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class CacheBackend(Protocol[V]):
+    """Interface shared by the in-memory and on-disk caches."""
+
+    stats: CacheStats
+
+    def get(self, key: str) -> Optional[V]: ...
+
+    def set(self, key: str, value: V): ...
+
+    def __len__(self) -> int: ...
+
+
+class LRUCache(Generic[V]):
+    """Bounded in-memory cache with least-recently-used eviction and an optional TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        stored_at, value = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+
+    def set(self, key: Hashable, value: V):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+
+    def clear(self):
+        self._entries.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+class DiskCache:
+    """
+    JSON-file cache in a directory with a bounded number of entries.
+
+    Each entry is one file named after the hashed key. Recency is tracked in memory
+    (seeded from file modification times on startup) and the least recently used
+    files are deleted once `max_entries` is exceeded.
+    """
+
+    def __init__(self, directory: str | Path, max_entries: int, ttl_seconds: Optional[float] = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+        # filename -> last write time, in least to most recently used order
+        self._index: "OrderedDict[str, float]" = OrderedDict(
+            sorted(
+                ((entry.name, entry.stat().st_mtime) for entry in os.scandir(self.directory) if entry.name.endswith(".json")),
+                key=lambda item: item[1],
+            )
+        )
+        self._evict()
+
+
+    @staticmethod
+    def _filename(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest() + ".json"
+
+
+    def get(self, key: str) -> Optional[Any]:
+        filename = self._filename(key)
+        written_at = self._index.get(filename)
+        if written_at is None:
+            self.stats.misses += 1
+            return None
+
+        if self.ttl_seconds is not None and time.time() - written_at > self.ttl_seconds:
+            self.delete(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        try:
+            with open(self.directory / filename, encoding="utf-8") as file:
+                value = json.load(file)
+        except (OSError, ValueError):
+            self._index.pop(filename, None)
+            self.stats.misses += 1
+            return None
+
+        self._index.move_to_end(filename)
+        self.stats.hits += 1
+        return value
+
+
+    def set(self, key: str, value: Any):
+        filename = self._filename(key)
+        path = self.directory / filename
+        temp_path = path.with_suffix(".tmp")
+
+        # Write then rename so readers never see a partial file
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(value, file, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+        self._index[filename] = time.time()
+        self._index.move_to_end(filename)
+        self._evict()
+
+
+    def delete(self, key: str):
+        filename = self._filename(key)
+        self._index.pop(filename, None)
+        try:
+            os.remove(self.directory / filename)
+        except FileNotFoundError:
+            pass
+
+
+    def _evict(self):
+        while len(self._index) > self.max_entries:
+            filename, _ = self._index.popitem(last=False)
+            try:
+                os.remove(self.directory / filename)
+            except FileNotFoundError:
+                pass
+            self.stats.evictions += 1
+
+
+    def __len__(self) -> int:
+        return len(self._index)
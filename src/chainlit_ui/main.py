@@ -1,15 +1,20 @@
 from typing import Any, Dict, cast
-from uuid import uuid4
 import chainlit as cl
 from chainlit.input_widget import TextInput
 
 from src.context import UserSessionContext
 from src.agent import HealthWellnessPlannerAgent
+from src.session_store import get_session_store, session_uid
+from src.transport import warm_up_connections
+from src.config import HTTP_WARMUP_CONNECTIONS, initialize
 
 
 @cl.on_chat_start
 async def on_chat_start():
    
+    # Runs once per process; later chats return immediately
+    await warm_up_connections(initialize(), HTTP_WARMUP_CONNECTIONS)
+
     await cl.ChatSettings([
         TextInput(id="name", label="Name")
     ]).send()
@@ -39,8 +44,13 @@ I'm your dedicated AI wellness coach ready to support your journey!
     
     # user_name = res.get("output", "Friend") if res else "Friend"    
     user_name = "Hoorain"
-    user = UserSessionContext(name=user_name, uid=str(uuid4()))
-    agent = HealthWellnessPlannerAgent(user)
+    
+    # Authenticated users resume their session; anonymous chats get a fresh uid each
+    app_user = cl.user_session.get("user")
+    uid = session_uid(app_user.identifier if app_user else None)
+    store = get_session_store()
+    user = (await store.aload(uid) if store else None) or UserSessionContext(name=user_name, uid=uid)
+    agent = HealthWellnessPlannerAgent(user, session_store=store)
     # msg = cl.Message(content="")
     
     # result = agent.streaming(f"Hi! I am {user_name} (answer in max 50 tokens)")
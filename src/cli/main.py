@@ -1,10 +1,12 @@
 import asyncio
 import time
-from uuid import uuid4
 from colorama import Back, Fore, Style
 
 from src.agent import HealthWellnessPlannerAgent
 from src.context import UserSessionContext
+from src.session_store import get_session_store, session_uid
+from src.telemetry import telemetry
+from src.transport import warm_up_connections
 import src.config
 
 def welcome():
@@ -23,11 +25,19 @@ def exit():
     
     
 async def main():
+    client = src.config.initialize()
     welcome()
     
-    name = input("Please enter your name: ")    
-    user = UserSessionContext(name=name, uid=str(uuid4()))
-    agent = HealthWellnessPlannerAgent(user)
+    # Open pooled connections to the model API while the user types their name
+    warm_up = asyncio.create_task(warm_up_connections(client, src.config.HTTP_WARMUP_CONNECTIONS))
+    name = await asyncio.to_thread(input, "Please enter your name: ")
+    await warm_up
+    
+    # With SESSION_USER_ID set, returning users pick up their goal, plans and progress from the session store
+    store = get_session_store()
+    uid = session_uid(src.config.SESSION_USER_ID)
+    user = (store.load(uid) if store else None) or UserSessionContext(name=name, uid=uid)
+    agent = HealthWellnessPlannerAgent(user, session_store=store)
     
     while True:
         user_input = input(f"\n{Fore.MAGENTA + Style.BRIGHT}User:{Style.RESET_ALL} {Fore.BLACK + Style.DIM}(leave blank to exit) {Style.RESET_ALL}")
@@ -46,6 +56,7 @@ async def main():
         
     
     # Print session summary with logfire logging
+    await telemetry.aclose()
     agent.hooks.print_session_summary()
     exit()
 
@@ -1,29 +1,142 @@
+"""
+Settings read from the environment, and the explicit `initialize()` step.
+
+Importing this module only loads `.env` and reads settings. Building the
+shared model client, registering it with the Agents SDK and configuring
+logfire happen in `initialize()`, which entry points call once at startup.
+"""
+
 import os
-from agents import set_default_openai_client, set_default_openai_api, set_tracing_disabled
+import threading
+from typing import TYPE_CHECKING, Optional
+
 from dotenv import find_dotenv, load_dotenv
-import logfire
-from openai import AsyncOpenAI
+
+from src.admission import FairAdmissionController
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
 
 load_dotenv(find_dotenv())
 
 LOGFIRE_TOKEN = os.getenv("LOGFIRE_TOKEN")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+BASE_URL = os.getenv("BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
 MODEL = "gemini-2.0-flash"
 
-if GEMINI_API_KEY is None:
-    raise RuntimeError("Environment variable 'GEMINI_API_KEY' is not set.") 
+# Shared guardrail verdict cache
+GUARDRAIL_CACHE_MAX_SIZE = int(os.getenv("GUARDRAIL_CACHE_MAX_SIZE", "4096"))
+GUARDRAIL_CACHE_TTL_SECONDS = float(os.getenv("GUARDRAIL_CACHE_TTL_SECONDS", "3600"))
+
+# Memoized plans: "memory" (per process) or "disk" (shared across restarts)
+PLAN_CACHE_BACKEND = os.getenv("PLAN_CACHE_BACKEND", "memory")
+PLAN_CACHE_DIR = os.getenv("PLAN_CACHE_DIR", ".cache/plans")
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1024"))
+PLAN_CACHE_TTL_SECONDS = float(os.getenv("PLAN_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Conversation history sent to the model on every turn
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "8000"))
+HISTORY_KEEP_RECENT_TURNS = int(os.getenv("HISTORY_KEEP_RECENT_TURNS", "2"))
+
+# Durable user sessions (SQLite)
+SESSION_STORE_ENABLED = os.getenv("SESSION_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", ".data/sessions.sqlite3")
+# Identifies the CLI user across runs; without it every run starts a new session
+SESSION_USER_ID = os.getenv("SESSION_USER_ID")
+# Most recent handoff log entries kept in memory (and loaded); older ones stay in the store
+SESSION_HANDOFF_LOG_LOAD_LIMIT = int(os.getenv("SESSION_HANDOFF_LOG_LOAD_LIMIT", "200"))
+# Entries of each hooks log (handoffs, errors) kept in memory; older ones are spilled to the store
+SESSION_LOG_CAPACITY = int(os.getenv("SESSION_LOG_CAPACITY", "200"))
+
+# Hook telemetry is queued and flushed in batches by a background task
+TELEMETRY_CONSOLE = os.getenv("TELEMETRY_CONSOLE", "true").lower() in ("1", "true", "yes")
+TELEMETRY_QUEUE_SIZE = int(os.getenv("TELEMETRY_QUEUE_SIZE", "10000"))
+TELEMETRY_BATCH_SIZE = int(os.getenv("TELEMETRY_BATCH_SIZE", "200"))
+TELEMETRY_FLUSH_INTERVAL_SECONDS = float(os.getenv("TELEMETRY_FLUSH_INTERVAL_SECONDS", "0.25"))
+
+# Outbound model calls: concurrent requests, and calls allowed to wait before new turns get a 429
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "64"))
+
+# Connection pool and timeouts of the shared HTTP client (HTTP/2 needs the optional 'h2' package)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_HTTP2 = os.getenv("HTTP_HTTP2", "false").lower() in ("1", "true", "yes")
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+HTTP_READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "120"))
+HTTP_WRITE_TIMEOUT_SECONDS = float(os.getenv("HTTP_WRITE_TIMEOUT_SECONDS", "30"))
+HTTP_POOL_TIMEOUT_SECONDS = float(os.getenv("HTTP_POOL_TIMEOUT_SECONDS", "30"))
+# Connections opened at startup so the first turn doesn't pay TCP/TLS handshakes
+HTTP_WARMUP_CONNECTIONS = int(os.getenv("HTTP_WARMUP_CONNECTIONS", "4"))
+
+# Local check-in calendars, one .ics file per user
+CHECKIN_CALENDAR_DIR = os.getenv("CHECKIN_CALENDAR_DIR", ".data/calendars")
+
+# Google Calendar check-ins: OAuth client secrets, cached user token, and events per batch request (API max 1000)
+GOOGLE_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE", "credentials.json")
+GOOGLE_TOKEN_FILE = os.getenv("GOOGLE_TOKEN_FILE", ".data/google_token.json")
+GOOGLE_CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID", "primary")
+GOOGLE_CALENDAR_BATCH_SIZE = int(os.getenv("GOOGLE_CALENDAR_BATCH_SIZE", "50"))
+
+# Start the main agent's model call alongside its input guardrails
+SPECULATIVE_EXECUTION = os.getenv("SPECULATIVE_EXECUTION", "false").lower() in ("1", "true", "yes")
+
+
+# Every model call from any agent, guardrail or tool goes through the admission controller
+admission_controller = FairAdmissionController(LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE)
+
+# Set by initialize()
+http_client: Optional["httpx.AsyncClient"] = None
+external_client: Optional["AsyncOpenAI"] = None
+
+_init_lock = threading.Lock()
+
+
+def initialize() -> "AsyncOpenAI":
+    """
+    Validate the environment, build the shared model client, make it the Agents SDK
+    default and configure logfire. Idempotent; returns the shared client.
+    """
+
+    global http_client, external_client
+
+    with _init_lock:
+        if external_client is not None:
+            return external_client
+
+        if GEMINI_API_KEY is None:
+            raise RuntimeError("Environment variable 'GEMINI_API_KEY' is not set.")
+
+        if LOGFIRE_TOKEN is None:
+            raise RuntimeError("Environment variable 'LOGFIRE_TOKEN' is not set.")
 
-if LOGFIRE_TOKEN is None:
-    raise RuntimeError("Environment variable 'LOGFIRE_TOKEN' is not set.") 
+        import logfire
+        from agents import set_default_openai_api, set_default_openai_client, set_tracing_disabled
+        from openai import AsyncOpenAI
 
+        from src.transport import create_http_client
 
-external_client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url=BASE_URL)
+        http_client = create_http_client(
+            admission_controller,
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            http2=HTTP_HTTP2,
+            connect_timeout=HTTP_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=HTTP_READ_TIMEOUT_SECONDS,
+            write_timeout=HTTP_WRITE_TIMEOUT_SECONDS,
+            pool_timeout=HTTP_POOL_TIMEOUT_SECONDS,
+        )
+        client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url=BASE_URL, http_client=http_client)
 
-set_default_openai_client(client=external_client)
-set_default_openai_api(api="chat_completions")
-set_tracing_disabled(disabled=True)
+        set_default_openai_client(client=client)
+        set_default_openai_api(api="chat_completions")
+        set_tracing_disabled(disabled=True)
 
-logfire.configure(token=LOGFIRE_TOKEN)
-logfire.instrument_openai_agents()
+        logfire.configure(token=LOGFIRE_TOKEN)
+        logfire.instrument_openai_agents()
 
+        external_client = client
+        return external_client
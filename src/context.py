@@ -1,5 +1,12 @@
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any, Literal, TypedDict
+import math
+import sys
+from array import array
+from datetime import date
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, PrivateAttr, model_validator
+from pydantic_core import core_schema
+from typing import Optional, List, Dict, Any, ClassVar, Iterable, Iterator, Literal, Type, TypedDict
+
+from src.session_logs import HandoffLog
 
 
 # Goal model for structured fitness goals
@@ -22,6 +29,47 @@ class MealDay(BaseModel):
     day: int
     meals: List[Meal]  # e.g., [{"type": "breakfast", "items": [...], "calories": ...}]
 
+# Meal plan as a table of distinct meals plus per-day references into it,
+# so meals repeated across days are stored and sent to the model once
+class CompactMealDay(BaseModel):
+    day: int
+    meals: List[int]  # indexes into CompactMealPlan.meals
+
+class CompactMealPlan(BaseModel):
+    meals: List[Meal]
+    days: List[CompactMealDay]
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_meal_days(cls, data: Any) -> Any:
+        # Sessions stored before the compact format hold a plain list of days
+        if isinstance(data, list):
+            return cls.from_days([MealDay.model_validate(day) for day in data]).model_dump()
+        return data
+
+    @classmethod
+    def from_days(cls, days: List[MealDay]) -> "CompactMealPlan":
+        meals: List[Meal] = []
+        index: Dict[tuple, int] = {}
+        compact_days = []
+        for meal_day in days:
+            references = []
+            for meal in meal_day.meals:
+                key = (meal.name, meal.calories, meal.type)
+                if key not in index:
+                    index[key] = len(meals)
+                    meals.append(meal)
+                references.append(index[key])
+            compact_days.append(CompactMealDay(day=meal_day.day, meals=references))
+        return cls(meals=meals, days=compact_days)
+
+    def to_days(self) -> List[MealDay]:
+        """The plan in the expanded `List[MealDay]` shape."""
+        return [
+            MealDay(day=compact_day.day, meals=[self.meals[i].model_copy() for i in compact_day.meals])
+            for compact_day in self.days
+        ]
+
 # MedicalMealPlan for special dietary needs
 class MedicalMealPlan(BaseModel):
     days: List[MealDay]
@@ -73,6 +121,130 @@ class ProgressUpdate(BaseModel):
     # Water intake in liters
 
 
+# ProgressUpdate fields stored as float columns, NaN when missing
+PROGRESS_NUMERIC_FIELDS = ("weight", "workouts_completed", "meals_followed", "sleep_hours", "water_intake")
+_PROGRESS_INT_FIELDS = ("workouts_completed", "meals_followed")
+
+# Day ordinal of entries without a valid date (real ordinals start at 1)
+UNDATED_DAY = 0
+
+
+def day_ordinal(value: str) -> int:
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return UNDATED_DAY
+
+
+# Progress updates stored column by column: a day ordinal and one float array per
+# numeric field, interned moods, and notes and non-ISO dates kept only where present.
+# ProgressUpdate objects are built when an entry is read, e.g. to persist or export it.
+class ProgressLog:
+    __slots__ = ("days", "columns", "moods", "_notes", "_raw_dates")
+
+    item_type: ClassVar[type] = ProgressUpdate
+
+    def __init__(self, entries: Iterable[Any] = ()):
+        self.days = array("i")
+        self.columns: Dict[str, array] = {name: array("d") for name in PROGRESS_NUMERIC_FIELDS}
+        self.moods: List[Optional[str]] = []
+        self._notes: Dict[int, str] = {}
+        self._raw_dates: Dict[int, str] = {}
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, update: Any):
+        if not isinstance(update, ProgressUpdate):
+            update = ProgressUpdate.model_validate(update)
+        index = len(self.days)
+        day = day_ordinal(update.date)
+        if day == UNDATED_DAY or date.fromordinal(day).isoformat() != update.date:
+            self._raw_dates[index] = update.date
+        self.days.append(day)
+        for name, column in self.columns.items():
+            value = getattr(update, name)
+            column.append(math.nan if value is None else value)
+        self.moods.append(sys.intern(update.mood) if update.mood else update.mood)
+        if update.notes is not None:
+            self._notes[index] = update.notes
+
+    def entry(self, index: int) -> ProgressUpdate:
+        values: Dict[str, Any] = {}
+        for name, column in self.columns.items():
+            value = column[index]
+            if not math.isnan(value):
+                values[name] = int(value) if name in _PROGRESS_INT_FIELDS else value
+        return ProgressUpdate(
+            date=self._raw_dates.get(index) or date.fromordinal(self.days[index]).isoformat(),
+            mood=self.moods[index],
+            notes=self._notes.get(index),
+            **values,
+        )
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __iter__(self) -> Iterator[ProgressUpdate]:
+        return (self.entry(index) for index in range(len(self.days)))
+
+    def __getitem__(self, index: int | slice) -> ProgressUpdate | List[ProgressUpdate]:
+        if isinstance(index, slice):
+            return [self.entry(position) for position in range(*index.indices(len(self.days)))]
+        if index < 0:
+            index += len(self.days)
+        if not 0 <= index < len(self.days):
+            raise IndexError("progress log index out of range")
+        return self.entry(index)
+
+    def __repr__(self) -> str:
+        return f"ProgressLog(entries={len(self.days)})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Type[Any], handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        def validate(value: Any) -> "ProgressLog":
+            if isinstance(value, ProgressLog):
+                return value
+            if isinstance(value, (list, tuple)):
+                return cls(value)
+            raise ValueError("progress_logs must be a list")
+
+        return core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda log: [entry.model_dump() for entry in log],
+            ),
+        )
+
+
+# Running totals over progress_logs, updated on every new entry
+class ProgressAggregates(BaseModel):
+    count: int = 0
+    weight_count: int = 0
+    first_weight: Optional[float] = None
+    last_weight: Optional[float] = None
+    workouts_total: int = 0
+    meals_total: int = 0
+    sleep_count: int = 0
+    sleep_total: float = 0.0
+    water_count: int = 0
+    water_total: float = 0.0
+    mood_counts: Dict[str, int] = {}
+
+
+
+# Recurring progress check-in series in the user's local calendar
+class CheckinSchedule(BaseModel):
+    event_id: str
+    # Stable per user and frequency, rescheduling updates the same calendar event
+    frequency: Literal["DAILY", "WEEKLY", "MONTHLY"]
+    start_date: str
+    # Date of the first check-in in YYYY-MM-DD format
+    count: int = 10
+    # Number of occurrences
+    sequence: int = 0
+    # Incremented on every update (iCalendar SEQUENCE)
+
+
 
 # User session context shared across all tools and agents
 class UserSessionContext(BaseModel):
@@ -81,8 +253,19 @@ class UserSessionContext(BaseModel):
     goal: Optional[Goal] = None
     diet_preferences: Optional[DietPreferences] = None
     workout_plan: Optional[WorkoutPlan] = None
-    meal_plan: Optional[List[MealDay]] = None
+    meal_plan: Optional[CompactMealPlan] = None
+    meal_plan_source: Optional[Literal["template", "cache", "model"]] = None
+    # Medical plan cache key of the current meal plan
+    meal_plan_fingerprint: Optional[str] = None
     injury_notes: List[InjuryNote] = []
-    handoff_logs: List[str] = []
-    progress_logs: List[ProgressUpdate] = []
+    # Bounded: only the most recent entries are kept in memory
+    handoff_logs: HandoffLog = Field(default_factory=HandoffLog)
+    # Columnar; entries are ProgressUpdate objects only when read
+    progress_logs: ProgressLog = Field(default_factory=ProgressLog)
+    progress_aggregates: ProgressAggregates = ProgressAggregates()
+    checkin_schedules: List[CheckinSchedule] = []
+    # Serialized sections for read_context_data (src.tools.context_sections), not persisted
+    _section_cache: Any = PrivateAttr(default=None)
+    # Source of a vetted medical plan made in the current run, consumed by its output guardrail; not persisted
+    _vetted_meal_plan_source: Optional[str] = PrivateAttr(default=None)
 
@@ -1,14 +1,18 @@
 from .escalation_guardrail import escalation_input_guardrail
 from .goal_analyzer_guardrail import goal_input_guardrail
 from .health_guardrail import health_input_guardrail
+from .health_classifier import fast_path_stats
 from .injury_guardrail import injury_input_guardrail, injury_output_guardrail
 from .nutrition_guardrail import medical_meal_plan_output_guardrail, nutrition_input_guardrail
 from .guardrail_exceptions import handle_guardrail_exception
+from .verdict_cache import guardrail_cache
 
 
 __all__ = [
     "escalation_input_guardrail",
+    "fast_path_stats",
     "goal_input_guardrail",
+    "guardrail_cache",
     "handle_guardrail_exception",
     "health_input_guardrail",
     "injury_input_guardrail",
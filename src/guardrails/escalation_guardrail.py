@@ -3,6 +3,7 @@ from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, Runner, TR
 from pydantic import BaseModel
 
 from src.context import UserSessionContext
+from src.guardrails.verdict_cache import cached_verdict
 
 
 # Escalation request validation model
@@ -31,6 +32,7 @@ escalation_input_guardrail_agent = Agent(
 
 
 @input_guardrail
+@cached_verdict
 async def escalation_input_guardrail(
     ctx: RunContextWrapper[UserSessionContext],
     agent: Agent,
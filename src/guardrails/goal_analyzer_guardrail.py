@@ -2,6 +2,7 @@ from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, Runner, TR
 from pydantic import BaseModel
 
 from src.context import UserSessionContext
+from src.guardrails.verdict_cache import cached_verdict
 
 class GoalOutput(BaseModel):
     is_correct_format: bool
@@ -24,6 +25,7 @@ goal_input_guardrail_agent = Agent(
 
 
 @input_guardrail
+@cached_verdict
 async def goal_input_guardrail(
     ctx: RunContextWrapper[UserSessionContext],
     agent: Agent,
@@ -5,7 +5,6 @@ Handles InputGuardrailTripwireTriggered and OutputGuardrailTripwireTriggered exc
 
 import time
 from datetime import datetime
-import logfire
 from colorama import Fore, Style
 
 from src.hooks import AgentLog
@@ -50,6 +49,8 @@ def handle_guardrail_exception(exception: Exception, user_input: str, agent_name
         }
     )
     
+    import logfire
+
     logfire.log(
         "warning",
         msg_template=f"Guardrail violation: {type(exception).__name__}",
@@ -0,0 +1,192 @@
+"""
+Local fast-path classifier for the health input guardrail.
+
+Scores the latest user message against a weighted lexicon of unigrams and
+bigrams for each `HealthQueryValidation.query_category` label. Clear-cut
+messages get a verdict in-process; everything else falls back to the LLM
+guardrail agent.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+# Weighted lexicon per query category. Bigrams are matched as "word word".
+CATEGORY_LEXICON: Dict[str, Dict[str, float]] = {
+    "fitness": {
+        "workout": 3, "workouts": 3, "exercise": 3, "exercises": 3, "training": 2, "train": 1.5,
+        "gym": 3, "run": 1.5, "running": 2.5, "jog": 2, "jogging": 2.5, "cardio": 3, "strength": 2,
+        "squat": 3, "squats": 3, "pushups": 3, "push ups": 3, "deadlift": 3, "lifting": 2.5,
+        "weights": 2, "yoga": 2.5, "pilates": 3, "stretching": 2.5, "hiit": 3, "muscle": 2.5,
+        "muscles": 2.5, "reps": 2.5, "sets": 1, "5k": 3, "marathon": 3, "cycling": 2.5, "swimming": 2,
+        "workout plan": 4, "training plan": 4, "build muscle": 4, "fitness": 3, "abs": 2,
+    },
+    "nutrition": {
+        "diet": 3, "meal": 3, "meals": 3, "food": 2, "eat": 2, "eating": 2.5, "calories": 3,
+        "calorie": 3, "protein": 3, "carbs": 3, "vegan": 3, "vegetarian": 3, "keto": 3,
+        "pescatarian": 3, "omnivore": 3, "breakfast": 2.5, "lunch": 2, "dinner": 2, "snack": 2,
+        "snacks": 2, "recipe": 2, "recipes": 2, "nutrition": 3, "macros": 3, "meal plan": 4,
+        "diet plan": 4, "gluten": 3, "sugar": 1.5, "fasting": 2.5, "vitamins": 2.5,
+    },
+    "wellness": {
+        "stress": 3, "sleep": 3, "sleeping": 3, "insomnia": 3, "meditation": 3, "meditate": 3,
+        "mindfulness": 3, "anxiety": 2.5, "mood": 2.5, "burnout": 3, "relax": 2, "relaxation": 2.5,
+        "wellbeing": 3, "well being": 3, "wellness": 3, "energy": 1.5, "tired": 1.5,
+        "mental health": 4, "self care": 3, "hydration": 2.5, "water intake": 3,
+    },
+    "medical": {
+        "diabetes": 4, "diabetic": 4, "celiac": 4, "hypertension": 4, "blood pressure": 4,
+        "blood sugar": 4, "cholesterol": 3, "injury": 3, "injured": 3, "pain": 2.5, "sprain": 3.5,
+        "sprained": 3.5, "knee": 2, "back pain": 4, "shoulder": 1.5, "symptoms": 3, "medication": 3,
+        "medications": 3, "doctor": 2.5, "allergy": 3, "allergic": 3, "allergies": 3, "asthma": 3.5,
+        "surgery": 3, "physiotherapy": 3.5,
+    },
+    "general_health": {
+        "health": 2.5, "healthy": 2.5, "weight": 3, "lose weight": 4, "gain weight": 4,
+        "lose": 1, "gain": 1, "kg": 2.5, "lbs": 2.5, "lb": 2.5, "pounds": 2, "body fat": 4, "bmi": 3,
+        "goal": 1.5, "goals": 1.5, "progress": 2, "check in": 3, "checkin": 3, "check-in": 3,
+        "reminder": 1.5, "schedule": 1, "track": 1.5, "tracking": 1.5, "coach": 2,
+        "trainer": 2, "checkup": 3, "wellness program": 4,
+    },
+    "not_health_related": {
+        "python": 3, "javascript": 3, "code": 2, "programming": 3, "compile": 3, "bitcoin": 4,
+        "crypto": 4, "stock": 2.5, "stocks": 3, "invest": 2.5, "investing": 3, "election": 4,
+        "politics": 4, "president": 3, "movie": 3, "movies": 3, "song": 3, "lyrics": 4,
+        "capital of": 4, "translate": 3, "homework": 3, "poem": 3, "car": 2, "laptop": 3,
+        "weather": 3, "sql": 4, "excel": 3,
+    },
+}
+
+HEALTH_CATEGORIES = ("fitness", "nutrition", "wellness", "medical", "general_health")
+
+# A verdict is only returned locally above these thresholds
+MIN_SCORE = 3.0
+MIN_CONFIDENCE = 0.85
+# Off-topic verdicts can trip the wire, so they need stronger evidence
+MIN_OFF_TOPIC_SCORE = 4.0
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+# Split quantities glued to their unit, e.g. "5kg" -> "5 kg"
+_UNIT_PATTERN = re.compile(r"(\d)(kg|lbs|lb)\b")
+
+
+@dataclass
+class FastPathVerdict:
+    is_health_related: bool
+    query_category: str
+    confidence_score: float
+    reasoning: str
+
+
+@dataclass
+class FastPathStats:
+    total_queries: int = 0
+    short_circuited: int = 0
+    llm_fallbacks: int = 0
+    fast_path_seconds: float = 0.0
+    llm_seconds: float = 0.0
+
+    @property
+    def short_circuit_rate(self) -> float:
+        return self.short_circuited / self.total_queries if self.total_queries else 0.0
+
+    @property
+    def average_llm_latency(self) -> Optional[float]:
+        return self.llm_seconds / self.llm_fallbacks if self.llm_fallbacks else None
+
+    @property
+    def estimated_seconds_saved(self) -> float:
+        """Model round-trips avoided, priced at the observed average LLM latency."""
+        average = self.average_llm_latency or 0.0
+        return self.short_circuited * average - self.fast_path_seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "total_queries": self.total_queries,
+            "short_circuited": self.short_circuited,
+            "llm_fallbacks": self.llm_fallbacks,
+            "short_circuit_rate": round(self.short_circuit_rate, 4),
+            "average_llm_latency": round(self.average_llm_latency or 0.0, 4),
+            "estimated_seconds_saved": round(self.estimated_seconds_saved, 4),
+            "llm_calls_saved": self.short_circuited,
+        }
+
+
+fast_path_stats = FastPathStats()
+
+
+def _ngrams(text: str) -> List[str]:
+    tokens = _TOKEN_PATTERN.findall(_UNIT_PATTERN.sub(r"\1 \2", text.lower()))
+    bigrams = [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    return tokens + bigrams
+
+
+def score_categories(text: str) -> Dict[str, float]:
+    """Sum lexicon weights of every unigram and bigram in `text` per category."""
+
+    scores = {category: 0.0 for category in CATEGORY_LEXICON}
+    for gram in _ngrams(text):
+        for category, lexicon in CATEGORY_LEXICON.items():
+            weight = lexicon.get(gram)
+            if weight:
+                scores[category] += weight
+    return scores
+
+
+def classify_health_query(text: str) -> Tuple[Optional[FastPathVerdict], float]:
+    """
+    Classify a user message locally if the lexicon evidence is unambiguous.
+
+    Args:
+        text: The latest user message
+
+    Returns:
+        A tuple of the verdict (None if the LLM guardrail should decide) and the
+        time spent classifying in seconds
+    """
+
+    started = time.perf_counter()
+    scores = score_categories(text)
+
+    health_score = sum(scores[category] for category in HEALTH_CATEGORIES)
+    off_topic_score = scores["not_health_related"]
+    total = health_score + off_topic_score
+
+    verdict: Optional[FastPathVerdict] = None
+    if total >= MIN_SCORE:
+        if health_score >= off_topic_score:
+            category = max(HEALTH_CATEGORIES, key=lambda name: scores[name])
+            confidence = health_score / (total + 0.5)
+            if health_score >= MIN_SCORE and confidence >= MIN_CONFIDENCE:
+                verdict = FastPathVerdict(
+                    is_health_related=True,
+                    query_category=category,
+                    confidence_score=round(confidence, 3),
+                    reasoning=f"Local classifier matched {category} terms (score {scores[category]:.1f}).",
+                )
+        else:
+            confidence = off_topic_score / (total + 0.5)
+            if health_score == 0 and off_topic_score >= MIN_OFF_TOPIC_SCORE and confidence >= MIN_CONFIDENCE:
+                verdict = FastPathVerdict(
+                    is_health_related=False,
+                    query_category="not_health_related",
+                    confidence_score=round(confidence, 3),
+                    reasoning=f"Local classifier matched only off-topic terms (score {off_topic_score:.1f}).",
+                )
+
+    elapsed = time.perf_counter() - started
+    return verdict, elapsed
+
+
+def record_fast_path(elapsed: float):
+    fast_path_stats.total_queries += 1
+    fast_path_stats.short_circuited += 1
+    fast_path_stats.fast_path_seconds += elapsed
+
+
+def record_llm_fallback(elapsed: float):
+    fast_path_stats.total_queries += 1
+    fast_path_stats.llm_fallbacks += 1
+    fast_path_stats.llm_seconds += elapsed
@@ -1,8 +1,12 @@
+import time
 from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, Runner, TResponseInputItem, input_guardrail
 from pydantic import BaseModel
 from typing import Literal
 
 from src.context import UserSessionContext
+from src.guardrails.health_classifier import classify_health_query, fast_path_stats, record_fast_path, record_llm_fallback
+from src.guardrails.utils import get_latest_user_text
+from src.guardrails.verdict_cache import cached_verdict
 
 
 class HealthQueryValidation(BaseModel):
@@ -41,17 +45,33 @@ health_input_guardrail_agent = Agent(
 
 
 @input_guardrail
+@cached_verdict
 async def health_input_guardrail(
     ctx: RunContextWrapper[UserSessionContext],
     agent: Agent,
     input: str | list[TResponseInputItem],
 ) -> GuardrailFunctionOutput:
     
-    result = await Runner.run(health_input_guardrail_agent, input, context=ctx.context)
-    output = result.final_output_as(HealthQueryValidation)
+    # Try the local classifier first, only ambiguous input needs the model
+    verdict, elapsed = classify_health_query(get_latest_user_text(input))
+    
+    if verdict is not None:
+        record_fast_path(elapsed)
+        output = HealthQueryValidation(
+            is_health_related=verdict.is_health_related,
+            query_category=verdict.query_category,
+            confidence_score=verdict.confidence_score,
+            reasoning=verdict.reasoning,
+        )
+    else:
+        started = time.perf_counter()
+        result = await Runner.run(health_input_guardrail_agent, input, context=ctx.context)
+        output = result.final_output_as(HealthQueryValidation)
+        record_llm_fallback(time.perf_counter() - started)
     
     # Log the classification for debugging
     print(f"Health Guardrail Classification: {output.query_category} (confidence: {output.confidence_score})")
+    print(f"Fast path: {fast_path_stats.short_circuited}/{fast_path_stats.total_queries} short-circuited")
     print(f"Reasoning: {output.reasoning}")
     
     # Only trigger tripwire if confidence is high and it's clearly not health-related
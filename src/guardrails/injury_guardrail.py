@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import Literal, List
 
 from src.context import UserSessionContext
+from src.guardrails.verdict_cache import cached_verdict
 
 
 class InjuryInput(BaseModel):
@@ -53,6 +54,7 @@ injury_output_guardrail_agent = Agent(
 
 
 @input_guardrail
+@cached_verdict
 async def injury_input_guardrail(
     ctx: RunContextWrapper[UserSessionContext],
     agent: Agent,
@@ -3,6 +3,8 @@ from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, Runner, TR
 from pydantic import BaseModel
 
 from src.context import UserSessionContext
+from src.guardrails.verdict_cache import cached_verdict
+from src.tools.plan_cache import medical_plan_cache, pending_medical_plans
 
 
 class NutritionInput(BaseModel):
@@ -37,6 +39,7 @@ nutrition_input_guardrail_agent = Agent(
 
 
 @input_guardrail
+@cached_verdict
 async def nutrition_input_guardrail(
     ctx: RunContextWrapper[UserSessionContext],
     agent: Agent,
@@ -84,6 +87,16 @@ async def medical_meal_plan_output_guardrail(
     #         tripwire_triggered=True
     #     )
     
+    # Template plans are vetted up front and cached plans already passed this guardrail.
+    # Only a plan made in this run counts; later answers are checked again.
+    vetted_source = ctx.context._vetted_meal_plan_source
+    ctx.context._vetted_meal_plan_source = None
+    if vetted_source in ("template", "cache"):
+        return GuardrailFunctionOutput(
+            output_info=f"Meal plan served from the vetted {vetted_source} store",
+            tripwire_triggered=False
+        )
+    
     result = await Runner.run(
         medical_meal_plan_output_guardrail_agent, 
         str(output), 
@@ -91,6 +104,14 @@ async def medical_meal_plan_output_guardrail(
     )
     output = result.final_output_as(MedicalMealPlanOutput)
     
+    # Share the validated plan with later requests for the same condition profile
+    fingerprint = ctx.context.meal_plan_fingerprint
+    if output.is_valid_plan and fingerprint is not None:
+        validated_plan = pending_medical_plans.get(fingerprint)
+        if validated_plan is not None:
+            medical_plan_cache.set(fingerprint, validated_plan)
+            pending_medical_plans.delete(fingerprint)
+    
     return GuardrailFunctionOutput(
         output_info=output.reasoning,
         tripwire_triggered=not output.is_valid_plan
@@ -0,0 +1,40 @@
+from typing import Any
+
+from agents import TResponseInputItem
+
+
+def get_latest_user_text(input: str | list[TResponseInputItem]) -> str:
+    """
+    Extract the text of the most recent user message from a guardrail input.
+
+    Guardrails receive either the raw prompt string or the full conversation as a
+    list of input items. Only the latest user turn is relevant for classification.
+
+    Args:
+        input: Guardrail input as passed by the Agents SDK
+
+    Returns:
+        The latest user message text, or an empty string if none is found
+    """
+
+    if isinstance(input, str):
+        return input
+
+    for item in reversed(input):
+        if not isinstance(item, dict) or item.get("role") != "user":
+            continue
+        return content_to_text(item.get("content"))
+
+    return ""
+
+
+def content_to_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+
+    # Content parts, e.g. [{"type": "input_text", "text": "..."}]
+    if isinstance(content, list):
+        parts = [part.get("text", "") for part in content if isinstance(part, dict)]
+        return " ".join(part for part in parts if part)
+
+    return ""
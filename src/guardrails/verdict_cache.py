@@ -0,0 +1,108 @@
+"""
+Cross-session cache of input guardrail verdicts.
+
+Many users send the same short messages ("hi", "I want to lose weight"), so
+guardrail outputs are shared across sessions, keyed on the guardrail name and
+a hash of the whole normalized input. Guardrails classify the conversation they
+are given, not just its last message, so only identical conversations (in
+practice, identical first messages) share a verdict.
+"""
+
+import functools
+import hashlib
+import json
+import re
+from typing import Awaitable, Callable, Optional, Tuple
+
+from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, TResponseInputItem
+
+from src.cache import LRUCache
+from src.config import GUARDRAIL_CACHE_MAX_SIZE, GUARDRAIL_CACHE_TTL_SECONDS
+from src.context import UserSessionContext
+from src.guardrails.utils import content_to_text
+
+
+GuardrailFunction = Callable[
+    [RunContextWrapper[UserSessionContext], Agent, str | list[TResponseInputItem]],
+    Awaitable[GuardrailFunctionOutput],
+]
+
+guardrail_cache: LRUCache[GuardrailFunctionOutput] = LRUCache(
+    max_size=GUARDRAIL_CACHE_MAX_SIZE,
+    ttl_seconds=GUARDRAIL_CACHE_TTL_SECONDS,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s.!?,;:]+$")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace and trailing punctuation."""
+    text = _WHITESPACE.sub(" ", text.lower()).strip()
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+def normalize_guardrail_input(input: str | list[TResponseInputItem]) -> str:
+    """
+    Canonical form of the whole guardrail input, with the text of every
+    message normalized; empty when there is no text at all. A prompt string
+    counts as a single user message.
+    """
+
+    if isinstance(input, str):
+        input = [{"role": "user", "content": input}]
+
+    items = []
+    for item in input:
+        if isinstance(item, dict) and "role" in item:
+            items.append([item["role"], normalize_text(content_to_text(item.get("content")))])
+        else:
+            # Tool calls and outputs are kept verbatim
+            items.append(item)
+    if not any(isinstance(item, list) and item[1] for item in items):
+        return ""
+    return json.dumps(items, sort_keys=True, default=str)
+
+
+def guardrail_cache_key(name: str, input: str | list[TResponseInputItem]) -> Optional[Tuple[str, str]]:
+    """(guardrail name, SHA-256 of the normalized input), or None for inputs without text."""
+
+    normalized = normalize_guardrail_input(input)
+    if not normalized:
+        return None
+    return name, hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def cached_verdict(guardrail_function: GuardrailFunction) -> GuardrailFunction:
+    """
+    Decorator that serves repeated guardrail inputs from `guardrail_cache`.
+
+    Apply it below `@input_guardrail` so the guardrail keeps its function name:
+
+        @input_guardrail
+        @cached_verdict
+        async def my_guardrail(ctx, agent, input): ...
+    """
+
+    name = guardrail_function.__name__
+
+    @functools.wraps(guardrail_function)
+    async def wrapper(
+        ctx: RunContextWrapper[UserSessionContext],
+        agent: Agent,
+        input: str | list[TResponseInputItem],
+    ) -> GuardrailFunctionOutput:
+
+        key = guardrail_cache_key(name, input)
+        if key is None:
+            return await guardrail_function(ctx, agent, input)
+
+        cached: Optional[GuardrailFunctionOutput] = guardrail_cache.get(key)
+        if cached is not None:
+            return cached
+
+        output = await guardrail_function(ctx, agent, input)
+        guardrail_cache.set(key, output)
+        return output
+
+    return wrapper
@@ -0,0 +1,195 @@
+"""
+Token-budgeted conversation history.
+
+Each turn's items are stored exactly once. After every turn the history is
+checked against a token budget and, when it is exceeded, the oldest turns are
+folded into a rolling summary so long sessions cost a roughly constant number
+of input tokens per turn. The summarizer runs in a background task, so the
+reply is not held back by it; a request built before it finishes still sends
+the unsummarized turns.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from agents import Agent, Runner, TResponseInputItem
+
+from src.config import HISTORY_KEEP_RECENT_TURNS, HISTORY_TOKEN_BUDGET
+
+
+# Rough chars-per-token ratio, good enough to enforce a budget without a tokenizer
+CHARS_PER_TOKEN = 4
+# Compact down to this fraction of the budget so we don't summarize on every turn
+COMPACTION_TARGET = 0.6
+# Per-item cap when rendering turns for the summarizer
+MAX_RENDERED_ITEM_CHARS = 600
+# Share of the budget the summary may take when the summarizer fails and user lines are kept verbatim
+FALLBACK_SUMMARY_SHARE = 0.25
+
+
+history_summarizer_agent = Agent(
+    name="History Summarizer",
+    instructions=(
+        "You maintain a rolling summary of a conversation between a user and a health & wellness coaching agent. "
+        "You receive the previous summary (if any) and a transcript of the turns that are being archived. "
+        "Produce an updated summary that keeps every fact the coach needs later: the user's goals, "
+        "dietary preferences, injuries and limitations, plans that were created, progress updates, "
+        "scheduled check-ins and open questions. Drop greetings and small talk. "
+        "Write concise bullet points, no more than 200 words."
+    ),
+    model="gemini-2.0-flash",
+)
+
+
+def estimate_tokens(item: Any) -> int:
+    text = item if isinstance(item, str) else json.dumps(item, default=str, ensure_ascii=False)
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class Turn:
+    items: List[TResponseInputItem]
+    tokens: int
+
+
+@dataclass
+class HistoryStats:
+    compactions: int = 0
+    compacted_turns: int = 0
+    summarizer_failures: int = 0
+    last_request_tokens: int = 0
+
+
+class ConversationHistory:
+    """Stores conversation turns once and keeps each request within a token budget."""
+
+    def __init__(
+        self,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        keep_recent_turns: int = HISTORY_KEEP_RECENT_TURNS,
+        summarizer: Optional[Agent] = None,
+    ):
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self.summarizer = summarizer or history_summarizer_agent
+        self.turns: List[Turn] = []
+        self.summary: Optional[str] = None
+        self.stats = HistoryStats()
+        self._compaction: Optional[asyncio.Task] = None
+
+
+    @property
+    def tokens(self) -> int:
+        summary_tokens = estimate_tokens(self.summary) if self.summary else 0
+        return summary_tokens + sum(turn.tokens for turn in self.turns)
+
+
+    def build_input(self, prompt: str) -> List[TResponseInputItem]:
+        """Return the model input for a new user prompt: summary, stored turns, then the prompt."""
+
+        items: List[TResponseInputItem] = []
+        if self.summary:
+            items.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation with this user:\n{self.summary}",
+            })
+        for turn in self.turns:
+            items.extend(turn.items)
+        items.append({"role": "user", "content": prompt})
+
+        self.stats.last_request_tokens = self.tokens + estimate_tokens(prompt)
+        return items
+
+
+    def record_turn(self, prompt: str, new_items: List[TResponseInputItem]):
+        """Store a completed turn: the user prompt plus only the items the run generated."""
+
+        items: List[TResponseInputItem] = [{"role": "user", "content": prompt}, *new_items]
+        self.turns.append(Turn(items=items, tokens=sum(estimate_tokens(item) for item in items)))
+
+
+    def schedule_compaction(self):
+        """Start compacting in the background if over budget and no compaction is running."""
+
+        if self.tokens <= self.token_budget:
+            return
+        if self._compaction is None or self._compaction.done():
+            self._compaction = asyncio.create_task(self.compact_if_needed())
+
+
+    async def wait_for_compaction(self):
+        """Wait for a background compaction to finish, e.g. before shutdown or in tests."""
+        if self._compaction is not None:
+            await asyncio.shield(self._compaction)
+
+
+    async def compact_if_needed(self):
+        """
+        Fold the oldest turns into the rolling summary once the budget is exceeded.
+
+        Turns recorded while the summarizer runs are kept: only the archived
+        turns, which are always the oldest, are replaced by the summary.
+        """
+
+        if self.tokens <= self.token_budget:
+            return
+
+        target = int(self.token_budget * COMPACTION_TARGET)
+        remaining = self.tokens
+        archived: List[Turn] = []
+        while len(self.turns) - len(archived) > self.keep_recent_turns and remaining > target:
+            turn = self.turns[len(archived)]
+            archived.append(turn)
+            remaining -= turn.tokens
+
+        if not archived:
+            return
+
+        self.summary = await self._summarize(archived)
+        self.turns = self.turns[len(archived):]
+        self.stats.compactions += 1
+        self.stats.compacted_turns += len(archived)
+
+
+    async def _summarize(self, archived: List[Turn]) -> str:
+        transcript = "\n".join(_render_item(item) for turn in archived for item in turn.items)
+        prompt = (
+            f"Previous summary:\n{self.summary or 'None'}\n\n"
+            f"Turns to archive:\n{transcript}"
+        )
+
+        try:
+            result = await Runner.run(self.summarizer, prompt)
+            return str(result.final_output)
+        except Exception:
+            # Never lose the user's context because the summarizer failed
+            self.stats.summarizer_failures += 1
+            user_lines = [
+                _render_item(item)
+                for turn in archived
+                for item in turn.items
+                if isinstance(item, dict) and item.get("role") == "user"
+            ]
+            # Most recent lines win once the summary outgrows its share of the budget
+            max_chars = max(1, int(self.token_budget * FALLBACK_SUMMARY_SHARE)) * CHARS_PER_TOKEN
+            return "\n".join(filter(None, [self.summary, *user_lines]))[-max_chars:]
+
+
+def _render_item(item: TResponseInputItem) -> str:
+    if not isinstance(item, dict):
+        return str(item)[:MAX_RENDERED_ITEM_CHARS]
+
+    item_type = item.get("type")
+    if item_type == "function_call":
+        text = f"tool call {item.get('name')}({item.get('arguments')})"
+    elif item_type == "function_call_output":
+        text = f"tool output: {item.get('output')}"
+    else:
+        content = item.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        text = f"{item.get('role', 'assistant')}: {content}"
+
+    return text[:MAX_RENDERED_ITEM_CHARS]
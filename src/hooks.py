@@ -1,13 +1,19 @@
+import asyncio
+import sys
 import time
-import json
 from typing import Any, Dict, List, Optional, TypedDict
 from datetime import datetime
 from agents import Agent, RunContextWrapper, RunHooks, Tool
 from colorama import Fore, Style
-import logfire
 from pydantic import BaseModel
 
 from src.context import UserSessionContext
+from src.latency import SpanMetrics, StreamMetrics, StreamStats, span_metrics
+from src.session_logs import RingLog
+from src.session_store import SessionStore
+from src.speculation import SpeculationMetrics
+from src.telemetry import create_record, telemetry
+from src.transport import transport_stats
 import src.config
 
 
@@ -15,6 +21,7 @@ import src.config
 class AgentPerformanceEntry(TypedDict):
     start_count: int
     total_tokens: int
+    """Tokens used while the agent was active, summed over its spans"""
     last_used: Optional[str]
 
 class HandoffRecord(TypedDict):
@@ -38,6 +45,68 @@ class SessionSummary(TypedDict):
     handoff_history: List[HandoffRecord]
     error_count: int
     errors: Optional[List[ErrorRecord]]
+    latency: Dict[str, Dict[str, Dict[str, float]]]
+    streaming: Dict[str, object]
+
+
+def _isoformat(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+class _AgentPerformance:
+    __slots__ = ("start_count", "total_tokens", "last_used")
+
+    def __init__(self):
+        self.start_count = 0
+        self.total_tokens = 0
+        self.last_used = 0
+
+
+    def as_dict(self) -> AgentPerformanceEntry:
+        return {
+            "start_count": self.start_count,
+            "total_tokens": self.total_tokens,
+            "last_used": _isoformat(self.last_used) if self.last_used else None,
+        }
+
+
+class _HandoffEntry:
+    __slots__ = ("timestamp", "from_agent", "to_agent", "total_tokens")
+
+    def __init__(self, from_agent: str, to_agent: str, total_tokens: int):
+        self.timestamp = int(time.time())
+        self.from_agent = sys.intern(from_agent)
+        self.to_agent = sys.intern(to_agent)
+        self.total_tokens = total_tokens
+
+
+    def as_dict(self, user_name: str) -> HandoffRecord:
+        return {
+            "timestamp": _isoformat(self.timestamp),
+            "from_agent": self.from_agent,
+            "to_agent": self.to_agent,
+            "user_name": user_name,
+            "total_tokens": self.total_tokens,
+        }
+
+
+class _ErrorEntry:
+    __slots__ = ("timestamp", "method", "error", "context")
+
+    def __init__(self, method: str, error: str, context: dict):
+        self.timestamp = int(time.time())
+        self.method = sys.intern(method)
+        self.error = error
+        self.context = context
+
+
+    def as_dict(self) -> ErrorRecord:
+        return {
+            "method": self.method,
+            "error": self.error,
+            "timestamp": _isoformat(self.timestamp),
+            "context": self.context,
+        }
 
 
 class AgentLog(BaseModel):
@@ -52,129 +121,157 @@ class AgentLog(BaseModel):
 
 
 class HealthWellnessHooks(RunHooks[UserSessionContext]):
-    def __init__(self):
+    def __init__(self, session_store: Optional[SessionStore] = None):
         self.event_counter = 0
         self.name = "HealthWellnessHooks"
         self.session_start_time = time.time()
-        self.agent_performance: Dict[str, AgentPerformanceEntry] = {}
+        # Keyed by agent name, so bounded by the number of agents
+        self.agent_performance: Dict[str, _AgentPerformance] = {}
         self.tool_usage: Dict[str, int] = {}
-        self.handoff_history: List[HandoffRecord] = []
-        self.errors: List[ErrorRecord] = []
+        # Only the most recent entries stay in memory; older ones are spilled to the session store
+        self.handoff_history: RingLog[_HandoffEntry] = RingLog(src.config.SESSION_LOG_CAPACITY)
+        self.errors: RingLog[_ErrorEntry] = RingLog(src.config.SESSION_LOG_CAPACITY)
+        self.user_name = "unknown"
+        self.speculation = SpeculationMetrics()
         self.session_id = f"session_{int(self.session_start_time)}"
+        self.session_store = session_store
+        self.span_metrics = SpanMetrics()
+        self.streaming = StreamStats()
+        # Open spans: (start time, usage.total_tokens at start), keyed by span
+        self._open_spans: Dict[tuple, List[tuple]] = {}
+        self._pending_handoffs: Dict[str, List[tuple]] = {}
+        # Entries of each hooks log already written to the session store
+        self._spilled = {"handoff_history": 0, "errors": 0}
 
 
     
     def _log_event(self, event_type: str, details: Dict[str, Any]):
-        """Centralized logging with timestamp and structured data using logfire"""
-        timestamp = datetime.now().isoformat()
+        """Centralized structured logging; records are batched and flushed by the telemetry pipeline"""
         self.event_counter += 1
-        session_duration = round(time.time() - self.session_start_time, 2)
-        
-        # Create structured log entry for logfire
-        log_entry = AgentLog(
-            trace_id=self.session_id,
-            agent_name=details.get("agent_name", "unknown"),
+        telemetry.emit(create_record(
+            level="info",
             event_type=event_type,
-            user_name=details.get("user_name", "unknown"),
-            user_uid=details.get("user_uid", "unknown"),
-            timestamp=timestamp,
-            session_duration=session_duration,
-            metadata={
-                "event_id": self.event_counter,
-                "session_duration": session_duration,
-                **details
-            }
-        )
-        
-        # Log to logfire
-        logfire.log(
-            "info", 
-            msg_template=f"Health Wellness Agent Event: {event_type}",
-            attributes=log_entry.model_dump()
-        )
-        
-        # Console output for debugging
-        print(Fore.YELLOW, f"\n> {self.name} #{self.event_counter} [{timestamp}] {event_type}\n", Style.RESET_ALL)
-        
-        return log_entry.model_dump()
+            message=f"Health Wellness Agent Event: {event_type}",
+            trace_id=self.session_id,
+            event_id=self.event_counter,
+            session_start_time=self.session_start_time,
+            details=details,
+        ))
     
         
     def _log_error(self, method_name: str, error_message: str, context: Dict[str, Any]):
-        """Log errors with context for debugging using logfire"""
-        timestamp = datetime.now().isoformat()
-        session_duration = round(time.time() - self.session_start_time, 2)
-        
-        error_record: ErrorRecord = {
-            "method": method_name,
-            "error": error_message,
-            "timestamp": timestamp,
-            "context": context, 
-        }
-        self.errors.append(error_record)
+        """Log errors with context for debugging through the telemetry pipeline"""
+        self.errors.append(_ErrorEntry(method_name, error_message, context))
         
-        # Create structured error log entry for logfire
-        error_log_entry = AgentLog(
-            trace_id=self.session_id,
-            agent_name=context.get("agent_name", "unknown"),
+        telemetry.emit(create_record(
+            level="error",
             event_type="ERROR",
-            user_name=context.get("user_name", "unknown"),
-            user_uid=context.get("user_uid", "unknown"),
-            timestamp=timestamp,
-            session_duration=session_duration,
-            metadata={
+            message=f"Health Wellness Agent Error in {method_name}: {error_message}",
+            trace_id=self.session_id,
+            event_id=self.event_counter,
+            session_start_time=self.session_start_time,
+            details={
+                "agent_name": context.get("agent_name", "unknown"),
+                "user_name": context.get("user_name", "unknown"),
+                "user_uid": context.get("user_uid", "unknown"),
                 "method": method_name,
                 "error": error_message,
                 "context": context,
-                "session_duration": session_duration
-            }
-        )
-        
-        # Log error to logfire
-        logfire.log(
-            "error",
-            msg_template=f"Health Wellness Agent Error in {method_name}: {error_message}",
-            attributes=error_log_entry.model_dump()
-        )
-        
-        # Console output for debugging
-        print(Fore.RED, f"\n⚠ {self.name} ERROR in {method_name}: {error_message}", Style.RESET_ALL)
-        print(f"   Context: {json.dumps(context, indent=2)}")
-        print()
+            },
+        ))
     
     
     def _log_guardrail_voilation(self, exception_type: str, error_message: str, context: Dict[str, Any]):
-        """Log guardrail voilation with context for debugging using logfire"""
-        timestamp = datetime.now().isoformat()
-        session_duration = round(time.time() - self.session_start_time, 2)
-        
-        # Create structured voilation log entry for logfire
-        voilation_log_entry = AgentLog(
-            trace_id=self.session_id,
-            agent_name=context.get("agent_name", "unknown"),
+        """Log guardrail voilation with context for debugging through the telemetry pipeline"""
+        telemetry.emit(create_record(
+            level="warning",
             event_type="GUARDRAIL_VIOLATION",
-            user_name=context.get("user_name", "unknown"),
-            user_uid=context.get("user_uid", "unknown"),
-            timestamp=timestamp,
-            session_duration=session_duration,
-            metadata={
+            message=f"Guardrail voilation: {exception_type}",
+            trace_id=self.session_id,
+            event_id=self.event_counter,
+            session_start_time=self.session_start_time,
+            details={
+                "agent_name": context.get("agent_name", "unknown"),
+                "user_name": context.get("user_name", "unknown"),
+                "user_uid": context.get("user_uid", "unknown"),
                 "exception_type": exception_type,
                 "error_message": error_message,
                 "user_input": context.get("user_input", "unknown"),
                 "context": context,
-                "session_duration": session_duration
-            }
-        )
-        
-        # Log guradrail voilation to logfire
-        logfire.log(
-            "warning",
-            msg_template=f"Guardrail voilation: {exception_type}",
-            attributes=voilation_log_entry.model_dump()
-        )
+            },
+        ))
+
+    
+    async def _persist(self, method_name: str, context: RunContextWrapper[UserSessionContext]):
+        """Write whatever the agent or tool changed in the session to the session store"""
+        if self.session_store is None:
+            return
+        try:
+            await self.session_store.save(context.context)
+            await self._spill_logs(context.context.uid)
+        except Exception as e:
+            self._log_error(
+                method_name=method_name,
+                error_message=f"Failed to persist session: {e}",
+                context={"user_uid": context.context.uid},
+            )
+
+
+    async def _spill_logs(self, uid: str):
+        """Write hooks log entries appended since the last spill to the session store"""
+        for name, log in (("handoff_history", self.handoff_history), ("errors", self.errors)):
+            start = max(self._spilled[name], log.dropped)
+            if start >= log.total:
+                continue
+            if name == "handoff_history":
+                records = [entry.as_dict(self.user_name) for entry in log.since(start)]
+            else:
+                records = [entry.as_dict() for entry in log.since(start)]
+            await asyncio.to_thread(
+                self.session_store.append_records, uid, f"hooks:{self.session_id}:{name}", start, records,
+            )
+            self._spilled[name] = log.total
+
+
+    def _start_span(self, key: tuple, context: RunContextWrapper[UserSessionContext]):
+        self._open_spans.setdefault(key, []).append((time.perf_counter(), context.usage.total_tokens))
+
+
+    def _end_span(self, key: tuple, context: RunContextWrapper[UserSessionContext]) -> Optional[tuple]:
+        """Close the latest open span for `key` and record it; returns (seconds, token delta)"""
+        starts = self._open_spans.get(key)
+        if not starts:
+            return None
+        started, start_tokens = starts.pop()
+        if not starts:
+            del self._open_spans[key]
+
+        seconds = time.perf_counter() - started
+        # Usage is cumulative over the run, the span used the difference
+        tokens = max(0, context.usage.total_tokens - start_tokens)
+        kind, name = key[0], key[-1]
+        self.span_metrics.observe(kind, name, seconds, tokens)
+        span_metrics.observe(kind, name, seconds, tokens)
+        return seconds, tokens
+
+
+    def _end_agent_span(self, agent_name: str, context: RunContextWrapper[UserSessionContext]) -> Optional[tuple]:
+        span = self._end_span(("agent", agent_name), context)
+        if span is not None and agent_name in self.agent_performance:
+            self.agent_performance[agent_name].total_tokens += span[1]
+        return span
+
 
-        # Console output for debugging
-        print(Fore.RED, f"\n⚠ {exception_type}: {error_message}", Style.RESET_ALL)
-        print(f"   Context: {json.dumps(context, indent=2)}\n")
+
+    def record_stream(self, stream: StreamMetrics):
+        """Fold a finished streamed response into the session's streaming latency"""
+        self.streaming.record(stream)
+        for metrics in (self.span_metrics, span_metrics):
+            if stream.time_to_first_token is not None:
+                metrics.observe("stream", "time_to_first_token", stream.time_to_first_token)
+            metrics.observe("stream", "duration", stream.duration)
+            metrics.merge("stream", "inter_chunk_gap", stream.gaps)
+        self._log_event("STREAM_END", stream.as_dict())
 
     
     #  ----------------------------- Hooks -----------------------------
@@ -186,19 +283,25 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
             agent_name = agent.name
             user_name = context.context.name
             user_uid = context.context.uid
-            
-
+            self.user_name = user_name
             
             # Initialize agent performance tracking
-            if agent_name not in self.agent_performance:
-                self.agent_performance[agent_name] = {
-                    "start_count": 0,
-                    "total_tokens": 0,
-                    "last_used": None
-                } 
+            performance = self.agent_performance.get(agent_name)
+            if performance is None:
+                performance = self.agent_performance[sys.intern(agent_name)] = _AgentPerformance()
             
-            self.agent_performance[agent_name]["start_count"] += 1
-            self.agent_performance[agent_name]["last_used"] = datetime.now().isoformat()
+            performance.start_count += 1
+            performance.last_used = int(time.time())
+            self._start_span(("agent", agent_name), context)
+            
+            # A handoff span lasts until the receiving agent starts
+            pending = self._pending_handoffs.get(agent_name)
+            if pending:
+                handoff_name, started, start_tokens = pending.pop(0)
+                seconds = time.perf_counter() - started
+                tokens = max(0, context.usage.total_tokens - start_tokens)
+                self.span_metrics.observe("handoff", handoff_name, seconds, tokens)
+                span_metrics.observe("handoff", handoff_name, seconds, tokens)
             
             details = {
                 "agent_name": agent_name,
@@ -226,18 +329,20 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
             user_name = context.context.name
             
             # Update performance metrics
-            if agent_name in self.agent_performance:
-                self.agent_performance[agent_name]["total_tokens"] = context.usage.total_tokens 
+            span = self._end_agent_span(agent_name, context)
             
             details = {
                 "agent_name": agent_name,
                 "user_name": user_name,
                 "final_tokens": context.usage.total_tokens,
+                "duration_seconds": round(span[0], 4) if span else None,
+                "span_tokens": span[1] if span else None,
                 "output_length": len(str(output)) if output else 0,
                 "output_type": type(output).__name__, # Class name if it is stuructured output else str
             }
             
             self._log_event("AGENT_END", details)
+            await self._persist("on_agent_end", context)
             
         except Exception as e:
             self._log_error(
@@ -258,6 +363,7 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
             if tool_name not in self.tool_usage:
                 self.tool_usage[tool_name] = 0
             self.tool_usage[tool_name] += 1
+            self._start_span(("tool", agent_name, tool_name), context)
             
             details = {
                 "agent_name": agent_name,
@@ -286,6 +392,7 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
             agent_name = agent.name
             tool_name = tool.name
             user_name = context.context.name
+            span = self._end_span(("tool", agent_name, tool_name), context)
             
             details = {
                 "agent_name": agent_name,
@@ -294,9 +401,11 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
                 "result_length": len(str(result)) if result else 0,
                 "result_type": type(result).__name__,
                 "final_tokens": context.usage.total_tokens,
+                "duration_seconds": round(span[0], 4) if span else None,
             }
             
             self._log_event("TOOL_END", details)
+            await self._persist("on_tool_end", context)
             
         except Exception as e:
             self._log_error(
@@ -315,25 +424,28 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
             to_agent_name = to_agent.name
             user_name = context.context.name
             
+            # The handing-off agent gets no on_agent_end, its span ends here
+            self._end_agent_span(from_agent_name, context)
+            self._pending_handoffs.setdefault(to_agent_name, []).append(
+                (f"{from_agent_name} → {to_agent_name}", time.perf_counter(), context.usage.total_tokens)
+            )
+            
             # Record handoff in history
-            handoff_record: HandoffRecord = {
-                "timestamp": datetime.now().isoformat(),
-                "from_agent": from_agent_name,
-                "to_agent": to_agent_name,
-                "user_name": user_name,
-                "total_tokens": context.usage.total_tokens if hasattr(context, 'usage') else 0
-            }
-            self.handoff_history.append(handoff_record)
+            self.handoff_history.append(_HandoffEntry(
+                from_agent_name,
+                to_agent_name,
+                context.usage.total_tokens if hasattr(context, 'usage') else 0,
+            ))
             
             # Update context handoff logs
-            context.context.handoff_logs.append(f"{from_agent_name} → {to_agent_name}")
+            context.context.handoff_logs.record("handoff", source=from_agent_name, target=to_agent_name)
             
             details = {
                 "from_agent": from_agent_name,
                 "to_agent": to_agent_name,
                 "user_name": user_name,
                 "handoff_reason": f"Specialized expertise needed: {to_agent_name}",
-                "total_handoffs": len(self.handoff_history),
+                "total_handoffs": self.handoff_history.total,
                 "current_tokens": context.usage.total_tokens if hasattr(context, 'usage') else 0
             }
             
@@ -358,11 +470,13 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
         return {
             "session_duration_seconds": session_duration,
             "total_events": self.event_counter,
-            "agent_performance": self.agent_performance,
+            "agent_performance": {name: entry.as_dict() for name, entry in self.agent_performance.items()},
             "tool_usage": self.tool_usage,
-            "handoff_history": self.handoff_history,
-            "error_count": len(self.errors),
-            "errors": self.errors if self.errors else None
+            "handoff_history": [entry.as_dict(self.user_name) for entry in self.handoff_history],
+            "error_count": self.errors.total,
+            "errors": [entry.as_dict() for entry in self.errors] if self.errors else None,
+            "latency": self.span_metrics.snapshot(),
+            "streaming": self.streaming.as_dict(),
         }
     
 
@@ -389,15 +503,80 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
                 print(f"  {tool}: {count} times")
         
         if summary['handoff_history']:
-            print(f"\nHandoffs: {len(summary['handoff_history'])}")
+            print(f"\nHandoffs: {self.handoff_history.total}")
             for handoff in summary['handoff_history']:
                 print(f"  {handoff['from_agent']} → {handoff['to_agent']}")
         
+        if self.streaming.streams:
+            stream_latency = summary['latency'].get('stream', {})
+            ttft = stream_latency.get('time_to_first_token', {})
+            gaps = stream_latency.get('inter_chunk_gap', {})
+            print("\nStreaming:")
+            print(f"  {self.streaming.streams} streams, {self.streaming.chunks} chunks, {self.streaming.bytes} bytes")
+            print(f"  time to first token p50 {ttft.get('p50_seconds', 0)}s / p95 {ttft.get('p95_seconds', 0)}s, "
+                  f"inter-chunk gap p50 {gaps.get('p50_seconds', 0)}s / p95 {gaps.get('p95_seconds', 0)}s")
+        
+        if summary['latency']:
+            print("\nLatency (p50 / p95 / p99):")
+            for kind, spans in summary['latency'].items():
+                for span_name, stats in spans.items():
+                    print(f"  {kind} {span_name}: {stats['p50_seconds']}s / {stats['p95_seconds']}s / {stats['p99_seconds']}s "
+                          f"over {stats['count']} spans, {stats['tokens']} tokens")
+        
+        # Imported here, src.guardrails depends on this module
+        from src.guardrails import fast_path_stats, guardrail_cache
+        from src.tools.medical_templates import medical_plan_stats
+        from src.tools.plan_cache import workout_plan_cache
+        
+        if fast_path_stats.total_queries:
+            print("\nHealth Guardrail Fast Path:")
+            print(f"  {fast_path_stats.short_circuited}/{fast_path_stats.total_queries} short-circuited "
+                  f"({fast_path_stats.short_circuit_rate:.0%}), ~{fast_path_stats.estimated_seconds_saved:.2f}s saved")
+        
+        if self.speculation.runs:
+            speculation = self.speculation.as_dict()
+            print("\nSpeculative Execution:")
+            print(f"  {speculation['committed']} committed, {speculation['aborted']} aborted, "
+                  f"{speculation['avg_ttft_saved_seconds']}s avg time-to-first-token saved, "
+                  f"{speculation['wasted_tokens']} wasted tokens")
+        
+        cache_stats = guardrail_cache.stats
+        if cache_stats.hits or cache_stats.misses:
+            print("\nGuardrail Verdict Cache:")
+            print(f"  {cache_stats.hits} hits, {cache_stats.misses} misses ({cache_stats.hit_rate:.0%} hit rate), "
+                  f"{len(guardrail_cache)} entries")
+        
+        plan_stats = workout_plan_cache.stats
+        if plan_stats.hits or plan_stats.misses:
+            print("\nWorkout Plan Cache:")
+            print(f"  {plan_stats.hits} hits, {plan_stats.misses} misses ({plan_stats.hit_rate:.0%} hit rate), "
+                  f"{len(workout_plan_cache)} entries")
+        
+        if medical_plan_stats.by_condition:
+            print("\nMedical Meal Plans (template / cache / model):")
+            for condition, counts in medical_plan_stats.as_dict().items():
+                print(f"  {condition}: {counts['template']} / {counts['cache']} / {counts['model']} "
+                      f"({counts['hit_rate']:.0%} served without the model)")
+        
+        if transport_stats.requests:
+            pool = transport_stats.as_dict()
+            print("\nHTTP Connection Pool:")
+            print(f"  {pool['requests']} requests, {pool['new_connections']} new / {pool['reused_connections']} reused connections, "
+                  f"{pool['warmed_connections']} warmed at startup")
+            print(f"  {pool['avg_pool_wait_ms']}ms avg / {pool['max_pool_wait_ms']}ms max pool wait, "
+                  f"{pool['peak_saturation']:.0%} peak saturation, {pool['peak_waiting_for_connection']} peak waiting")
+        
+        if telemetry.stats.dropped or telemetry.stats.sink_errors:
+            print("\nTelemetry:")
+            print(f"  {telemetry.stats.dropped} records dropped, {telemetry.stats.sink_errors} sink errors")
+        
         print("="*60)
 
 
 
         if log_in_logfire:
+            import logfire
+
             # Log session summary to logfire
             session_log_entry = AgentLog(
                 trace_id=self.session_id,
@@ -414,7 +593,9 @@ class HealthWellnessHooks(RunHooks[UserSessionContext]):
                     "agent_performance": summary['agent_performance'],
                     "tool_usage": summary['tool_usage'],
                     "handoff_history": summary['handoff_history'],
-                    "errors": summary['errors']
+                    "errors": summary['errors'],
+                    "latency": summary['latency'],
+                    "streaming": summary['streaming'],
                 }
             )
             
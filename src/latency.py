@@ -0,0 +1,237 @@
+"""
+Latency histograms and token counters for agent, tool and handoff spans.
+
+`HealthWellnessHooks` times every span and records it twice: in its own
+`SpanMetrics` (per session, reported by `get_session_summary`) and in the
+process-wide `span_metrics` that the API server exposes in Prometheus text
+format on `/metrics`. Histograms use fixed buckets, so recording is O(1) and
+percentiles are estimated by interpolating within the bucket.
+
+`StreamMetrics` times a single streamed response (time to first token,
+inter-chunk gaps, duration, chunk and byte counts); the hooks fold finished
+streams into `StreamStats` and the "stream" span histograms.
+"""
+
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# Upper bounds in seconds, from quick local tools to long model calls
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 60.0, 120.0)
+
+PERCENTILES = (50, 95, 99)
+
+METRIC_PREFIX = "health_wellness"
+
+
+@dataclass
+class LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    """Observations per bucket; the last bucket is everything above the largest bound."""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    tokens: int = 0
+
+
+    def observe(self, seconds: float, tokens: int = 0):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.tokens += tokens
+
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.tokens += other.tokens
+
+
+    def percentile(self, percent: float) -> float:
+        """Estimated percentile, interpolated linearly within its bucket."""
+
+        if not self.count:
+            return 0.0
+
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+
+    def as_dict(self) -> Dict[str, float]:
+        result = {
+            "count": self.count,
+            "avg_seconds": round(self.total / self.count, 4) if self.count else 0.0,
+            "max_seconds": round(self.max, 4),
+            "total_seconds": round(self.total, 4),
+            "tokens": self.tokens,
+        }
+        for percent in PERCENTILES:
+            result[f"p{percent}_seconds"] = round(self.percentile(percent), 4)
+        return result
+
+
+class SpanMetrics:
+    """Histograms keyed by span kind ("agent", "tool", "handoff") and name."""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+
+    def observe(self, kind: str, name: str, seconds: float, tokens: int = 0):
+        key = (kind, name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.observe(seconds, tokens)
+
+
+    def merge(self, kind: str, name: str, other: LatencyHistogram):
+        key = (kind, name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.merge(other)
+
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{kind: {name: count, avg, max, total, tokens and p50/p95/p99}}"""
+
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (kind, name), histogram in sorted(self.histograms.items()):
+            result.setdefault(kind, {})[name] = histogram.as_dict()
+        return result
+
+
+    def render_prometheus(self) -> str:
+        """Histograms and token counters in the Prometheus text exposition format."""
+
+        duration = f"{METRIC_PREFIX}_span_duration_seconds"
+        tokens = f"{METRIC_PREFIX}_span_tokens_total"
+        lines = [
+            f"# HELP {duration} Duration of agent, tool and handoff spans.",
+            f"# TYPE {duration} histogram",
+        ]
+        for (kind, name), histogram in sorted(self.histograms.items()):
+            labels = f'kind="{kind}",name="{_escape_label(name)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{duration}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{duration}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{duration}_count{{{labels}}} {histogram.count}")
+
+        lines += [
+            f"# HELP {tokens} Model tokens used within agent, tool and handoff spans.",
+            f"# TYPE {tokens} counter",
+        ]
+        for (kind, name), histogram in sorted(self.histograms.items()):
+            lines.append(f'{tokens}{{kind="{kind}",name="{_escape_label(name)}"}} {histogram.tokens}')
+
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class StreamMetrics:
+    """Timing of one streamed response, measured from the request to the last chunk."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    first_chunk_at: Optional[float] = None
+    last_chunk_at: Optional[float] = None
+    ended_at: Optional[float] = None
+    chunks: int = 0
+    bytes: int = 0
+    gaps: LatencyHistogram = field(default_factory=LatencyHistogram)
+    """Time between consecutive chunks."""
+    outcome: Optional[str] = None
+    """"completed", "guardrail", "error" or "cancelled" once the stream has ended."""
+
+
+    def record_chunk(self, chunk: str):
+        now = time.perf_counter()
+        if self.first_chunk_at is None:
+            self.first_chunk_at = now
+        else:
+            self.gaps.observe(now - self.last_chunk_at)
+        self.last_chunk_at = now
+        self.chunks += 1
+        self.bytes += len(chunk.encode())
+
+
+    def finish(self, outcome: str):
+        if self.ended_at is None:
+            self.ended_at = time.perf_counter()
+            self.outcome = outcome
+
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        return None if self.first_chunk_at is None else self.first_chunk_at - self.started_at
+
+
+    @property
+    def duration(self) -> float:
+        return (self.ended_at or time.perf_counter()) - self.started_at
+
+
+    def as_dict(self) -> Dict[str, object]:
+        ttft = self.time_to_first_token
+        return {
+            "time_to_first_token_seconds": None if ttft is None else round(ttft, 4),
+            "duration_seconds": round(self.duration, 4),
+            "chunks": self.chunks,
+            "bytes": self.bytes,
+            "avg_inter_chunk_gap_seconds": round(self.gaps.total / self.gaps.count, 4) if self.gaps.count else None,
+            "p95_inter_chunk_gap_seconds": round(self.gaps.percentile(95), 4) if self.gaps.count else None,
+            "max_inter_chunk_gap_seconds": round(self.gaps.max, 4) if self.gaps.count else None,
+            "outcome": self.outcome,
+        }
+
+
+@dataclass
+class StreamStats:
+    """Totals over the finished streams of a session."""
+
+    streams: int = 0
+    chunks: int = 0
+    bytes: int = 0
+    outcomes: Dict[str, int] = field(default_factory=dict)
+
+
+    def record(self, stream: StreamMetrics):
+        self.streams += 1
+        self.chunks += stream.chunks
+        self.bytes += stream.bytes
+        self.outcomes[stream.outcome or "unknown"] = self.outcomes.get(stream.outcome or "unknown", 0) + 1
+
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "streams": self.streams,
+            "chunks": self.chunks,
+            "bytes": self.bytes,
+            "avg_chunks_per_stream": round(self.chunks / self.streams, 1) if self.streams else 0.0,
+            "outcomes": dict(self.outcomes),
+        }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Aggregated over every session in the process
+span_metrics = SpanMetrics()
@@ -1,4 +1,3 @@
-from datetime import datetime
 from agents import Agent, RunContextWrapper
 from agents.extensions.handoff_prompt import prompt_with_handoff_instructions
 
@@ -8,8 +7,7 @@ from src.tools import escalate_to_human_coach
 
 def on_escalation_agent_handoff(ctx: RunContextWrapper[UserSessionContext]):
     # Log the escalation in context
-    escalation_log_entry = f"hand_off_to_escalation_agent~{datetime.now().isoformat()}"
-    ctx.context.handoff_logs.append(escalation_log_entry)
+    ctx.context.handoff_logs.record("hand_off_to_escalation_agent")
 
 # Main escalation agent
 escalation_agent = Agent[UserSessionContext](
@@ -1,4 +1,3 @@
-from datetime import datetime
 from agents import Agent, RunContextWrapper
 from agents.extensions.handoff_prompt import prompt_with_handoff_instructions
 from pydantic import BaseModel
@@ -19,8 +18,7 @@ class InjuryAdaptationOutput(BaseModel):
 
 def on_injury_support_agent_handoff(ctx: RunContextWrapper[UserSessionContext]):
     # Log the injury in context
-    injury_log_entry = f"hand_off_to_injury_support_agent~{datetime.now().isoformat()}"
-    ctx.context.handoff_logs.append(injury_log_entry)
+    ctx.context.handoff_logs.record("hand_off_to_injury_support_agent")
 
 # Main injury support agent
 injury_support_agent = Agent[UserSessionContext](
@@ -11,6 +11,7 @@ from src.tools import (
     read_context_data,
     checkin_scheduler_google,
     checkin_scheduler_local,
+    progress_analytics,
     progress_tracker,
     workout_recommender,
     get_current_time
@@ -53,7 +54,7 @@ def dynamic_instructions(
         context_summary += f"Injury Information: {context.context.injury_notes[-3:]}...\n"
     
     if has_meal_plan:
-        context_summary += f"Meal Plan: {len(context.context.meal_plan)} days available\n"
+        context_summary += f"Meal Plan: {len(context.context.meal_plan.days)} days available\n"
     
     if has_workout_plan:
         context_summary += f"Workout Plan: Available\n"
@@ -100,6 +101,7 @@ def dynamic_instructions(
     - meal_planner: Generate personalized meal plans
     - workout_recommender: Create tailored workout schedules
     - progress_tracker: Log and track user progress updates
+    - progress_analytics: Weight trend, weekly rollups and goal projection ("am I on track?")
     - checkin_scheduler_local: Schedule local calendar reminders
     - checkin_scheduler_google: Schedule Google Calendar reminders
     - read_context_data: Access user session information
@@ -163,6 +165,7 @@ main_agent = Agent[UserSessionContext](
         meal_planner,
         workout_recommender,
         progress_tracker,
+        progress_analytics,
         checkin_scheduler_local,
         checkin_scheduler_google,
         read_context_data,
@@ -1,4 +1,3 @@
-from datetime import datetime
 from agents import Agent, RunContextWrapper
 from agents.extensions.handoff_prompt import prompt_with_handoff_instructions
 
@@ -8,8 +7,7 @@ from src.tools import meal_planner, medical_meal_planner, progress_tracker, get_
 
 def on_nutrition_agent_handoff(ctx: RunContextWrapper[UserSessionContext]):
     # Log the nutrition in context
-    nutrition_log_entry = f"hand_off_to_nutrition_agent~{datetime.now().isoformat()}"
-    ctx.context.handoff_logs.append(nutrition_log_entry)
+    ctx.context.handoff_logs.record("hand_off_to_nutrition_agent")
 
 
 nutrition_expert_agent = Agent[UserSessionContext](
@@ -0,0 +1,192 @@
+"""
+Bounded, compact logs for long-lived sessions.
+
+`RingLog` keeps the most recent `capacity` entries and counts every entry ever
+appended (`total`), so whoever persists it can tell which entries are new
+even after old ones were evicted: the session store writes them behind as
+they are appended, and only the tail stays in memory.
+
+`HandoffEvent` is a slotted record with an integer timestamp and interned
+event and agent names; `HandoffLog` is the ring of them used for
+`UserSessionContext.handoff_logs`. It validates from the legacy list of
+strings and serializes to a list of dicts.
+"""
+
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, ClassVar, Deque, Dict, Generic, Iterable, Iterator, Optional, Type, TypeVar
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from src.config import SESSION_HANDOFF_LOG_LOAD_LIMIT
+
+
+T = TypeVar("T")
+
+
+class RingLog(Generic[T]):
+    """The last `capacity` appended entries, plus the count of all entries ever appended."""
+
+    __slots__ = ("_entries", "total")
+
+    def __init__(self, capacity: int, entries: Iterable[T] = ()):
+        self._entries: Deque[T] = deque(maxlen=max(1, capacity))
+        self.total = 0
+        self.extend(entries)
+
+
+    @property
+    def capacity(self) -> int:
+        return self._entries.maxlen
+
+
+    @property
+    def dropped(self) -> int:
+        """Entries evicted from memory."""
+        return self.total - len(self._entries)
+
+
+    def append(self, entry: T):
+        self._entries.append(entry)
+        self.total += 1
+
+
+    def extend(self, entries: Iterable[T]):
+        for entry in entries:
+            self.append(entry)
+
+
+    def since(self, index: int) -> Iterator[T]:
+        """Retained entries whose position in the whole log is `index` or later."""
+        return islice(self._entries, max(0, index - self.dropped), None)
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._entries)
+
+
+    def __getitem__(self, index: int) -> T:
+        return self._entries[index]
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(capacity={self.capacity}, total={self.total}, entries={list(self._entries)!r})"
+
+
+class HandoffEvent:
+    """
+    A handoff or plan event of a session: when, what, and between which agents.
+    `timestamp` is in Unix seconds, 0 when unknown (entries migrated from old logs).
+    """
+
+    __slots__ = ("timestamp", "event", "source", "target")
+
+    def __init__(self, event: str, source: str = "", target: str = "", timestamp: Optional[int] = None):
+        self.timestamp = int(time.time()) if timestamp is None else timestamp
+        self.event = sys.intern(event)
+        self.source = sys.intern(source)
+        self.target = sys.intern(target)
+
+
+    @classmethod
+    def coerce(cls, value: Any) -> "HandoffEvent":
+        if isinstance(value, HandoffEvent):
+            return value
+        if isinstance(value, dict):
+            stamp = value.get("date")
+            return cls(
+                event=value["event"],
+                source=value.get("source") or "",
+                target=value.get("target") or "",
+                timestamp=int(datetime.fromisoformat(stamp).timestamp()) if stamp else 0,
+            )
+        if isinstance(value, str):
+            return cls.from_legacy(value)
+        raise ValueError(f"Cannot read a handoff event from {type(value).__name__}")
+
+
+    @classmethod
+    def from_legacy(cls, text: str) -> "HandoffEvent":
+        """Parse the strings older versions stored, e.g. "A → B" or "hand_off_to_x~<iso time>"."""
+
+        if " → " in text:
+            source, target = text.split(" → ", 1)
+            return cls("handoff", source, target, timestamp=0)
+
+        event, stamp = text, ""
+        if "~" in text:
+            event, stamp = text.rsplit("~", 1)
+        elif text.startswith("medical_meal_plan_created_"):
+            event, stamp = text.rsplit("_", 1)
+
+        try:
+            timestamp = int(datetime.fromisoformat(stamp).timestamp()) if stamp else 0
+        except ValueError:
+            event, timestamp = text, 0
+
+        if event.startswith("medical_meal_plan_created_"):
+            return cls("medical_meal_plan_created", target=event[len("medical_meal_plan_created_"):], timestamp=timestamp)
+        return cls(event, timestamp=timestamp)
+
+
+    def as_dict(self) -> Dict[str, str]:
+        return {
+            "date": datetime.fromtimestamp(self.timestamp).isoformat() if self.timestamp else None,
+            "event": self.event,
+            "source": self.source,
+            "target": self.target,
+        }
+
+
+    def __repr__(self) -> str:
+        return f"HandoffEvent({self.event!r}, {self.source!r}, {self.target!r}, timestamp={self.timestamp})"
+
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Type[Any], handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda event: event.as_dict()),
+        )
+
+
+class HandoffLog(RingLog[HandoffEvent]):
+    """Most recent handoff events of a session; older ones live in the session store."""
+
+    __slots__ = ()
+
+    item_type: ClassVar[type] = HandoffEvent
+
+    def __init__(self, entries: Iterable[Any] = (), capacity: int = SESSION_HANDOFF_LOG_LOAD_LIMIT):
+        super().__init__(capacity, (HandoffEvent.coerce(entry) for entry in entries))
+
+
+    def record(self, event: str, source: str = "", target: str = "") -> HandoffEvent:
+        entry = HandoffEvent(event, source, target)
+        self.append(entry)
+        return entry
+
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Type[Any], handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        def validate(value: Any) -> "HandoffLog":
+            if isinstance(value, HandoffLog):
+                return value
+            if isinstance(value, (list, tuple, deque)):
+                return cls(value)
+            raise ValueError("handoff_logs must be a list")
+
+        return core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda log: [entry.as_dict() for entry in log],
+            ),
+        )
@@ -0,0 +1,394 @@
+"""
+Durable, incremental storage of `UserSessionContext` in SQLite (WAL mode).
+
+Scalar and object fields (goal, plans, preferences, ...) are stored as one row
+per field and only rewritten when the field was reassigned since the last
+save, detected by object identity. List fields (progress logs, injury notes,
+handoff logs) are append-only: one row per item, and a save only inserts the
+items past the last synced length. A save therefore costs the size of what
+changed, not the size of the session, and a load is a primary-key range scan.
+
+Bounded logs (`RingLog` fields such as handoff logs) are list sections too:
+new entries are written behind as they are appended, so entries evicted from
+memory stay available through `load_items`. Hooks logs that are not part of
+the context are appended with `append_records`.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import typing
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from src.config import SESSION_DB_PATH, SESSION_HANDOFF_LOG_LOAD_LIMIT, SESSION_STORE_ENABLED
+from src.context import UserSessionContext
+from src.session_logs import RingLog
+
+
+def _is_log(annotation: Any) -> bool:
+    """Log containers that declare their item type (RingLog subclasses, ProgressLog)."""
+    return isinstance(annotation, type) and hasattr(annotation, "item_type")
+
+
+def _item_type(annotation: Any) -> Any:
+    return annotation.item_type if _is_log(annotation) else typing.get_args(annotation)[0]
+
+
+# List fields (and bounded logs) stored one row per item; everything else is stored one row per field
+LIST_SECTIONS: Tuple[str, ...] = tuple(
+    name for name, info in UserSessionContext.model_fields.items()
+    if typing.get_origin(info.annotation) in (list, List) or _is_log(info.annotation)
+)
+FIELD_SECTIONS: Tuple[str, ...] = tuple(
+    name for name in UserSessionContext.model_fields if name not in LIST_SECTIONS and name != "uid"
+)
+
+_FIELD_ADAPTERS: Dict[str, TypeAdapter] = {
+    name: TypeAdapter(UserSessionContext.model_fields[name].annotation) for name in FIELD_SECTIONS
+}
+_ITEM_ADAPTERS: Dict[str, TypeAdapter] = {
+    name: TypeAdapter(_item_type(UserSessionContext.model_fields[name].annotation)) for name in LIST_SECTIONS
+}
+
+# Only the most recent items of these sections are loaded into memory; older ones stay in the store
+LOAD_LIMITS: Dict[str, int] = {"handoff_logs": SESSION_HANDOFF_LOG_LOAD_LIMIT}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    uid TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_fields (
+    uid TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (uid, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS session_items (
+    uid TEXT NOT NULL,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (uid, section, position)
+) WITHOUT ROWID;
+"""
+
+
+def session_uid(identifier: Optional[str] = None) -> str:
+    """
+    Stable uid for an authenticated identifier, so the user resumes their
+    session; a fresh random uid when there is none. Display names are not
+    identifiers: two anonymous users called the same would share a session.
+    """
+    if not identifier or not identifier.strip():
+        return str(uuid.uuid4())
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"health-wellness-planner:{identifier.strip().lower()}"))
+
+
+@dataclass
+class _SyncState:
+    """What the store last saw of one in-memory session."""
+
+    fields: Dict[str, Any] = field(default_factory=dict)
+    """Field name -> the object that was last written (compared by identity)."""
+    lists: Dict[str, Tuple[Any, int, int]] = field(default_factory=dict)
+    """Section -> (list object, store position of its first item, number of items synced, counting evicted ones)."""
+
+
+@dataclass
+class SessionChanges:
+    uid: str
+    fields: List[Tuple[str, str]] = field(default_factory=list)
+    items: List[Tuple[str, int, str]] = field(default_factory=list)
+    truncate: List[Tuple[str, int]] = field(default_factory=list)
+    """(section, position): delete stored items from position on before inserting."""
+    synced: Optional[_SyncState] = None
+    """What the store has seen of the session once these changes are written."""
+
+
+    @property
+    def rows(self) -> int:
+        return len(self.fields) + len(self.items)
+
+
+    @property
+    def bytes(self) -> int:
+        return sum(len(data) for _, data in self.fields) + sum(len(data) for _, _, data in self.items)
+
+
+@dataclass
+class SessionStoreStats:
+    saves: int = 0
+    rows_written: int = 0
+    bytes_written: int = 0
+    loads: int = 0
+    load_seconds: float = 0.0
+
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "saves": self.saves,
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "avg_rows_per_save": round(self.rows_written / self.saves, 2) if self.saves else 0.0,
+            "loads": self.loads,
+            "avg_load_ms": round(self.load_seconds / self.loads * 1000, 3) if self.loads else 0.0,
+        }
+
+
+class SessionStore:
+    """SQLite-backed store of user sessions with incremental saves."""
+
+    def __init__(self, path: str | Path = SESSION_DB_PATH):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+
+        self.stats = SessionStoreStats()
+        self._states: Dict[str, _SyncState] = {}
+        self._save_locks: Dict[str, asyncio.Lock] = {}
+
+
+    def load(self, uid: str) -> Optional[UserSessionContext]:
+        """Load a session by uid, or None if it was never saved."""
+
+        started = time.perf_counter()
+        with self._db_lock:
+            if self._db.execute("SELECT 1 FROM sessions WHERE uid = ?", (uid,)).fetchone() is None:
+                return None
+
+            field_rows = self._db.execute("SELECT name, data FROM session_fields WHERE uid = ?", (uid,)).fetchall()
+            list_rows: Dict[str, List[Tuple[int, str]]] = {}
+            for section in LIST_SECTIONS:
+                limit = LOAD_LIMITS.get(section, -1)
+                # Newest first so a limit keeps the most recent items
+                rows = self._db.execute(
+                    "SELECT position, data FROM session_items WHERE uid = ? AND section = ? "
+                    "ORDER BY position DESC LIMIT ?",
+                    (uid, section, limit),
+                ).fetchall()
+                list_rows[section] = rows[::-1]
+
+        values: Dict[str, Any] = {"uid": uid}
+        for name, data in field_rows:
+            if name in _FIELD_ADAPTERS:
+                values[name] = _FIELD_ADAPTERS[name].validate_json(data)
+        for section, rows in list_rows.items():
+            values[section] = [_ITEM_ADAPTERS[section].validate_json(data) for _, data in rows]
+
+        context = UserSessionContext.model_validate(values)
+
+        state = _SyncState()
+        for name in FIELD_SECTIONS:
+            state.fields[name] = getattr(context, name)
+        for section, rows in list_rows.items():
+            items = getattr(context, section)
+            if isinstance(items, RingLog):
+                # Positions of a bounded log count from its first entry ever
+                items.total = rows[-1][0] + 1 if rows else 0
+                state.lists[section] = (items, 0, items.total)
+            else:
+                state.lists[section] = (items, rows[0][0] if rows else 0, len(items))
+        self._states[uid] = state
+
+        self.stats.loads += 1
+        self.stats.load_seconds += time.perf_counter() - started
+        return context
+
+
+    async def aload(self, uid: str) -> Optional[UserSessionContext]:
+        return await asyncio.to_thread(self.load, uid)
+
+
+    def collect_changes(self, context: UserSessionContext) -> Optional[SessionChanges]:
+        """
+        Serialize only what changed since the last load or save. The changes
+        count as synced once `write()` succeeds; after a failed write the next
+        save collects them again.
+        """
+
+        last = self._states.get(context.uid) or _SyncState()
+        state = _SyncState(fields=dict(last.fields), lists=dict(last.lists))
+        changes = SessionChanges(uid=context.uid, synced=state)
+
+        for name in FIELD_SECTIONS:
+            value = getattr(context, name)
+            if name in state.fields and state.fields[name] is value:
+                continue
+            changes.fields.append((name, _FIELD_ADAPTERS[name].dump_json(value).decode()))
+            state.fields[name] = value
+
+        for section in LIST_SECTIONS:
+            items = getattr(context, section)
+            synced_list, base, synced = state.lists.get(section, (None, 0, 0))
+            total = items.total if isinstance(items, RingLog) else len(items)
+
+            if synced_list is not items or total < synced:
+                # Replaced or shrunk: rewrite everything from this list's first stored position
+                changes.truncate.append((section, base))
+                synced = 0
+
+            adapter = _ITEM_ADAPTERS[section]
+            if isinstance(items, RingLog):
+                # Entries evicted before they were saved are lost; saves run after every agent and tool
+                start = max(synced, items.dropped)
+                for index, item in enumerate(items.since(start), start):
+                    changes.items.append((section, base + index, adapter.dump_json(item).decode()))
+            else:
+                for index in range(synced, len(items)):
+                    changes.items.append((section, base + index, adapter.dump_json(items[index]).decode()))
+            state.lists[section] = (items, base, total)
+
+        if not changes.rows and not changes.truncate:
+            self._states[context.uid] = state
+            return None
+        return changes
+
+
+    def write(self, changes: SessionChanges):
+        now = time.time()
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    "INSERT INTO sessions (uid, created_at, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(uid) DO UPDATE SET updated_at = excluded.updated_at",
+                    (changes.uid, now, now),
+                )
+                for section, position in changes.truncate:
+                    self._db.execute(
+                        "DELETE FROM session_items WHERE uid = ? AND section = ? AND position >= ?",
+                        (changes.uid, section, position),
+                    )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO session_fields (uid, name, data) VALUES (?, ?, ?)",
+                    [(changes.uid, name, data) for name, data in changes.fields],
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO session_items (uid, section, position, data) VALUES (?, ?, ?, ?)",
+                    [(changes.uid, section, position, data) for section, position, data in changes.items],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        if changes.synced is not None:
+            self._states[changes.uid] = changes.synced
+        self.stats.saves += 1
+        self.stats.rows_written += changes.rows
+        self.stats.bytes_written += changes.bytes
+
+
+    async def save(self, context: UserSessionContext):
+        """Persist what changed in `context`, writing off the event loop."""
+
+        lock = self._save_locks.setdefault(context.uid, asyncio.Lock())
+        async with lock:
+            changes = self.collect_changes(context)
+            if changes is not None:
+                await asyncio.to_thread(self.write, changes)
+
+
+    def save_sync(self, context: UserSessionContext):
+        changes = self.collect_changes(context)
+        if changes is not None:
+            self.write(changes)
+
+
+    def forget(self, uid: str):
+        """Drop what the store tracks for a session no longer held in memory; loading it again starts over."""
+        self._states.pop(uid, None)
+        self._save_locks.pop(uid, None)
+
+
+    def load_items(self, uid: str, section: str, offset: int = 0, limit: int = 100) -> List[Any]:
+        """Read stored items of a list section, including ones not loaded into memory."""
+
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT data FROM session_items WHERE uid = ? AND section = ? ORDER BY position LIMIT ? OFFSET ?",
+                (uid, section, limit, offset),
+            ).fetchall()
+        return [_ITEM_ADAPTERS[section].validate_json(data) for (data,) in rows]
+
+
+    def append_records(self, uid: str, section: str, position: int, records: List[Dict[str, Any]]):
+        """Store log records outside the context (hooks logs) from `position` on, one row each."""
+
+        if not records:
+            return
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO session_items (uid, section, position, data) VALUES (?, ?, ?, ?)",
+                [(uid, section, position + offset, json.dumps(record)) for offset, record in enumerate(records)],
+            )
+        self.stats.rows_written += len(records)
+
+
+    def load_records(self, uid: str, section: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Read log records stored with `append_records`."""
+
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT data FROM session_items WHERE uid = ? AND section = ? ORDER BY position LIMIT ? OFFSET ?",
+                (uid, section, limit, offset),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+
+    def load_field(self, uid: str, name: str) -> Any:
+        """Read one stored field of a session without loading the rest, or None if unset."""
+
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT data FROM session_fields WHERE uid = ? AND name = ?", (uid, name),
+            ).fetchone()
+        return _FIELD_ADAPTERS[name].validate_json(row[0]) if row is not None else None
+
+
+    def iter_uids(self, page_size: int = 500) -> Iterator[str]:
+        """All stored session uids, fetched a page at a time."""
+
+        last = ""
+        while True:
+            with self._db_lock:
+                rows = self._db.execute(
+                    "SELECT uid FROM sessions WHERE uid > ? ORDER BY uid LIMIT ?", (last, page_size),
+                ).fetchall()
+            for (uid,) in rows:
+                yield uid
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+
+    def close(self):
+        with self._db_lock:
+            self._db.close()
+
+
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """Process-wide store, created on first use; None when persistence is disabled."""
+
+    global _session_store
+    if SESSION_STORE_ENABLED and _session_store is None:
+        _session_store = SessionStore(SESSION_DB_PATH)
+    return _session_store
@@ -0,0 +1,243 @@
+"""
+Speculative execution of an agent concurrently with its input guardrails.
+
+The agent run starts immediately while the guardrails are evaluated alongside.
+Every model response is held at a gate until the verdict arrives, so no tool,
+handoff or final output is produced for input that later trips the wire, and
+streamed events are withheld from the caller until the run is committed.
+"""
+
+import asyncio
+import copy
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agents import (
+    Agent,
+    InputGuardrailResult,
+    InputGuardrailTripwireTriggered,
+    Model,
+    ModelProvider,
+    ModelResponse,
+    RawResponsesStreamEvent,
+    RunContextWrapper,
+    RunResultStreaming,
+    StreamEvent,
+    TResponseInputItem,
+)
+from agents.models.multi_provider import MultiProvider
+from openai.types.responses import ResponseCompletedEvent, ResponseTextDeltaEvent
+
+
+class SpeculationGate:
+    """Holds back model responses of a speculative run until the guardrail verdict."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.first_output_at: Optional[float] = None
+        self.verdict_at: Optional[float] = None
+        self.held_tokens = 0
+        self._opened = asyncio.Event()
+
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened.is_set()
+
+
+    @property
+    def ttft_saved(self) -> float:
+        """Overlap between guardrail evaluation and the model producing its first output."""
+        if self.first_output_at is None or self.verdict_at is None:
+            return 0.0
+        return min(self.first_output_at, self.verdict_at) - self.started_at
+
+
+    def mark_output(self):
+        if self.first_output_at is None:
+            self.first_output_at = time.perf_counter()
+
+
+    def open(self):
+        self.verdict_at = time.perf_counter()
+        self._opened.set()
+
+
+    def reject(self):
+        self.verdict_at = time.perf_counter()
+
+
+    async def wait(self):
+        await self._opened.wait()
+
+
+class _GatedModel(Model):
+    def __init__(self, model: Model, gate: SpeculationGate):
+        self._model = model
+        self._gate = gate
+
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        response = await self._model.get_response(*args, **kwargs)
+        if not self._gate.is_open:
+            self._gate.mark_output()
+            self._gate.held_tokens += response.usage.total_tokens
+            await self._gate.wait()
+        return response
+
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async for event in self._model.stream_response(*args, **kwargs):
+            if not self._gate.is_open:
+                if isinstance(event, ResponseTextDeltaEvent):
+                    self._gate.mark_output()
+                elif isinstance(event, ResponseCompletedEvent):
+                    # The SDK only runs tools and handoffs after the completed event
+                    self._gate.mark_output()
+                    usage = event.response.usage
+                    self._gate.held_tokens += usage.total_tokens if usage else 0
+                    await self._gate.wait()
+            yield event
+
+
+class SpeculativeModelProvider(ModelProvider):
+    """Model provider whose models wait on a `SpeculationGate` before returning a response."""
+
+    def __init__(self, gate: SpeculationGate, base_provider: Optional[ModelProvider] = None):
+        self._gate = gate
+        self._base_provider = base_provider or MultiProvider()
+
+
+    def get_model(self, model_name: str | None) -> Model:
+        return _GatedModel(self._base_provider.get_model(model_name), self._gate)
+
+
+@dataclass
+class SpeculationMetrics:
+    runs: int = 0
+    committed: int = 0
+    aborted: int = 0
+    ttft_saved_seconds: float = 0.0
+    wasted_tokens: int = 0
+    """Tokens of completed model responses thrown away on abort (a lower bound)."""
+    discarded_chunks: int = 0
+
+
+    def record_commit(self, gate: SpeculationGate):
+        self.runs += 1
+        self.committed += 1
+        self.ttft_saved_seconds += gate.ttft_saved
+
+
+    def record_abort(self, gate: SpeculationGate, discarded_chunks: int = 0):
+        self.runs += 1
+        self.aborted += 1
+        self.wasted_tokens += gate.held_tokens
+        self.discarded_chunks += discarded_chunks
+
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "runs": self.runs,
+            "committed": self.committed,
+            "aborted": self.aborted,
+            "ttft_saved_seconds": round(self.ttft_saved_seconds, 3),
+            "avg_ttft_saved_seconds": round(self.ttft_saved_seconds / self.committed, 3) if self.committed else 0.0,
+            "wasted_tokens": self.wasted_tokens,
+            "discarded_chunks": self.discarded_chunks,
+        }
+
+
+async def run_input_guardrails(
+    agent: Agent[Any],
+    input: str | list[TResponseInputItem],
+    context: RunContextWrapper[Any],
+) -> List[InputGuardrailResult]:
+    """
+    Run an agent's input guardrails concurrently, as the Runner would on the first turn.
+
+    Raises:
+        InputGuardrailTripwireTriggered: As soon as any guardrail trips its wire.
+    """
+
+    tasks = [
+        asyncio.create_task(guardrail.run(agent, copy.deepcopy(input), context))
+        for guardrail in agent.input_guardrails
+    ]
+    results: List[InputGuardrailResult] = []
+
+    try:
+        for done in asyncio.as_completed(tasks):
+            result = await done
+            if result.output.tripwire_triggered:
+                raise InputGuardrailTripwireTriggered(result)
+            results.append(result)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return results
+
+
+def _is_text_delta(event: StreamEvent) -> bool:
+    return isinstance(event, RawResponsesStreamEvent) and isinstance(event.data, ResponseTextDeltaEvent)
+
+
+async def withhold_until_verdict(
+    result: RunResultStreaming,
+    verdict: "asyncio.Task[List[InputGuardrailResult]]",
+    gate: SpeculationGate,
+    metrics: SpeculationMetrics,
+) -> AsyncIterator[StreamEvent]:
+    """
+    Buffer the events of a speculative streamed run until the guardrail verdict.
+
+    On a pass the buffer is flushed and the stream continues live. On a tripwire
+    the run is cancelled, the buffer is discarded and the exception is re-raised.
+    """
+
+    events = result.stream_events()
+    buffered: List[StreamEvent] = []
+    stream_finished = False
+    next_event: "asyncio.Future[Optional[StreamEvent]]" = asyncio.ensure_future(anext(events, None))
+
+    try:
+        while not verdict.done() and not stream_finished:
+            await asyncio.wait((next_event, verdict), return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                event = next_event.result()
+                if event is None:
+                    stream_finished = True
+                else:
+                    buffered.append(event)
+                    next_event = asyncio.ensure_future(anext(events, None))
+
+        try:
+            await verdict
+        except InputGuardrailTripwireTriggered:
+            gate.reject()
+            metrics.record_abort(gate, discarded_chunks=sum(_is_text_delta(event) for event in buffered))
+            result.cancel()
+            raise
+
+        gate.open()
+        metrics.record_commit(gate)
+
+        for event in buffered:
+            yield event
+        buffered.clear()
+
+        while not stream_finished:
+            event = await next_event
+            if event is None:
+                stream_finished = True
+            else:
+                yield event
+                next_event = asyncio.ensure_future(anext(events, None))
+
+    finally:
+        verdict.cancel()
+        if not next_event.done():
+            next_event.cancel()
+            await asyncio.gather(next_event, return_exceptions=True)
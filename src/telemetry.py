@@ -0,0 +1,239 @@
+"""
+Asynchronous, batched telemetry pipeline.
+
+Hooks enqueue lightweight `TelemetryRecord`s without doing any formatting or
+I/O. A background task collects them into batches and hands each batch to the
+sinks (logfire, console) in a worker thread, so logging never blocks the agent
+loop. When the queue is full new records are dropped and counted instead of
+applying back-pressure.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol
+
+from colorama import Fore, Style
+
+from src.config import (
+    TELEMETRY_BATCH_SIZE,
+    TELEMETRY_CONSOLE,
+    TELEMETRY_FLUSH_INTERVAL_SECONDS,
+    TELEMETRY_QUEUE_SIZE,
+)
+
+
+@dataclass(slots=True)
+class TelemetryRecord:
+    level: str
+    """logfire level: "info", "warning" or "error"."""
+    event_type: str
+    message: str
+    trace_id: str
+    event_id: int
+    created_at: float
+    session_duration: float
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+    def as_attributes(self) -> Dict[str, Any]:
+        """Same shape as `AgentLog.model_dump()`."""
+        return {
+            "trace_id": self.trace_id,
+            "agent_name": self.details.get("agent_name", "unknown"),
+            "event_type": self.event_type,
+            "user_name": self.details.get("user_name", "unknown"),
+            "user_uid": self.details.get("user_uid", "unknown"),
+            "timestamp": datetime.fromtimestamp(self.created_at).isoformat(),
+            "session_duration": self.session_duration,
+            "metadata": {
+                "event_id": self.event_id,
+                "session_duration": self.session_duration,
+                **self.details,
+            },
+        }
+
+
+class TelemetrySink(Protocol):
+    def emit(self, batch: List[TelemetryRecord]): ...
+
+
+class LogfireSink:
+    def emit(self, batch: List[TelemetryRecord]):
+        import logfire
+
+        for record in batch:
+            logfire.log(record.level, msg_template=record.message, attributes=record.as_attributes())
+
+
+class ConsoleSink:
+    def __init__(self, name: str = "HealthWellnessHooks"):
+        self.name = name
+
+
+    def emit(self, batch: List[TelemetryRecord]):
+        for record in batch:
+            details = record.details
+            if record.event_type == "ERROR":
+                print(Fore.RED, f"\n⚠ {self.name} ERROR in {details['method']}: {details['error']}", Style.RESET_ALL)
+                print(f"   Context: {json.dumps(details['context'], indent=2, default=str)}\n")
+            elif record.event_type == "GUARDRAIL_VIOLATION":
+                print(Fore.RED, f"\n⚠ {details['exception_type']}: {details['error_message']}", Style.RESET_ALL)
+                print(f"   Context: {json.dumps(details['context'], indent=2, default=str)}\n")
+            else:
+                timestamp = datetime.fromtimestamp(record.created_at).isoformat()
+                print(Fore.YELLOW, f"\n> {self.name} #{record.event_id} [{timestamp}] {record.event_type}\n", Style.RESET_ALL)
+
+
+@dataclass
+class TelemetryStats:
+    enqueued: int = 0
+    dropped: int = 0
+    flushed: int = 0
+    batches: int = 0
+    sink_errors: int = 0
+
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "sink_errors": self.sink_errors,
+        }
+
+
+class TelemetryPipeline:
+    """Bounded queue of telemetry records drained in batches by a background task."""
+
+    def __init__(
+        self,
+        sinks: List[TelemetrySink],
+        max_queue_size: int = TELEMETRY_QUEUE_SIZE,
+        batch_size: int = TELEMETRY_BATCH_SIZE,
+        flush_interval: float = TELEMETRY_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.sinks = sinks
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = TelemetryStats()
+        self._queue: Optional["asyncio.Queue[TelemetryRecord]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # Records taken off the queue by the worker but not yet written
+        self._pending: List[TelemetryRecord] = []
+
+
+    def emit(self, record: TelemetryRecord):
+        """Enqueue a record without blocking; drops it if the queue is full."""
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (synchronous caller): write through
+            self.stats.enqueued += 1
+            self._write([record])
+            return
+
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._start(loop)
+
+        try:
+            self._queue.put_nowait(record)
+            self.stats.enqueued += 1
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+
+
+    async def flush(self):
+        """Write out everything queued so far."""
+
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+
+        async with self._flush_lock:
+            await self._write_batch(self._take_pending(len(self._pending) + self._queue.qsize()))
+
+
+    async def aclose(self):
+        """Flush the queue and stop the background task."""
+
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+
+    def _start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._pending = []
+        self._flush_lock = asyncio.Lock()
+        self._worker = loop.create_task(self._run(), name="telemetry-pipeline")
+
+
+    async def _run(self):
+        while True:
+            self._pending.append(await self._queue.get())
+            # Let a batch accumulate unless one is already waiting
+            if self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.flush_interval)
+
+            async with self._flush_lock:
+                await self._write_batch(self._take_pending(self.batch_size))
+
+
+    def _take_pending(self, limit: int) -> List[TelemetryRecord]:
+        batch, self._pending = self._pending, []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+
+    async def _write_batch(self, batch: List[TelemetryRecord]):
+        if batch:
+            # Serialization and sink I/O happen off the event loop
+            await asyncio.to_thread(self._write, batch)
+
+
+    def _write(self, batch: List[TelemetryRecord]):
+        for sink in self.sinks:
+            try:
+                sink.emit(batch)
+            except Exception:
+                self.stats.sink_errors += 1
+        self.stats.flushed += len(batch)
+        self.stats.batches += 1
+
+
+def create_record(
+    level: str,
+    event_type: str,
+    message: str,
+    trace_id: str,
+    event_id: int,
+    session_start_time: float,
+    details: Dict[str, Any],
+) -> TelemetryRecord:
+    now = time.time()
+    return TelemetryRecord(
+        level=level,
+        event_type=event_type,
+        message=message,
+        trace_id=trace_id,
+        event_id=event_id,
+        created_at=now,
+        session_duration=round(now - session_start_time, 2),
+        details=details,
+    )
+
+
+telemetry = TelemetryPipeline(
+    sinks=[LogfireSink(), ConsoleSink()] if TELEMETRY_CONSOLE else [LogfireSink()],
+)
@@ -4,6 +4,7 @@ from .goal_analyzer import goal_analyzer
 from .injury_tools import add_injury_note
 from .meal_planner import meal_planner
 from .medical_meal_planner import medical_meal_planner
+from .progress_analytics import progress_analytics
 from .scheduler import checkin_scheduler_google, checkin_scheduler_local
 from .tracker import progress_tracker
 from .workout_recommender import workout_recommender
@@ -19,6 +20,7 @@ __all__ = [
     "read_context_data",
     "checkin_scheduler_google",
     "checkin_scheduler_local",
+    "progress_analytics",
     "progress_tracker",
     "workout_recommender",
 ]
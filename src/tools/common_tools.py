@@ -1,97 +1,95 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, Literal
+from typing import Any, Dict, List, Literal, Optional
 from agents import RunContextWrapper, function_tool
 from src.context import UserSessionContext
+from src.tools.context_sections import (
+    FIELD_SECTIONS,
+    LIST_SECTIONS,
+    SUMMARIZED_FIELD_SECTIONS,
+    field_value,
+    project,
+    section_items,
+    summarize_section,
+    window,
+)
 
 
 
 @function_tool(strict_mode=False)
 async def read_context_data(
     ctx: RunContextWrapper[UserSessionContext],
-    data_type: Literal["name", "goal", "workout_plan", "meal_plan", "diet_preferences", "injury_notes", "progress_logs", "handoff_logs", "all"]
+    data_type: Literal["name", "goal", "workout_plan", "meal_plan", "diet_preferences", "injury_notes", "progress_logs", "handoff_logs", "checkin_schedules", "all"],
+    fields: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    summary_only: bool = False,
 ) -> Dict[str, Any]:
     """
     Read specific data from the user's session context.
     
     This tool allows agents to access existing user data from the session context
-    to provide better recommendations and personalized responses.
+    to provide better recommendations and personalized responses. Ask only for what
+    you need: prefer summary_only, a date window or a small limit over full histories.
     
     Args:
         data_type: Type of data to retrieve from UserSessionContext:
             - "name": Name of the user
             - "goal": User's fitness goal
             - "workout_plan": Current workout plan
-            - "meal_plan": Current meal plan
+            - "meal_plan": Current meal plan (distinct meals, and days as indexes into them)
             - "diet_preferences": User's dietary preferences
             - "injury_notes": Any injury information
             - "progress_logs": User's progress history
-            - "handoff_logs": History of agent handoffs
-            - "all": All available context data
+            - "handoff_logs": Recent agent handoffs and plan events (date, event, source and target agent)
+            - "checkin_schedules": Scheduled recurring check-ins
+            - "all": All available context data (list sections are summarized unless summary_only is false and a limit is given; with summary_only the plans are summarized too)
+        fields: Keys to keep from each entry, e.g. ["date", "weight"] for progress_logs. For "all", the sections to include.
+        start_date: Earliest progress log date to include (YYYY-MM-DD).
+        end_date: Latest progress log date to include (YYYY-MM-DD).
+        limit: Maximum number of entries of a list section. progress_logs and handoff_logs return the most recent entries.
+        offset: Entries to skip: from the most recent for progress_logs and handoff_logs, from the start otherwise.
+        summary_only: Return counts and aggregates instead of the entries.
     
     Returns:
         Dict containing the requested context data
     """
     
-    if data_type == "name":
+    user = ctx.context
+    
+    if data_type == "all":
+        sections = [section for section in FIELD_SECTIONS + LIST_SECTIONS if not fields or section in fields]
+        result: Dict[str, Any] = {}
+        for section in sections:
+            if section in FIELD_SECTIONS and not (summary_only and section in SUMMARIZED_FIELD_SECTIONS):
+                result[section] = field_value(user, section)
+            elif summary_only or limit is None:
+                result[section] = summarize_section(user, section)
+            else:
+                result[section], _ = window(section, section_items(user, section), start_date, end_date, limit, offset)
+        result["message"] = "Retrieved all available context data"
+        return result
+    
+    if summary_only:
         return {
-            "name": ctx.context.name,
-            "message": "Retrieved user's name"
+            data_type: summarize_section(user, data_type),
+            "message": f"Retrieved summary of {data_type}"
         }
     
-    if data_type == "goal":
+    if data_type in FIELD_SECTIONS:
         return {
-            "goal": ctx.context.goal.model_dump() if ctx.context.goal else None,
-            "message": "Retrieved user's fitness goal"
+            data_type: project(field_value(user, data_type), fields),
+            "message": f"Retrieved {data_type}"
         }
     
-    elif data_type == "workout_plan":
-        return {
-            "workout_plan": ctx.context.workout_plan.model_dump() if ctx.context.workout_plan else None,
-            "message": "Retrieved current workout plan"
-        }
-    
-    elif data_type == "meal_plan":
-        return {
-            "meal_plan": [day.model_dump() for day in ctx.context.meal_plan] if ctx.context.meal_plan else None,
-            "message": "Retrieved current meal plan"
-        }
-    
-    elif data_type == "diet_preferences":
-        return {
-            "diet_preferences": ctx.context.diet_preferences,
-            "message": "Retrieved user's dietary preferences"
-        }
-    
-    elif data_type == "injury_notes":
-        return {
-            "injury_notes": ctx.context.injury_notes,
-            "message": "Retrieved injury information"
-        }
-    
-    elif data_type == "progress_logs":
-        return {
-            "progress_logs": [log.model_dump() for log in ctx.context.progress_logs],
-            "message": f"Retrieved {len(ctx.context.progress_logs)} progress log entries"
-        }
-    
-    elif data_type == "handoff_logs":
-        return {
-            "handoff_logs": ctx.context.handoff_logs,
-            "message": f"Retrieved {len(ctx.context.handoff_logs)} handoff log entries"
-        }
-    
-    elif data_type == "all":
-        return {
-            "name": ctx.context.name,
-            "goal": ctx.context.goal.model_dump() if ctx.context.goal else None,
-            "workout_plan": ctx.context.workout_plan.model_dump() if ctx.context.workout_plan else None,
-            "meal_plan": [day.model_dump() for day in ctx.context.meal_plan] if ctx.context.meal_plan else None,
-            "diet_preferences": ctx.context.diet_preferences,
-            "injury_notes": ctx.context.injury_notes,
-            "progress_logs": [log.model_dump() for log in ctx.context.progress_logs],
-            "handoff_logs": ctx.context.handoff_logs,
-            "message": "Retrieved all available context data"
-        }
+    items, total = window(data_type, section_items(user, data_type), start_date, end_date, limit, offset)
+    return {
+        data_type: project(items, fields),
+        "total": total,
+        "message": f"Retrieved {len(items)} of {total} {data_type} entries"
+    }
+
 
 @function_tool(strict_mode=False)
 async def get_current_time(
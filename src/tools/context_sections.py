@@ -0,0 +1,178 @@
+"""
+Serialized, cached views of `UserSessionContext` sections for `read_context_data`.
+
+Each section is dumped to JSON-compatible data once and cached on the
+context. Object fields are re-dumped only when the field is reassigned
+(compared by identity, as in the session store); list sections only dump
+items appended since the last read. Reads then project, window and page
+the cached data instead of calling `model_dump` on the whole section.
+"""
+
+import typing
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from src.context import UserSessionContext
+from src.session_logs import RingLog
+from src.tools.tracker import calculate_progress_summary, summarize_progress
+
+
+LIST_SECTIONS: Tuple[str, ...] = (
+    "injury_notes", "progress_logs", "handoff_logs", "checkin_schedules",
+)
+FIELD_SECTIONS: Tuple[str, ...] = ("name", "goal", "workout_plan", "meal_plan", "diet_preferences")
+# Fields large enough that summarize_section describes them instead of returning them
+SUMMARIZED_FIELD_SECTIONS: Tuple[str, ...] = ("workout_plan", "meal_plan")
+
+# Paged from the newest entry; other list sections are paged from the start
+NEWEST_FIRST_SECTIONS = ("progress_logs", "handoff_logs")
+
+
+def _item_annotation(section: str):
+    annotation = UserSessionContext.model_fields[section].annotation
+    # RingLog subclasses and ProgressLog declare their item type
+    if isinstance(annotation, type) and hasattr(annotation, "item_type"):
+        return annotation.item_type
+    return typing.get_args(annotation)[0]
+
+
+_FIELD_ADAPTERS: Dict[str, TypeAdapter] = {
+    name: TypeAdapter(UserSessionContext.model_fields[name].annotation) for name in FIELD_SECTIONS
+}
+_ITEM_ADAPTERS: Dict[str, TypeAdapter] = {name: TypeAdapter(_item_annotation(name)) for name in LIST_SECTIONS}
+
+
+def _cache(context: UserSessionContext) -> Dict[str, Tuple[Any, Any]]:
+    if context._section_cache is None:
+        context._section_cache = {}
+    return context._section_cache
+
+
+def field_value(context: UserSessionContext, name: str) -> Any:
+    """JSON-compatible value of an object field, dumped again only after reassignment."""
+
+    value = getattr(context, name)
+    cache = _cache(context)
+    cached = cache.get(name)
+    if cached is None or cached[0] is not value:
+        cached = (value, _FIELD_ADAPTERS[name].dump_python(value, mode="json"))
+        cache[name] = cached
+    return cached[1]
+
+
+def section_items(context: UserSessionContext, section: str) -> List[Any]:
+    """JSON-compatible items of a list section; only newly appended items are dumped."""
+
+    items = getattr(context, section) or []
+    cache = _cache(context)
+    source, synced, dumped = cache.get(section, (None, 0, []))
+    adapter = _ITEM_ADAPTERS[section]
+
+    if isinstance(items, RingLog):
+        # Bounded, so re-dumping after a change costs at most its capacity
+        if source is not items or synced != items.total:
+            dumped = [adapter.dump_python(item, mode="json") for item in items]
+        cache[section] = (items, items.total, dumped)
+        return dumped
+
+    if source is not items or len(dumped) > len(items):
+        dumped = []
+    if len(dumped) < len(items):
+        dumped.extend(adapter.dump_python(item, mode="json") for item in items[len(dumped):])
+
+    cache[section] = (items, len(items), dumped)
+    return dumped
+
+
+def project(value: Any, fields: Optional[List[str]]) -> Any:
+    """Keep only `fields` of a dict (or of each dict in a list)."""
+
+    if not fields:
+        return value
+    if isinstance(value, dict):
+        return {key: value[key] for key in fields if key in value}
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    return value
+
+
+def window(
+    section: str,
+    items: List[Any],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Tuple[List[Any], int]:
+    """
+    Filter items by date (sections with a `date` field, YYYY-MM-DD, inclusive) and page them.
+    Returns the page in stored order and the number of items matching the date window.
+    """
+
+    if start_date or end_date:
+        items = [
+            item for item in items
+            if isinstance(item, dict) and "date" in item
+            and (not start_date or item["date"] >= start_date)
+            and (not end_date or item["date"][:len(end_date)] <= end_date)
+        ]
+
+    total = len(items)
+    offset = max(0, offset)
+    stop = total if limit is None else offset + max(0, limit)
+
+    if section in NEWEST_FIRST_SECTIONS:
+        return items[max(0, total - stop):max(0, total - offset)], total
+    return items[offset:stop], total
+
+
+def summarize_section(context: UserSessionContext, section: str) -> Dict[str, Any]:
+    """A few figures describing a section instead of its content."""
+
+    if section == "progress_logs":
+        logs = context.progress_logs
+        if context.progress_aggregates.count == len(logs):
+            summary = summarize_progress(context.progress_aggregates, context.goal)
+        else:
+            summary = calculate_progress_summary(logs, context.goal)
+        return {
+            "entries": len(logs),
+            "first_date": logs[0].date if logs else None,
+            "last_date": logs[-1].date if logs else None,
+            "summary": summary.model_dump(),
+        }
+
+    if section == "meal_plan":
+        plan = context.meal_plan
+        days = plan.days if plan else []
+        calories = [sum(plan.meals[index].calories for index in day.meals) for day in days]
+        return {
+            "days": len(days),
+            "distinct_meals": len(plan.meals) if plan else 0,
+            "average_daily_calories": round(sum(calories) / len(calories)) if calories else None,
+            "source": context.meal_plan_source,
+        }
+
+    if section == "workout_plan":
+        plan = context.workout_plan
+        return {
+            "days": list(plan.days) if plan else [],
+            "exercises": sum(len(exercises) for exercises in plan.days.values()) if plan else 0,
+        }
+
+    if section == "injury_notes":
+        notes = context.injury_notes
+        return {
+            "entries": len(notes),
+            "latest": {"injury_description": notes[-1].injury_description, "severity_level": notes[-1].severity_level} if notes else None,
+        }
+
+    if section == "handoff_logs":
+        logs = context.handoff_logs
+        return {"entries": logs.total, "in_memory": len(logs), "latest": logs[-1].as_dict() if logs else None}
+
+    if section == "checkin_schedules":
+        return {"schedules": [schedule.frequency for schedule in context.checkin_schedules]}
+
+    return {section: field_value(context, section)}
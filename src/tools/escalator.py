@@ -59,7 +59,7 @@ async def escalate_to_human_coach(
         "escalation_logged": True,
         "message": f"Hi {ctx.context.name}, I'm connecting you to a human coach now. Please wait while I transfer you.",
         "session_summary": {
-            "total_handoffs": len(ctx.context.handoff_logs),
+            "total_handoffs": ctx.context.handoff_logs.total,
             "user_goal": ctx.context.goal.model_dump() if ctx.context.goal else None,
             "progress_updates": len(ctx.context.progress_logs)
         }
@@ -1,7 +1,8 @@
-from agents import Agent
+from agents import Agent, RunContextWrapper, Runner, function_tool
 
-from src.context import Goal
+from src.context import Goal, UserSessionContext
 from src.guardrails import goal_input_guardrail
+from src.tools.goal_parser import parse_goal
 
 goal_analyzer_agent = Agent(
     name="Goal Analyzer Agent",
@@ -17,15 +18,24 @@ goal_analyzer_agent = Agent(
 )
 
 
-goal_analyzer = goal_analyzer_agent.as_tool(
-    tool_name="goal_analyzer",
-    tool_description="""
-Analyzes and converts raw user goal input into a structured Goal object.
+@function_tool(strict_mode=False)
+async def goal_analyzer(
+    ctx: RunContextWrapper[UserSessionContext],
+    raw_text: str,
+) -> Goal:
+    """
+    Analyzes and converts raw user goal input into a structured Goal object.
+    Common phrasings ("lose 5 kg in 8 weeks") are parsed locally; anything else is analyzed by the goal analyzer agent.
+    Args:
+        raw_text (str): The raw goal description provided by the user.
+    Returns:
+        Goal: A structured Goal object containing the parsed and validated goal details.
+    """
 
-Args:
-    raw_text (str): The raw goal description provided by the user.
+    goal = parse_goal(raw_text)
+    if goal is None:
+        result = await Runner.run(goal_analyzer_agent, raw_text, context=ctx.context)
+        goal = result.final_output_as(Goal)
 
-Returns:
-    Goal: A structured Goal object containing the parsed and validated goal details.
-"""
-)
+    ctx.context.goal = goal
+    return goal
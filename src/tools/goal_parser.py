@@ -0,0 +1,139 @@
+"""
+Local parser for common goal phrasings.
+
+Handles sentences like "lose 5 kg in 8 weeks", "gain 10 lbs over 3 months" or
+"drop 4% body fat in 60 days" without a model call: the quantity has to follow
+the action word directly and be about body weight or body fat. Anything else
+returns None so the goal analyzer agent can handle it: several actions,
+quantities or durations, missing units, a current weight or target weight
+("I weigh 80 kg", "down to 70 kg"), other targets ("add 50 kg to my deadlift",
+"lower my blood pressure by 10%"), implausible goals ("lose 200 lbs in 2
+weeks"), negations ("I don't want to lose 5 kg") and goals of someone else
+("my friend wants to lose 5 kg").
+"""
+
+import re
+from typing import Dict, Optional
+
+from pydantic import ValidationError
+
+from src.context import Goal
+
+
+ACTION_WORDS: Dict[str, str] = {
+    "lose": "lose", "losing": "lose", "drop": "lose", "shed": "lose", "cut": "lose",
+    "burn": "lose", "reduce": "lose", "lower": "lose", "trim": "lose",
+    "gain": "gain", "gaining": "gain", "put on": "gain", "build": "gain", "add": "gain",
+    "bulk": "gain", "increase": "gain",
+    "maintain": "maintain", "keep": "maintain", "stay": "maintain", "hold": "maintain",
+}
+
+UNIT_WORDS: Dict[str, str] = {
+    "kg": "kg", "kgs": "kg", "kilo": "kg", "kilos": "kg", "kilogram": "kg", "kilograms": "kg",
+    "lb": "lbs", "lbs": "lbs", "pound": "lbs", "pounds": "lbs",
+    "%": "%", "percent": "%", "per cent": "%",
+}
+
+TIMEFRAME_WORDS: Dict[str, str] = {
+    "day": "days", "days": "days",
+    "week": "weeks", "weeks": "weeks", "wk": "weeks", "wks": "weeks",
+    "month": "months", "months": "months", "mo": "months", "mos": "months",
+}
+
+NUMBER_WORDS: Dict[str, int] = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+
+# Plausibility bounds of the fast path; bigger or faster goals are left to the model
+MAX_QUANTITY = {"kg": 50.0, "lbs": 110.0, "%": 20.0}
+MAX_WEEKLY_RATE = {"kg": 1.0, "lbs": 2.2, "%": 1.0}
+MAX_DURATION_WEEKS = 104
+WEEKS_PER_TIMEFRAME = {"days": 1 / 7, "weeks": 1.0, "months": 52 / 12}
+
+# Body weight and body fat are the only goals a `Goal` describes
+TARGET_WORDS = ("body fat", "bodyfat", "body weight", "bodyweight", "weight", "fat", "muscle mass", "muscle", "mass")
+
+
+def _alternation(words) -> str:
+    # Longest first so "per cent" wins over "per", "kgs" over "kg"
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+_ACTION = re.compile(rf"\b(?:{_alternation(ACTION_WORDS)})\b")
+_QUANTITY = re.compile(rf"(\d+(?:\.\d+)?)\s*({_alternation(UNIT_WORDS)})(?![a-z])")
+_DURATION = re.compile(
+    rf"\b(?:in|over|within|for|during|by|in the next|in about)\s+"
+    rf"(\d+|{_alternation(NUMBER_WORDS)})\s*({_alternation(TIMEFRAME_WORDS)})\b"
+)
+# The action word, then the quantity ("lose 5 kg", "reduce by 3%"), optionally what it is of, then the duration
+_GOAL = re.compile(
+    rf"\b(?:{_alternation(ACTION_WORDS)})\s+(?:by\s+)?(\d+(?:\.\d+)?)\s*({_alternation(UNIT_WORDS)})(?![a-z])"
+    rf"(?:\s+(?:of\s+)?(?:my\s+)?(?:{_alternation(TARGET_WORDS)}))?"
+    rf"\s+{_DURATION.pattern}"
+)
+_TARGET = re.compile(rf"\b(?:{_alternation(TARGET_WORDS)})\b")
+# The sentence may not be a goal at all
+_NEGATION = re.compile(r"\b(?:not|no|never|nor|neither|without|stop|avoid|cannot|dont|wont|cant)\b|n['’]t\b")
+# Someone else's goal: other people's pronouns, third-person verbs, or "my" about anyone but the user
+_THIRD_PARTY = re.compile(
+    r"\b(?:he|she|they|we|him|her|his|hers|them|their|our|us|someone|somebody|people)\b"
+    r"|\b(?:wants|needs|hopes|plans|wishes|tries|is trying|has to)\b"
+    rf"|\bmy\s+(?!(?:goal|aim|plan|target|own|{_alternation(TARGET_WORDS)})\b)"
+)
+# A current or target weight rather than an amount to change by
+_WEIGHT_STATEMENT = re.compile(r"\b(?:weigh|weighs|weighing|currently|current|now at)\b|\b(?:to|from|at)\s+\d")
+
+
+def parse_goal(text: str) -> Optional[Goal]:
+    """Parse a goal sentence into a `Goal`, or None if it is not an unambiguous common phrasing."""
+
+    normalized = " ".join(text.lower().split())
+
+    actions = {ACTION_WORDS[match] for match in _ACTION.findall(normalized)}
+    quantities = {(float(number), UNIT_WORDS[unit]) for number, unit in _QUANTITY.findall(normalized)}
+    durations = {
+        (int(number) if number.isdigit() else NUMBER_WORDS[number], TIMEFRAME_WORDS[unit])
+        for number, unit in _DURATION.findall(normalized)
+    }
+
+    if len(actions) != 1 or len(durations) != 1 or len(quantities) > 1 or _WEIGHT_STATEMENT.search(normalized):
+        return None
+    if _NEGATION.search(normalized) or _THIRD_PARTY.search(normalized):
+        return None
+
+    action = actions.pop()
+    duration, timeframe_unit = durations.pop()
+
+    if quantities:
+        if _GOAL.search(normalized) is None:
+            return None
+        quantity, unit = quantities.pop()
+    elif action == "maintain" and _TARGET.search(normalized):
+        quantity, unit = 0.0, "kg"
+    else:
+        return None
+
+    if not _is_plausible(action, quantity, unit, duration, timeframe_unit):
+        return None
+
+    try:
+        return Goal(
+            action=action,
+            quantity=quantity,
+            unit=unit,
+            duration=duration,
+            timeframe_unit=timeframe_unit,
+        )
+    except ValidationError:
+        return None
+
+
+def _is_plausible(action: str, quantity: float, unit: str, duration: int, timeframe_unit: str) -> bool:
+    weeks = duration * WEEKS_PER_TIMEFRAME[timeframe_unit]
+    if duration <= 0 or weeks > MAX_DURATION_WEEKS:
+        return False
+    if action == "maintain":
+        return True
+    return 0 < quantity <= MAX_QUANTITY[unit] and quantity / max(weeks, 1.0) <= MAX_WEEKLY_RATE[unit]
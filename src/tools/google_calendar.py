@@ -0,0 +1,224 @@
+"""
+Google Calendar client shared by the check-in scheduler.
+
+OAuth credentials are cached in `GOOGLE_TOKEN_FILE` and refreshed when they
+expire, so the browser consent flow only runs the first time. The discovery
+service is built once per process, and every HTTP request gets its own
+authorized `httplib2.Http` (which is not thread-safe), so calls can run in
+worker threads without blocking the event loop. Many users' check-ins are
+inserted with one Calendar batch request per `GOOGLE_CALENDAR_BATCH_SIZE`
+events.
+
+Google client libraries are imported on first use. Tests and local stand-ins
+can inject their own service with `set_calendar_client(CalendarClient(service=...))`.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.config import GOOGLE_CALENDAR_BATCH_SIZE, GOOGLE_CALENDAR_ID, GOOGLE_CREDENTIALS_FILE, GOOGLE_TOKEN_FILE
+
+
+SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+# Occurrences of a recurring check-in
+CHECKIN_COUNT = 10
+
+
+@dataclass
+class CalendarStats:
+    credential_loads: int = 0
+    credential_refreshes: int = 0
+    consent_flows: int = 0
+    service_builds: int = 0
+    events_inserted: int = 0
+    batch_requests: int = 0
+    failures: int = 0
+
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "credential_loads": self.credential_loads,
+            "credential_refreshes": self.credential_refreshes,
+            "consent_flows": self.consent_flows,
+            "service_builds": self.service_builds,
+            "events_inserted": self.events_inserted,
+            "batch_requests": self.batch_requests,
+            "failures": self.failures,
+        }
+
+
+calendar_stats = CalendarStats()
+
+
+def load_credentials(credentials_file: str = GOOGLE_CREDENTIALS_FILE, token_file: str = GOOGLE_TOKEN_FILE):
+    """
+    Cached user credentials: reuse the stored token, refresh it when expired, and only
+    fall back to the interactive consent flow when there is no usable token.
+    """
+
+    from google.auth.exceptions import RefreshError
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+
+    calendar_stats.credential_loads += 1
+    token_path = Path(token_file)
+    creds = Credentials.from_authorized_user_file(str(token_path), SCOPES) if token_path.exists() else None
+
+    if creds is not None and creds.valid:
+        return creds
+
+    if creds is not None and creds.expired and creds.refresh_token:
+        try:
+            creds.refresh(Request())
+            calendar_stats.credential_refreshes += 1
+        except RefreshError:
+            # Revoked or expired refresh token
+            creds = None
+
+    if creds is None or not creds.valid:
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        flow = InstalledAppFlow.from_client_secrets_file(credentials_file, SCOPES)
+        creds = flow.run_local_server(port=0)
+        calendar_stats.consent_flows += 1
+
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    token_path.write_text(creds.to_json())
+    return creds
+
+
+def checkin_event_body(
+    user_name: str,
+    frequency: str,
+    start_date: date,
+    count: int = CHECKIN_COUNT,
+    duration: timedelta = timedelta(minutes=30),
+) -> Dict[str, Any]:
+    """Calendar API event resource for a recurring progress check-in."""
+
+    start_datetime = datetime.combine(start_date, datetime.min.time())
+    end_datetime = start_datetime + duration
+
+    return {
+        "summary": f"Progress Check-in for {user_name.title()}",
+        "description": "",
+        "start": {"dateTime": start_datetime.isoformat(), "timeZone": "UTC"},
+        "end": {"dateTime": end_datetime.isoformat(), "timeZone": "UTC"},
+        "recurrence": [f"RRULE:FREQ={frequency.upper()};COUNT={count}"],
+    }
+
+
+class CalendarClient:
+    """Process-wide Calendar API service with thread-safe, off-loop calls."""
+
+    def __init__(
+        self,
+        service: Any = None,
+        calendar_id: str = GOOGLE_CALENDAR_ID,
+        batch_size: int = GOOGLE_CALENDAR_BATCH_SIZE,
+        credentials_loader: Callable[[], Any] = load_credentials,
+    ):
+        self.calendar_id = calendar_id
+        self.batch_size = batch_size
+        self._credentials_loader = credentials_loader
+        self._service = service
+        self._lock = threading.Lock()
+
+
+    @property
+    def service(self) -> Any:
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    self._service = self._build_service()
+        return self._service
+
+
+    def _build_service(self) -> Any:
+        import google_auth_httplib2
+        import httplib2
+        from googleapiclient.discovery import build
+        from googleapiclient.http import HttpRequest
+
+        credentials = self._credentials_loader()
+
+        def authorized_http():
+            return google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+
+        def build_request(http, *args, **kwargs):
+            # httplib2.Http is not thread-safe, give every request its own
+            return HttpRequest(authorized_http(), *args, **kwargs)
+
+        service = build("calendar", "v3", http=authorized_http(), requestBuilder=build_request, cache_discovery=False)
+        calendar_stats.service_builds += 1
+        return service
+
+
+    def insert_event(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            event = self.service.events().insert(calendarId=self.calendar_id, body=body).execute()
+        except Exception:
+            calendar_stats.failures += 1
+            raise
+        calendar_stats.events_inserted += 1
+        return event
+
+
+    def insert_events(self, bodies: Sequence[Dict[str, Any]]) -> List[Dict[str, Any] | Exception]:
+        """
+        Insert many events with one batch request per `batch_size` events.
+        Returns the created event or the error for each body, in order.
+        """
+
+        service = self.service
+        results: List[Dict[str, Any] | Exception] = [None] * len(bodies)
+
+        def on_response(request_id: str, response: Dict[str, Any], exception: Optional[Exception]):
+            results[int(request_id)] = exception if exception is not None else response
+
+        for start in range(0, len(bodies), self.batch_size):
+            batch = service.new_batch_http_request(callback=on_response)
+            for index in range(start, min(start + self.batch_size, len(bodies))):
+                batch.add(service.events().insert(calendarId=self.calendar_id, body=bodies[index]), request_id=str(index))
+            batch.execute()
+            calendar_stats.batch_requests += 1
+
+        failures = sum(isinstance(result, Exception) for result in results)
+        calendar_stats.failures += failures
+        calendar_stats.events_inserted += len(results) - failures
+        return results
+
+
+    async def ainsert_event(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.insert_event, body)
+
+
+    async def ainsert_events(self, bodies: Sequence[Dict[str, Any]]) -> List[Dict[str, Any] | Exception]:
+        return await asyncio.to_thread(self.insert_events, bodies)
+
+
+_calendar_client: Optional[CalendarClient] = None
+_calendar_client_lock = threading.Lock()
+
+
+def get_calendar_client() -> CalendarClient:
+    """Process-wide client; credentials and the service are loaded on first call."""
+
+    global _calendar_client
+    with _calendar_client_lock:
+        if _calendar_client is None:
+            _calendar_client = CalendarClient()
+    return _calendar_client
+
+
+def set_calendar_client(client: Optional[CalendarClient]):
+    """Replace the process-wide client, e.g. with one wrapping a local stand-in service."""
+
+    global _calendar_client
+    with _calendar_client_lock:
+        _calendar_client = client
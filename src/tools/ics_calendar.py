@@ -0,0 +1,236 @@
+"""
+Per-user iCalendar (.ics) files of recurring progress check-ins.
+
+Every user has one calendar, `CHECKIN_CALENDAR_DIR/user_<uid>.ics`, holding
+one recurring VEVENT (RRULE) per check-in frequency. A new series is appended
+in place in front of the closing `END:VCALENDAR` line without reading the
+rest of the file; rescheduling an existing series streams the file once,
+replacing only that event. Writes run in a worker thread and are serialized
+per file.
+
+`export_calendars` writes the calendars of every stored session to a
+directory, one user at a time, so memory use does not grow with the number
+of users.
+"""
+
+import asyncio
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from src.config import CHECKIN_CALENDAR_DIR
+from src.context import CheckinSchedule
+
+
+PRODID = "-//Health & Wellness Planner//Progress Check-ins//EN"
+CHECKIN_DURATION = "PT15M"
+FOOTER = b"END:VCALENDAR\r\n"
+
+# iCalendar content lines are folded at 75 octets
+MAX_LINE_OCTETS = 75
+
+
+def checkin_event_id(uid: str, frequency: str) -> str:
+    """Stable event UID: one check-in series per user and frequency."""
+    return f"checkin-{frequency.lower()}-{uid}@health-wellness-planner"
+
+
+def calendar_path(uid: str, directory: str | Path = CHECKIN_CALENDAR_DIR) -> Path:
+    return Path(directory) / f"user_{uid}.ics"
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    encoded = line.encode()
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+
+    parts, start, limit = [], 0, MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Don't split a multi-byte character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, MAX_LINE_OCTETS - 1
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Content lines with folded continuations (leading space or tab) joined back."""
+
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if current is not None and line[:1] in (" ", "\t"):
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def render_calendar_header(user_name: str) -> str:
+    return "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(f'Progress Check-ins for {user_name}')}",
+    ))
+
+
+def render_event(schedule: CheckinSchedule, user_name: str, stamp: Optional[datetime] = None) -> str:
+    """VEVENT of a recurring check-in series."""
+
+    stamp = stamp or datetime.now(timezone.utc)
+    start = date.fromisoformat(schedule.start_date)
+
+    return "".join(_fold(line) for line in (
+        "BEGIN:VEVENT",
+        f"UID:{schedule.event_id}",
+        f"DTSTAMP:{stamp.strftime('%Y%m%dT%H%M%SZ')}",
+        f"DTSTART:{start.strftime('%Y%m%d')}T000000",
+        f"DURATION:{CHECKIN_DURATION}",
+        f"RRULE:FREQ={schedule.frequency};COUNT={schedule.count}",
+        f"SEQUENCE:{schedule.sequence}",
+        f"SUMMARY:{_escape(f'Progress Check-in for {user_name}')}",
+        f"DESCRIPTION:{_escape(f'{schedule.frequency.title()} progress check-in')}",
+        "END:VEVENT",
+    ))
+
+
+def render_calendar(user_name: str, events: Iterable[str]) -> Iterator[str]:
+    """Stream a whole calendar from already rendered events."""
+
+    yield render_calendar_header(user_name)
+    yield from events
+    yield FOOTER.decode()
+
+
+def append_event(path: Path, user_name: str, event: str):
+    """Add an event in front of the closing line, creating the calendar if needed."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = event.encode() + FOOTER
+
+    try:
+        file = open(path, "r+b")
+    except FileNotFoundError:
+        with open(path, "wb") as file:
+            file.write(render_calendar_header(user_name).encode() + data)
+        return
+
+    with file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        if size >= len(FOOTER):
+            file.seek(size - len(FOOTER))
+            if file.read(len(FOOTER)) == FOOTER:
+                file.seek(size - len(FOOTER))
+        file.write(data)
+        file.truncate()
+
+
+def replace_event(path: Path, user_name: str, event_id: str, event: str):
+    """Replace the event with this UID, streaming the calendar once; appends it if missing."""
+
+    if not path.exists():
+        append_event(path, user_name, event)
+        return
+
+    uid_line = f"UID:{event_id}"
+    temp = path.with_name(path.name + ".tmp")
+    replaced = False
+
+    with open(path, "r", newline="") as source, open(temp, "w", newline="") as target:
+        block = []
+        for line in source:
+            if block or line.startswith("BEGIN:VEVENT"):
+                block.append(line)
+                if line.startswith("END:VEVENT"):
+                    # A long UID is folded over several lines
+                    if uid_line in _unfold(block):
+                        target.write(event)
+                        replaced = True
+                    else:
+                        target.writelines(block)
+                    block = []
+            elif line.startswith("END:VCALENDAR") and not replaced:
+                target.write(event)
+                replaced = True
+                target.write(line)
+            else:
+                target.write(line)
+
+    os.replace(temp, path)
+
+
+class CheckinCalendarWriter:
+    """Applies calendar writes in a worker thread, one at a time per file."""
+
+    def __init__(self, directory: str | Path = CHECKIN_CALENDAR_DIR):
+        self.directory = Path(directory)
+        self._locks: Dict[Path, asyncio.Lock] = {}
+
+
+    async def upsert(self, uid: str, user_name: str, schedule: CheckinSchedule, update: bool) -> Path:
+        path = calendar_path(uid, self.directory)
+        event = render_event(schedule, user_name)
+
+        async with self._locks.setdefault(path, asyncio.Lock()):
+            if update:
+                await asyncio.to_thread(replace_event, path, user_name, schedule.event_id, event)
+            else:
+                await asyncio.to_thread(append_event, path, user_name, event)
+        return path
+
+
+checkin_calendar_writer = CheckinCalendarWriter()
+
+
+def export_calendars(directory: str | Path, store=None) -> int:
+    """
+    Write the check-in calendar of every stored session to `directory`, streaming one
+    user at a time. Returns the number of calendars written.
+    """
+
+    # Imported here, the session store opens the database on first use
+    from src.session_store import get_session_store
+
+    store = store or get_session_store()
+    if store is None:
+        return 0
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc)
+    written = 0
+
+    for uid in store.iter_uids():
+        schedules = store.load_items(uid, "checkin_schedules", limit=-1)
+        if not schedules:
+            continue
+
+        user_name = store.load_field(uid, "name") or uid
+        events = (render_event(schedule, user_name, stamp) for schedule in schedules)
+        with open(calendar_path(uid, directory), "w", newline="") as file:
+            file.writelines(render_calendar(user_name, events))
+        written += 1
+
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export every user's check-in calendar.")
+    parser.add_argument("directory", help="output directory for the .ics files")
+    args = parser.parse_args()
+    print(f"Exported {export_calendars(args.directory)} calendars to {args.directory}")
@@ -0,0 +1,218 @@
+"""
+Meal catalog and calorie-targeting weekly plan solver.
+
+The catalog is stored column-wise in NumPy arrays and indexed by diet, meal
+type and 100 kcal calorie band. The solver scores every breakfast/lunch/
+dinner/snack combination for a diet at once and greedily picks 7 days that
+hit the calorie target within a tolerance while penalizing repeated meals.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.context import Meal, MealDay
+
+
+DIETS = ("vegetarian", "vegan", "pescatarian", "keto", "omnivore")
+MEAL_TYPES = ("breakfast", "lunch", "dinner", "snacks")
+
+# Share of the daily calories each meal type is expected to carry
+MEAL_TYPE_SHARE: Dict[str, float] = {"breakfast": 0.25, "lunch": 0.3, "dinner": 0.35, "snacks": 0.1}
+
+CALORIE_BAND_SIZE = 100
+DEFAULT_TOLERANCE = 0.05
+# Cost of reusing a meal, relative to one tolerance-width of calorie error
+REUSE_PENALTY = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogMeal:
+    name: str
+    type: str
+    calories: int
+    contains: Tuple[str, ...] = ()  # meat, fish, dairy, eggs
+    low_carb: bool = False
+
+
+MEAL_CATALOG: Tuple[CatalogMeal, ...] = (
+    # Breakfast
+    CatalogMeal("Oatmeal with Berries", "breakfast", 350),
+    CatalogMeal("Overnight Oats with Peanut Butter", "breakfast", 450),
+    CatalogMeal("Tofu Scramble", "breakfast", 350, low_carb=True),
+    CatalogMeal("Chia Pudding with Mango", "breakfast", 320),
+    CatalogMeal("Avocado Toast", "breakfast", 380),
+    CatalogMeal("Smoothie Bowl with Granola", "breakfast", 420),
+    CatalogMeal("Whole-grain Pancakes with Fruit", "breakfast", 480, ("eggs", "dairy")),
+    CatalogMeal("Greek Yogurt Parfait", "breakfast", 330, ("dairy",)),
+    CatalogMeal("Scrambled Eggs on Toast", "breakfast", 400, ("eggs",)),
+    CatalogMeal("Vegetable Omelette", "breakfast", 320, ("eggs", "dairy"), low_carb=True),
+    CatalogMeal("Egg Muffins", "breakfast", 350, ("eggs", "dairy"), low_carb=True),
+    CatalogMeal("Bacon and Eggs", "breakfast", 520, ("meat", "eggs"), low_carb=True),
+    CatalogMeal("Smoked Salmon Bagel", "breakfast", 460, ("fish", "dairy")),
+    CatalogMeal("Smoked Salmon and Cream Cheese Roll-ups", "breakfast", 380, ("fish", "dairy"), low_carb=True),
+    CatalogMeal("Turkey Sausage Breakfast Burrito", "breakfast", 550, ("meat", "eggs", "dairy")),
+    CatalogMeal("Coconut Yogurt with Walnuts", "breakfast", 300, low_carb=True),
+    # Lunch
+    CatalogMeal("Quinoa Salad", "lunch", 500),
+    CatalogMeal("Vegetable Stir Fry with Rice", "lunch", 520),
+    CatalogMeal("Lentil Soup with Bread", "lunch", 480),
+    CatalogMeal("Falafel Wrap", "lunch", 600),
+    CatalogMeal("Buddha Bowl with Tahini", "lunch", 560),
+    CatalogMeal("Zucchini Noodles with Pesto", "lunch", 420, low_carb=True),
+    CatalogMeal("Caprese Sandwich", "lunch", 540, ("dairy",)),
+    CatalogMeal("Spinach and Feta Quiche", "lunch", 480, ("eggs", "dairy")),
+    CatalogMeal("Tuna Salad", "lunch", 450, ("fish",), low_carb=True),
+    CatalogMeal("Shrimp Tacos", "lunch", 520, ("fish",)),
+    CatalogMeal("Salmon Poke Bowl", "lunch", 610, ("fish",)),
+    CatalogMeal("Turkey Sandwich", "lunch", 500, ("meat", "dairy")),
+    CatalogMeal("Chicken Caesar Salad", "lunch", 480, ("meat", "dairy", "eggs"), low_carb=True),
+    CatalogMeal("Chicken Burrito Bowl", "lunch", 650, ("meat", "dairy")),
+    CatalogMeal("Cobb Salad", "lunch", 560, ("meat", "eggs", "dairy"), low_carb=True),
+    CatalogMeal("Tofu Lettuce Wraps", "lunch", 380, low_carb=True),
+    # Dinner
+    CatalogMeal("Chickpea Curry with Rice", "dinner", 600),
+    CatalogMeal("Lentil Stew", "dinner", 550),
+    CatalogMeal("Black Bean Enchiladas", "dinner", 650),
+    CatalogMeal("Vegetable Lasagna", "dinner", 680, ("dairy",)),
+    CatalogMeal("Mushroom Risotto", "dinner", 620, ("dairy",)),
+    CatalogMeal("Cauliflower Crust Pizza", "dinner", 560, ("dairy", "eggs"), low_carb=True),
+    CatalogMeal("Tempeh Stir Fry with Broccoli", "dinner", 520, low_carb=True),
+    CatalogMeal("Grilled Salmon with Asparagus", "dinner", 600, ("fish",), low_carb=True),
+    CatalogMeal("Baked Cod with Sweet Potato", "dinner", 540, ("fish",)),
+    CatalogMeal("Shrimp Pasta Primavera", "dinner", 700, ("fish", "dairy")),
+    CatalogMeal("Grilled Chicken with Quinoa", "dinner", 600, ("meat",)),
+    CatalogMeal("Beef Stir Fry", "dinner", 650, ("meat",), low_carb=True),
+    CatalogMeal("Turkey Meatballs with Zoodles", "dinner", 560, ("meat", "eggs"), low_carb=True),
+    CatalogMeal("Pork Tenderloin with Roasted Vegetables", "dinner", 620, ("meat",), low_carb=True),
+    CatalogMeal("Spaghetti Bolognese", "dinner", 750, ("meat",)),
+    CatalogMeal("Stuffed Bell Peppers", "dinner", 580),
+    # Snacks
+    CatalogMeal("Fruit & Seeds", "snacks", 250),
+    CatalogMeal("Hummus & Veggies", "snacks", 200),
+    CatalogMeal("Apple with Almond Butter", "snacks", 280),
+    CatalogMeal("Trail Mix", "snacks", 350),
+    CatalogMeal("Roasted Chickpeas", "snacks", 180),
+    CatalogMeal("Mixed Nuts", "snacks", 300, low_carb=True),
+    CatalogMeal("Guacamole with Cucumber", "snacks", 220, low_carb=True),
+    CatalogMeal("Greek Yogurt & Nuts", "snacks", 350, ("dairy",)),
+    CatalogMeal("Cheese & Olives", "snacks", 300, ("dairy",), low_carb=True),
+    CatalogMeal("Hard-boiled Eggs", "snacks", 160, ("eggs",), low_carb=True),
+    CatalogMeal("Tuna Cucumber Bites", "snacks", 180, ("fish",), low_carb=True),
+    CatalogMeal("Turkey Roll-ups", "snacks", 200, ("meat", "dairy"), low_carb=True),
+    CatalogMeal("Yogurt & Fruit", "snacks", 220, ("dairy",)),
+)
+
+# Ingredients each diet excludes; keto additionally requires low-carb meals
+DIET_EXCLUDES: Dict[str, frozenset] = {
+    "vegetarian": frozenset({"meat", "fish"}),
+    "vegan": frozenset({"meat", "fish", "dairy", "eggs"}),
+    "pescatarian": frozenset({"meat"}),
+    "keto": frozenset(),
+    "omnivore": frozenset(),
+}
+
+
+def _fits_diet(meal: CatalogMeal, diet: str) -> bool:
+    if diet == "keto" and not meal.low_carb:
+        return False
+    return not DIET_EXCLUDES[diet] & set(meal.contains)
+
+
+# Column-wise catalog
+MEAL_CALORIES = np.array([meal.calories for meal in MEAL_CATALOG], dtype=np.float64)
+MEAL_TYPE_CODES = np.array([MEAL_TYPES.index(meal.type) for meal in MEAL_CATALOG], dtype=np.int8)
+MEAL_CALORIE_BANDS = (MEAL_CALORIES // CALORIE_BAND_SIZE).astype(np.int16)
+
+# Indexes of catalog positions
+MEALS_BY_DIET: Dict[str, np.ndarray] = {
+    diet: np.array([i for i, meal in enumerate(MEAL_CATALOG) if _fits_diet(meal, diet)], dtype=np.intp)
+    for diet in DIETS
+}
+MEALS_BY_TYPE: Dict[str, np.ndarray] = {
+    meal_type: np.flatnonzero(MEAL_TYPE_CODES == code) for code, meal_type in enumerate(MEAL_TYPES)
+}
+MEALS_BY_CALORIE_BAND: Dict[int, np.ndarray] = {
+    int(band): np.flatnonzero(MEAL_CALORIE_BANDS == band) for band in np.unique(MEAL_CALORIE_BANDS)
+}
+MEALS_BY_DIET_AND_TYPE: Dict[Tuple[str, str], np.ndarray] = {
+    (diet, meal_type): np.intersect1d(MEALS_BY_DIET[diet], MEALS_BY_TYPE[meal_type])
+    for diet in DIETS
+    for meal_type in MEAL_TYPES
+}
+
+
+def meals_in_calorie_range(diet: str, meal_type: str, low: float, high: float) -> np.ndarray:
+    """Catalog positions of a diet's meals of one type whose calorie band overlaps [low, high]."""
+
+    bands = [
+        MEALS_BY_CALORIE_BAND[band]
+        for band in range(int(low // CALORIE_BAND_SIZE), int(high // CALORIE_BAND_SIZE) + 1)
+        if band in MEALS_BY_CALORIE_BAND
+    ]
+    if not bands:
+        return np.empty(0, dtype=np.intp)
+    return np.intersect1d(MEALS_BY_DIET_AND_TYPE[(diet, meal_type)], np.concatenate(bands))
+
+
+def _candidate_pools(diet: str, calories_per_day: float) -> List[np.ndarray]:
+    pools = []
+    for meal_type in MEAL_TYPES:
+        share = calories_per_day * MEAL_TYPE_SHARE[meal_type]
+        pool = meals_in_calorie_range(diet, meal_type, share * 0.5, share * 1.5)
+        # Targets far outside the catalog's range fall back to the whole pool and portion scaling
+        pools.append(pool if len(pool) else MEALS_BY_DIET_AND_TYPE[(diet, meal_type)])
+    return pools
+
+
+def solve_weekly_meal_plan(
+    diet: str,
+    calories_per_day: float,
+    days: int = 7,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Optional[List[MealDay]]:
+    """
+    Pick a varied plan of `days` days whose daily calories are within `tolerance` of the target.
+
+    Each day is the breakfast/lunch/dinner/snack combination with the lowest cost,
+    where cost is the calorie error beyond what is achievable plus a penalty for
+    every earlier use of its meals. Days that still miss the tolerance have their
+    portions scaled to the target. Returns None for unknown diets.
+    """
+
+    if diet not in MEALS_BY_DIET or calories_per_day <= 0:
+        return None
+
+    pools = _candidate_pools(diet, calories_per_day)
+    if not all(len(pool) for pool in pools):
+        return None
+
+    # Daily totals of every combination, shape (breakfasts, lunches, dinners, snacks)
+    axes = [MEAL_CALORIES[pool].reshape([-1 if axis == i else 1 for axis in range(4)]) for i, pool in enumerate(pools)]
+    totals = axes[0] + axes[1] + axes[2] + axes[3]
+    error = np.abs(totals - calories_per_day) / (calories_per_day * tolerance)
+    # When no combination reaches the tolerance, accept anything within one more
+    # tolerance-width of the best one (portions are scaled) so days still vary
+    allowed = max(1.0, float(error.min()) + 1.0)
+    base_cost = np.maximum(error - allowed, 0.0) * 10.0 + error * 0.01
+
+    uses = [np.zeros(len(pool)) for pool in pools]
+    plan: List[MealDay] = []
+    for day in range(1, days + 1):
+        reuse = [count.reshape([-1 if axis == i else 1 for axis in range(4)]) for i, count in enumerate(uses)]
+        cost = base_cost + REUSE_PENALTY * (reuse[0] + reuse[1] + reuse[2] + reuse[3])
+        choice = np.unravel_index(int(np.argmin(cost)), cost.shape)
+
+        for i, position in enumerate(choice):
+            uses[i][position] += 1
+
+        chosen = [MEAL_CATALOG[int(pool[position])] for pool, position in zip(pools, choice)]
+        total = float(totals[choice])
+        ratio = calories_per_day / total if abs(total - calories_per_day) > calories_per_day * tolerance else 1.0
+        plan.append(MealDay(
+            day=day,
+            meals=[Meal(name=meal.name, type=meal.type, calories=round(meal.calories * ratio)) for meal in chosen],
+        ))
+
+    return plan
@@ -1,68 +1,32 @@
-import asyncio
 from agents import RunContextWrapper, function_tool
-from typing import List, Optional
+from typing import Optional
 
-from src.context import Meal, MealDay, DietPreferences, UserSessionContext
-
-# Example meal options for each diet
-meal_options = {
-    "vegetarian": [
-        Meal(name="Oatmeal with Berries", type="breakfast", calories=350),
-        Meal(name="Vegetable Stir Fry", type="lunch", calories=500),
-        Meal(name="Chickpea Curry", type="dinner", calories=600),
-        Meal(name="Greek Yogurt & Nuts", type="snacks", calories=350)
-    ],
-    "vegan": [
-        Meal(name="Tofu Scramble", type="breakfast", calories=350),
-        Meal(name="Quinoa Salad", type="lunch", calories=500),
-        Meal(name="Lentil Stew", type="dinner", calories=600),
-        Meal(name="Fruit & Seeds", type="snacks", calories=350)
-    ],
-    "pescatarian": [
-        Meal(name="Avocado Toast", type="breakfast", calories=350),
-        Meal(name="Tuna Salad", type="lunch", calories=500),
-        Meal(name="Grilled Salmon", type="dinner", calories=600),
-        Meal(name="Hummus & Veggies", type="snacks", calories=350)
-    ],
-    "keto": [
-        Meal(name="Egg Muffins", type="breakfast", calories=350),
-        Meal(name="Chicken Caesar Salad", type="lunch", calories=500),
-        Meal(name="Beef Stir Fry", type="dinner", calories=600),
-        Meal(name="Cheese & Olives", type="snacks", calories=350)
-    ],
-    "omnivore": [
-        Meal(name="Scrambled Eggs", type="breakfast", calories=350),
-        Meal(name="Turkey Sandwich", type="lunch", calories=500),
-        Meal(name="Grilled Chicken", type="dinner", calories=600),
-        Meal(name="Yogurt & Fruit", type="snacks", calories=350)
-    ]
-}
+from src.context import CompactMealPlan, DietPreferences, UserSessionContext
 
 
 @function_tool(strict_mode=False)
 async def meal_planner(
     ctx: RunContextWrapper[UserSessionContext],
     preferences: Optional[DietPreferences] = None,
-) -> List[MealDay]:
+) -> CompactMealPlan:
    
     """
     Generates a weekly meal plan based on user preferences or session context.
-    This function creates a list of `MealDay` objects, each representing a day's meal plan,
-    tailored to the user's dietary preferences and daily calorie requirements. Preferences can
-    be provided directly or inferred from the session context. The function adjusts meal
-    calories proportionally to match the desired daily calorie intake.
+    This function creates a 7-day meal plan tailored to the user's dietary preferences and daily calorie requirements. Preferences can
+    be provided directly or inferred from the session context. Meals are picked from the meal
+    catalog so each day varies and stays close to the desired daily calorie intake. Meals that
+    repeat across days are listed once in `meals`; each day lists indexes into `meals`.
     Args:
         ctx (RunContextWrapper[UserSessionContext]): The execution context containing user session data.
         preferences (Optional[Preferences]): User's dietary preferences and calorie goals. If not provided,
             preferences are taken from the session context.
     Returns:
-        List[MealDay]: A list of 7 `MealDay` objects, each containing meals adjusted to the user's preferences.
+        CompactMealPlan: Table of distinct meals adjusted to the user's preferences, and 7 days referencing them.
     Raises:
-        ValueError: If preferences are not provided and not available in the session context.
+        ValueError: If preferences are not provided and not available in the session context, the diet is not
+            supported by the meal catalog, or the calorie target is not positive.
     """
 
-    # Generate a simple meal plan based on preferences
-    meal_plan: list[MealDay] = []
     if preferences is not None:
         prefs = preferences
     elif ctx.context.diet_preferences is not None:
@@ -73,27 +37,21 @@ async def meal_planner(
     diet = prefs.get("diet", "omnivore")
     calories_per_day = prefs.get("calories_per_day", 2000)
 
-    # Just to make function async :)
-    await asyncio.sleep(2)
-
-    selected_meals = meal_options.get(diet, meal_options["omnivore"])
-
-    # Adjust calories proportionally if needed
-    total_meal_calories = sum(meal.calories for meal in selected_meals)
-    calorie_ratio = calories_per_day / total_meal_calories if total_meal_calories else 1
+    # Imported on first use, the catalog pulls in NumPy
+    from src.tools.meal_catalog import DIETS, solve_weekly_meal_plan
 
-    adjusted_meals = [
-        Meal(
-            name=meal.name,
-            type=meal.type,
-            calories=int(meal.calories * calorie_ratio)
-        )
-        for meal in selected_meals
-    ]
+    # An omnivore plan is no answer to a diet the catalog can't cover
+    if diet not in DIETS:
+        raise ValueError(f"Unsupported diet '{diet}'. Supported diets: {', '.join(DIETS)}.")
 
-    for i in range(1, 8):
-        meal_plan.append(MealDay(day=i, meals=adjusted_meals))
+    meal_plan = solve_weekly_meal_plan(diet, calories_per_day)
+    if meal_plan is None:
+        raise ValueError(f"Cannot plan meals for {calories_per_day} calories per day.")
 
-    ctx.context.meal_plan = meal_plan
+    compact_plan = CompactMealPlan.from_days(meal_plan)
+    ctx.context.meal_plan = compact_plan
+    ctx.context.meal_plan_source = None
+    ctx.context._vetted_meal_plan_source = None
+    ctx.context.meal_plan_fingerprint = None
     ctx.context.diet_preferences = DietPreferences(diet=diet, calories_per_day=calories_per_day)
-    return meal_plan
+    return compact_plan
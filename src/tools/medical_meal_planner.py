@@ -1,9 +1,13 @@
-from datetime import datetime
 from typing import List, Optional, Dict, Any
 from agents import Agent, RunContextWrapper, function_tool, Runner
 from pydantic import BaseModel
 
-from src.context import MedicalMealPlan, UserSessionContext
+from src.context import CompactMealPlan, MedicalMealPlan, UserSessionContext
+from src.tools.medical_templates import build_template_plan, medical_plan_stats
+from src.tools.plan_cache import medical_plan_cache, medical_plan_fingerprint, pending_medical_plans
+
+
+DEFAULT_CALORIES_PER_DAY = 2000
 
 
 # Medical meal plan request model
@@ -36,62 +40,108 @@ async def medical_meal_planner(
     request: MedicalMealPlanRequest,
 ) -> Dict[str, Any]:
     """
-    Creates a medical meal plan using an AI agent for personalized recommendations.
+    Creates a medical meal plan tailored to the user's medical condition.
     
-    This function uses an AI agent to generate a medical meal plan based on the user's
-    medical condition, severity, restrictions, and requirements. The agent considers
-    the specific needs and creates a tailored plan with appropriate meals and guidance.
+    Common conditions (diabetes, celiac disease, hypertension) at mild or moderate severity are
+    served from vetted templates, and previously validated plans for the same condition, severity,
+    restrictions and calories are served from a cache. Otherwise an AI agent generates a plan based
+    on the user's medical condition, severity, restrictions, and requirements.
     
     Args:
         request (MedicalMealPlanRequest): The medical meal plan request with condition details.
     
     Returns:
-        Dict[str, Any]: A comprehensive medical meal plan with agent-generated recommendations.
+        Dict[str, Any]: A comprehensive medical meal plan with safety notes and where the plan came from.
     """
     
-    prompt = f"""
-    Create a medical meal plan for a user with the following requirements:
+    calories_per_day = request.calories_per_day
+    if calories_per_day is None and ctx.context.diet_preferences is not None:
+        calories_per_day = ctx.context.diet_preferences.get("calories_per_day")
+    calories_per_day = calories_per_day or DEFAULT_CALORIES_PER_DAY
     
-    Medical Condition: {request.condition}
-    Severity: {request.severity}
-    Dietary Restrictions: {', '.join(request.restrictions) if request.restrictions else 'None'}
-    Nutritional Requirements: {request.requirements}
-    Target Calories: {request.calories_per_day or 'Default for condition'}
-    Additional Notes: {request.additional_notes or 'None'}
+    # Plans with free-text notes are personalized and never shared between users
+    cache_key = None
+    medical_plan = None
+    if not request.additional_notes:
+        cache_key = medical_plan_fingerprint(request.condition, request.severity, request.restrictions, calories_per_day)
+        medical_plan = build_template_plan(request.condition, request.severity, request.restrictions, calories_per_day)
+        source = "template"
+        if medical_plan is None:
+            cached_plan = medical_plan_cache.get(cache_key)
+            if cached_plan is not None:
+                medical_plan = MedicalMealPlan.model_validate(cached_plan)
+                source = "cache"
     
-    Create a 7-day meal plan that is safe and appropriate for this medical condition.
-    Ensure all meals follow medical dietary guidelines and consider the user's restrictions.
-    """
-    
-    result = await Runner.run(
-        medical_meal_planner_agent,
-        input=prompt,
-        context=ctx.context
-    )
+    if medical_plan is None:
+        medical_plan = await _generate_medical_plan(ctx, request, calories_per_day)
+        source = "model"
+        if cache_key is not None:
+            # Promoted to the shared cache once the output guardrail accepts it
+            pending_medical_plans.set(cache_key, medical_plan.model_dump())
     
-    medical_plan = result.final_output_as(MedicalMealPlan)
-    ctx.context.meal_plan = medical_plan.days
+    medical_plan_stats.record(request.condition, source)
+    compact_plan = CompactMealPlan.from_days(medical_plan.days)
+    ctx.context.meal_plan = compact_plan
+    ctx.context.meal_plan_source = source
+    ctx.context._vetted_meal_plan_source = source if source != "model" else None
+    ctx.context.meal_plan_fingerprint = cache_key
 
     # Log medical meal plan creation
-    medical_log_entry = f"medical_meal_plan_created_{request.condition}_{datetime.now().isoformat()}"
-    ctx.context.handoff_logs.append(medical_log_entry)
+    ctx.context.handoff_logs.record("medical_meal_plan_created", target=request.condition)
+    
+    if source == "model":
+        message = f"AI-generated medical meal plan created for {request.condition}."
+        origin_note = "This plan was generated by AI and is for general guidance only"
+    else:
+        message = f"Medical meal plan created for {request.condition} from a vetted template."
+        origin_note = "This plan is based on a general template for your condition and is for guidance only"
     
     # Prepare response
     response = {
-        "medical_meal_plan": medical_plan.model_dump(),
+        # Distinct meals once, days as indexes into them
+        "medical_meal_plan": {"condition": medical_plan.condition, **compact_plan.model_dump()},
         "condition": request.condition,
         "severity": request.severity,
-        "message": f"AI-generated medical meal plan created for {request.condition}. Please consult with your healthcare provider before starting this plan.",
+        "message": f"{message} Please consult with your healthcare provider before starting this plan.",
         "safety_notes": [
-            "This plan was generated by AI and is for general guidance only",
+            origin_note,
             "Always consult with your healthcare provider",
             "Monitor your condition and adjust as needed",
             "Keep track of any adverse reactions",
             "Follow your doctor's specific recommendations"
         ],
-        "agent_used": True,
+        "agent_used": source == "model",
+        "plan_source": source,
         "request_details": request.model_dump()
     }
     
     return response
 
+
+async def _generate_medical_plan(
+    ctx: RunContextWrapper[UserSessionContext],
+    request: MedicalMealPlanRequest,
+    calories_per_day: int,
+) -> MedicalMealPlan:
+    
+    prompt = f"""
+    Create a medical meal plan for a user with the following requirements:
+    
+    Medical Condition: {request.condition}
+    Severity: {request.severity}
+    Dietary Restrictions: {', '.join(request.restrictions) if request.restrictions else 'None'}
+    Nutritional Requirements: {request.requirements}
+    Target Calories: {calories_per_day}
+    Additional Notes: {request.additional_notes or 'None'}
+    
+    Create a 7-day meal plan that is safe and appropriate for this medical condition.
+    Ensure all meals follow medical dietary guidelines and consider the user's restrictions.
+    """
+    
+    result = await Runner.run(
+        medical_meal_planner_agent,
+        input=prompt,
+        context=ctx.context
+    )
+    
+    return result.final_output_as(MedicalMealPlan)
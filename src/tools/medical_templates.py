@@ -0,0 +1,285 @@
+"""
+Vetted medical meal plan templates.
+
+The conditions users ask about most (diabetes, celiac disease, hypertension)
+are served from condition-specific meal pools instead of the medical meal
+planner agent. Meals carry allergen/ingredient tags so common restrictions
+("dairy free", "nut allergy", "vegetarian") are handled by filtering, and each
+day is scaled to the requested calories. Anything the templates cannot cover
+safely (severe cases, unknown conditions or restrictions) returns None so the
+caller can fall back to the agent.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from src.context import Meal, MealDay, MedicalMealPlan
+
+
+MEAL_TYPES = ("breakfast", "lunch", "dinner", "snacks")
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateMeal:
+    name: str
+    type: str
+    calories: int
+    tags: Tuple[str, ...] = ()  # Ingredients users commonly restrict: gluten, dairy, nuts, eggs, fish, shellfish, soy, meat
+
+
+CONDITION_TEMPLATES: Dict[str, Tuple[TemplateMeal, ...]] = {
+    # Low glycemic load, high fibre, protein at every meal, no added sugar
+    "diabetes": (
+        TemplateMeal("Steel-cut Oats with Cinnamon and Walnuts", "breakfast", 380, ("nuts",)),
+        TemplateMeal("Vegetable Omelette with Whole-grain Toast", "breakfast", 400, ("eggs", "gluten")),
+        TemplateMeal("Unsweetened Greek Yogurt with Berries and Chia", "breakfast", 350, ("dairy",)),
+        TemplateMeal("Tofu Scramble with Spinach", "breakfast", 360, ("soy",)),
+        TemplateMeal("Lentil and Vegetable Soup", "lunch", 480, ()),
+        TemplateMeal("Grilled Chicken Salad with Olive Oil Dressing", "lunch", 500, ("meat",)),
+        TemplateMeal("Quinoa Bowl with Chickpeas and Roasted Vegetables", "lunch", 520, ()),
+        TemplateMeal("Tuna and White Bean Salad", "lunch", 490, ("fish",)),
+        TemplateMeal("Baked Salmon with Broccoli and Brown Rice", "dinner", 600, ("fish",)),
+        TemplateMeal("Turkey Chili with Kidney Beans", "dinner", 580, ("meat",)),
+        TemplateMeal("Chickpea and Spinach Curry with Cauliflower Rice", "dinner", 560, ()),
+        TemplateMeal("Stir-fried Tempeh with Mixed Vegetables", "dinner", 570, ("soy",)),
+        TemplateMeal("Apple Slices with Almond Butter", "snacks", 220, ("nuts",)),
+        TemplateMeal("Hummus with Cucumber and Carrot Sticks", "snacks", 200, ()),
+        TemplateMeal("Cottage Cheese with Cherry Tomatoes", "snacks", 180, ("dairy",)),
+        TemplateMeal("Roasted Chickpeas", "snacks", 190, ()),
+    ),
+    # Strictly gluten free: no wheat, barley, rye or non-certified oats
+    "celiac": (
+        TemplateMeal("Certified Gluten-free Oats with Banana", "breakfast", 380, ()),
+        TemplateMeal("Eggs with Sautéed Peppers and Potatoes", "breakfast", 420, ("eggs",)),
+        TemplateMeal("Greek Yogurt with Gluten-free Granola", "breakfast", 370, ("dairy", "nuts")),
+        TemplateMeal("Buckwheat Pancakes with Berries", "breakfast", 390, ("eggs",)),
+        TemplateMeal("Rice Noodle Salad with Shrimp", "lunch", 500, ("shellfish",)),
+        TemplateMeal("Quinoa Tabbouleh with Chickpeas", "lunch", 480, ()),
+        TemplateMeal("Corn Tortilla Chicken Tacos", "lunch", 520, ("meat",)),
+        TemplateMeal("Baked Potato with Black Beans and Salsa", "lunch", 490, ()),
+        TemplateMeal("Grilled Salmon with Wild Rice and Asparagus", "dinner", 620, ("fish",)),
+        TemplateMeal("Beef and Vegetable Stir-fry with Tamari and Rice", "dinner", 640, ("meat", "soy")),
+        TemplateMeal("Lentil Shepherd's Pie with Potato Topping", "dinner", 580, ()),
+        TemplateMeal("Roast Chicken with Sweet Potato and Green Beans", "dinner", 610, ("meat",)),
+        TemplateMeal("Rice Cakes with Peanut Butter", "snacks", 220, ("nuts",)),
+        TemplateMeal("Fresh Fruit Salad", "snacks", 150, ()),
+        TemplateMeal("Cheese and Gluten-free Crackers", "snacks", 210, ("dairy",)),
+        TemplateMeal("Guacamole with Vegetable Sticks", "snacks", 190, ()),
+    ),
+    # DASH-style: low sodium, rich in potassium, fruit, vegetables and whole grains
+    "hypertension": (
+        TemplateMeal("Oatmeal with Banana and Flaxseed", "breakfast", 370, ()),
+        TemplateMeal("Low-fat Yogurt Parfait with Berries", "breakfast", 340, ("dairy",)),
+        TemplateMeal("Poached Eggs on Whole-grain Toast with Avocado", "breakfast", 410, ("eggs", "gluten")),
+        TemplateMeal("Unsalted Peanut Butter Banana Smoothie", "breakfast", 380, ("nuts", "dairy")),
+        TemplateMeal("Spinach Salad with Beans and Unsalted Seeds", "lunch", 470, ()),
+        TemplateMeal("Whole-wheat Wrap with Grilled Chicken and Vegetables", "lunch", 510, ("meat", "gluten")),
+        TemplateMeal("Brown Rice and Black Bean Bowl", "lunch", 500, ()),
+        TemplateMeal("Herb-baked Cod with Quinoa Salad", "lunch", 480, ("fish",)),
+        TemplateMeal("Baked Salmon with Sweet Potato and Kale", "dinner", 600, ("fish",)),
+        TemplateMeal("Herb-roasted Chicken with Steamed Vegetables", "dinner", 590, ("meat",)),
+        TemplateMeal("Vegetable and Lentil Stew (no added salt)", "dinner", 560, ()),
+        TemplateMeal("Whole-wheat Pasta Primavera", "dinner", 580, ("gluten",)),
+        TemplateMeal("Unsalted Almonds and an Orange", "snacks", 210, ("nuts",)),
+        TemplateMeal("Banana with Low-fat Yogurt", "snacks", 190, ("dairy",)),
+        TemplateMeal("Carrot and Celery Sticks with Hummus", "snacks", 170, ()),
+        TemplateMeal("Air-popped Popcorn (unsalted)", "snacks", 150, ()),
+    ),
+}
+
+CONDITION_ALIASES: Dict[str, str] = {
+    "diabetes": "diabetes",
+    "diabetic": "diabetes",
+    "prediabetes": "diabetes",
+    "pre-diabetes": "diabetes",
+    "blood sugar": "diabetes",
+    "celiac": "celiac",
+    "coeliac": "celiac",
+    "gluten intolerance": "celiac",
+    "gluten sensitivity": "celiac",
+    "hypertension": "hypertension",
+    "high blood pressure": "hypertension",
+}
+
+# Words that may accompany a condition without changing which template fits it.
+# Anything else ("insipidus", "gestational", "kidney") sends the request to the agent.
+CONDITION_QUALIFIERS = frozenset({
+    "type", "2", "ii", "mellitus", "disease", "essential", "primary", "diagnosed",
+    "mild", "moderate", "controlled", "well", "with",
+})
+
+# Severities the templates are vetted for; severe cases always go to the agent
+TEMPLATE_SEVERITIES: Dict[str, str] = {
+    "mild": "mild",
+    "low": "mild",
+    "controlled": "mild",
+    "well controlled": "mild",
+    "well-controlled": "mild",
+    "moderate": "moderate",
+    "medium": "moderate",
+}
+
+RESTRICTION_TAGS: Dict[str, FrozenSet[str]] = {
+    "gluten": frozenset({"gluten"}),
+    "wheat": frozenset({"gluten"}),
+    "dairy": frozenset({"dairy"}),
+    "lactose": frozenset({"dairy"}),
+    "milk": frozenset({"dairy"}),
+    "nut": frozenset({"nuts"}),
+    "peanut": frozenset({"nuts"}),
+    "almond": frozenset({"nuts"}),
+    "egg": frozenset({"eggs"}),
+    "shellfish": frozenset({"shellfish"}),
+    "shrimp": frozenset({"shellfish"}),
+    "fish": frozenset({"fish", "shellfish"}),
+    "seafood": frozenset({"fish", "shellfish"}),
+    "soy": frozenset({"soy"}),
+    "meat": frozenset({"meat"}),
+    "pescatarian": frozenset({"meat"}),
+    "vegetarian": frozenset({"meat", "fish", "shellfish"}),
+    "vegan": frozenset({"meat", "fish", "shellfish", "dairy", "eggs"}),
+}
+
+# Restrictions that restate what a condition's template already guarantees
+CONDITION_COVERS: Dict[str, Tuple[str, ...]] = {
+    "diabetes": ("sugar", "glycemic", "carb", "sweet"),
+    "celiac": ("gluten", "wheat", "barley", "rye"),
+    "hypertension": ("sodium", "salt"),
+}
+
+_WORD = re.compile(r"[a-z]+")
+
+_CONDITION_WORD = re.compile(r"[a-z0-9]+")
+
+# Longest aliases first, so "pre-diabetes" is matched as a whole before "diabetes"
+_CONDITION_TERMS = re.compile(
+    r"\b(" + "|".join(re.escape(alias) for alias in sorted(CONDITION_ALIASES, key=len, reverse=True)) + r")\b"
+)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def normalize_condition(condition: str) -> Optional[str]:
+    """
+    The template condition the text names, or None if it names several conditions,
+    none, or anything the template was not vetted for ("diabetes insipidus").
+    """
+
+    text = _normalize(condition)
+    names = {CONDITION_ALIASES[alias] for alias in _CONDITION_TERMS.findall(text)}
+    if len(names) != 1:
+        return None
+
+    rest = set(_CONDITION_WORD.findall(_CONDITION_TERMS.sub(" ", text)))
+    if not rest <= CONDITION_QUALIFIERS:
+        return None
+    return names.pop()
+
+
+def normalize_severity(severity: str) -> Optional[str]:
+    return TEMPLATE_SEVERITIES.get(_normalize(severity))
+
+
+def resolve_restriction_tags(condition: str, restrictions: List[str]) -> Optional[FrozenSet[str]]:
+    """Map free-text restrictions to meal tags; None if any restriction is not understood."""
+
+    tags: set = set()
+    for restriction in restrictions:
+        text = _normalize(restriction)
+        if any(term in text for term in CONDITION_COVERS.get(condition, ())):
+            continue
+
+        matched = [
+            restriction_tags
+            for word in _WORD.findall(text)
+            for term, restriction_tags in RESTRICTION_TAGS.items()
+            if word.rstrip("s") == term or word == term
+        ]
+        if not matched:
+            return None
+        for restriction_tags in matched:
+            tags |= restriction_tags
+
+    return frozenset(tags)
+
+
+def build_template_plan(
+    condition: str,
+    severity: str,
+    restrictions: List[str],
+    calories_per_day: int,
+    days: int = 7,
+) -> Optional[MedicalMealPlan]:
+    """
+    Build a medical meal plan from the vetted templates.
+
+    Returns None when the condition, severity or restrictions are outside what
+    the templates cover, in which case the medical meal planner agent is used.
+    """
+
+    name = normalize_condition(condition)
+    if name is None or normalize_severity(severity) is None:
+        return None
+
+    excluded = resolve_restriction_tags(name, restrictions)
+    if excluded is None:
+        return None
+
+    meals_by_type = {
+        meal_type: [meal for meal in CONDITION_TEMPLATES[name] if meal.type == meal_type and not excluded & set(meal.tags)]
+        for meal_type in MEAL_TYPES
+    }
+    if not all(meals_by_type.values()):
+        return None
+
+    plan_days: List[MealDay] = []
+    for day in range(days):
+        # Rotate every meal type daily, offset so pools of equal size don't move in lockstep
+        chosen = [
+            options[(day + offset) % len(options)]
+            for offset, options in enumerate(meals_by_type.values())
+        ]
+        ratio = calories_per_day / sum(meal.calories for meal in chosen)
+        plan_days.append(MealDay(
+            day=day + 1,
+            meals=[Meal(name=meal.name, type=meal.type, calories=round(meal.calories * ratio)) for meal in chosen],
+        ))
+
+    return MedicalMealPlan(days=plan_days, condition=name)
+
+
+@dataclass
+class MedicalPlanStats:
+    """How medical meal plans were served, per condition: template, cache or model."""
+
+    by_condition: Dict[str, Counter] = field(default_factory=dict)
+
+
+    def record(self, condition: str, source: str):
+        name = normalize_condition(condition) or _normalize(condition)
+        self.by_condition.setdefault(name, Counter())[source] += 1
+
+
+    def hit_rate(self, condition: str) -> float:
+        counts = self.by_condition.get(condition, Counter())
+        total = sum(counts.values())
+        return (counts["template"] + counts["cache"]) / total if total else 0.0
+
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            condition: {
+                "template": counts["template"],
+                "cache": counts["cache"],
+                "model": counts["model"],
+                "hit_rate": round(self.hit_rate(condition), 4),
+            }
+            for condition, counts in self.by_condition.items()
+        }
+
+
+medical_plan_stats = MedicalPlanStats()
@@ -0,0 +1,122 @@
+"""
+Memoized plans keyed on a canonical fingerprint of the inputs that shape them.
+
+Users with the same profile get the same plan, so model-generated plans are
+stored in a pluggable backend (in-memory LRU or on-disk JSON files) and served
+without calling the model again.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Literal, Optional
+
+from src.cache import CacheBackend, DiskCache, LRUCache
+from src.config import PLAN_CACHE_BACKEND, PLAN_CACHE_DIR, PLAN_CACHE_MAX_ENTRIES, PLAN_CACHE_TTL_SECONDS
+from src.context import DietPreferences, Goal, InjuryNote
+
+
+LBS_PER_KG = 2.20462
+
+# Medical plan calorie targets are bucketed to this granularity
+CALORIE_STEP = 50
+
+# Upper bounds of the goal quantity bands, in kg (or percentage points for "%")
+QUANTITY_BANDS = (2.5, 5, 10, 20)
+
+
+def create_plan_cache(
+    namespace: str,
+    backend: Literal["memory", "disk"] = PLAN_CACHE_BACKEND,
+    max_entries: int = PLAN_CACHE_MAX_ENTRIES,
+    ttl_seconds: Optional[float] = PLAN_CACHE_TTL_SECONDS,
+) -> CacheBackend[Any]:
+    """Create a plan cache backend; disk caches live in `PLAN_CACHE_DIR/<namespace>`."""
+
+    if backend == "disk":
+        return DiskCache(f"{PLAN_CACHE_DIR}/{namespace}", max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend == "memory":
+        return LRUCache(max_size=max_entries, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown plan cache backend: {backend}")
+
+
+def fingerprint(**parts: Any) -> str:
+    """Stable hash of canonical (sorted, JSON-encoded) inputs."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def goal_band(goal: Optional[Goal]) -> Optional[Dict[str, Any]]:
+    """Reduce a goal to its action and a coarse quantity band."""
+
+    if goal is None:
+        return None
+
+    quantity = goal.quantity / LBS_PER_KG if goal.unit == "lbs" else goal.quantity
+    band = next((index for index, upper in enumerate(QUANTITY_BANDS) if quantity <= upper), len(QUANTITY_BANDS))
+    return {
+        "action": goal.action,
+        "band": band if goal.action != "maintain" else 0,
+        "relative": goal.unit == "%",
+    }
+
+
+def injury_restriction_set(injury_notes: List[InjuryNote]) -> List[Dict[str, Any]]:
+    """Order-independent view of the injury notes that matter for planning."""
+
+    return sorted(
+        (
+            {
+                "severity": _normalize(note.severity_level),
+                "body_parts": sorted({_normalize(part) for part in note.affected_body_parts}),
+                "restrictions": sorted({_normalize(restriction) for restriction in note.restrictions}),
+            }
+            for note in injury_notes
+        ),
+        key=lambda note: json.dumps(note, sort_keys=True),
+    )
+
+
+def workout_plan_fingerprint(
+    experience: str,
+    goal: Optional[Goal],
+    diet_preferences: Optional[DietPreferences],
+    injury_notes: List[InjuryNote],
+    equipment: Optional[List[str]] = None,
+    personalization_notes: Optional[str] = None,
+) -> str:
+    return fingerprint(
+        kind="workout_plan",
+        experience=experience,
+        goal=goal_band(goal),
+        diet=diet_preferences.get("diet") if diet_preferences else None,
+        injuries=injury_restriction_set(injury_notes),
+        equipment=sorted({_normalize(item) for item in equipment}) if equipment is not None else None,
+        personalization=_normalize(personalization_notes) if personalization_notes else None,
+    )
+
+
+def medical_plan_fingerprint(
+    condition: str,
+    severity: str,
+    restrictions: List[str],
+    calories_per_day: int,
+) -> str:
+    return fingerprint(
+        kind="medical_meal_plan",
+        condition=_normalize(condition),
+        severity=_normalize(severity),
+        restrictions=sorted({_normalize(restriction) for restriction in restrictions}),
+        calories=round(calories_per_day / CALORIE_STEP) * CALORIE_STEP,
+    )
+
+
+workout_plan_cache: CacheBackend[Any] = create_plan_cache("workout_plans")
+
+# Only plans that passed the medical meal plan output guardrail are promoted
+# from the pending cache to `medical_plan_cache`
+medical_plan_cache: CacheBackend[Any] = create_plan_cache("medical_meal_plans")
+pending_medical_plans: LRUCache[Any] = LRUCache(max_size=256, ttl_seconds=3600)
@@ -0,0 +1,77 @@
+from typing import Any, Dict
+
+from agents import RunContextWrapper, function_tool
+
+from src.context import UserSessionContext
+
+
+@function_tool(strict_mode=False)
+async def progress_analytics(
+    ctx: RunContextWrapper[UserSessionContext],
+    window_days: int = 7,
+    weeks: int = 4,
+) -> Dict[str, Any]:
+    """
+    Analyzes the user's logged progress to answer questions like "am I on track?".
+
+    Computes the weight trend (least-squares fit), rolling averages, weekly rollups and,
+    when the user has a goal, the projected goal completion date compared to the goal's
+    deadline. Use this instead of reading raw progress logs.
+
+    Args:
+        window_days (int): Days in the rolling-average window. Defaults to 7.
+        weeks (int): Number of most recent weeks to include in the weekly rollup. Defaults to 4.
+
+    Returns:
+        Dict[str, Any]: Weight trend, latest rolling averages, weekly rollups, goal projection and a message.
+    """
+
+    # Imported on first use, the series pulls in NumPy
+    from src.tools.progress_series import METRICS, progress_series
+
+    user = ctx.context
+    series = progress_series(user)
+    if not series.length:
+        return {"entries": 0, "message": "No progress has been logged yet."}
+
+    window_days = max(1, window_days)
+    latest_averages = {}
+    for metric in METRICS:
+        averages = series.rolling_average(metric, window_days)
+        if averages:
+            day, value = next(reversed(averages.items()))
+            latest_averages[metric] = {"date": day, "average": value}
+
+    result: Dict[str, Any] = {
+        "entries": series.length,
+        f"rolling_{window_days}_day_averages": latest_averages,
+        "weekly_rollup": series.weekly_rollup()[-max(1, weeks):],
+    }
+
+    trend = series.weight_trend()
+    if trend is None:
+        result["message"] = "Log your weight on at least two different days to see a trend."
+        return result
+
+    result["weight_trend"] = {
+        "change_per_week": round(trend.slope_per_day * 7, 3),
+        "current_trend_weight": round(trend.fitted_current, 2),
+        "r_squared": round(trend.r_squared, 3),
+        "weigh_ins": trend.points,
+    }
+
+    if user.goal is None:
+        result["message"] = "Set a goal to see whether you're on track."
+        return result
+
+    projection = trend.project(user.goal)
+    result["goal_projection"] = projection
+    if projection.get("reached"):
+        result["message"] = "Goal weight reached according to the trend."
+    elif "on_track" not in projection:
+        result["message"] = "This goal can't be projected from weight logs."
+    elif projection["on_track"]:
+        result["message"] = f"On track to reach the goal by {projection.get('projected_date') or projection['deadline']}."
+    else:
+        result["message"] = f"Behind schedule for the {projection['deadline']} deadline at the current trend."
+    return result
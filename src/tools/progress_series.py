@@ -0,0 +1,210 @@
+"""
+NumPy analytics over a user's columnar progress log.
+
+`ProgressLog` (the in-memory `progress_logs`) already keeps one typed array
+per metric (NaN for missing values) plus an ordinal day index; `ProgressSeries`
+loads those columns into NumPy arrays for one computation. Entries whose
+date can't be parsed keep their row, so rows stay aligned with the logs, but
+are left out of every computation. Rolling averages, weekly rollups, the
+least-squares weight trend and the goal projection are all computed with
+vectorized array operations.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.context import UNDATED_DAY, Goal, ProgressLog, UserSessionContext
+
+
+METRICS = ("weight", "workouts", "meals", "sleep", "water")
+
+# ProgressUpdate attribute of each metric
+_METRIC_FIELDS = {
+    "weight": "weight",
+    "workouts": "workouts_completed",
+    "meals": "meals_followed",
+    "sleep": "sleep_hours",
+    "water": "water_intake",
+}
+
+# Per-week totals for counts, per-week means for measurements
+_WEEKLY_TOTALS = ("workouts", "meals")
+
+_TIMEFRAME_DAYS = {"days": 1, "weeks": 7, "months": 30}
+
+
+class ProgressSeries:
+    """A progress log's columns as NumPy arrays."""
+
+    def __init__(self, log: ProgressLog):
+        # Copies: a view would keep the log's arrays from growing while it is alive
+        self.days = np.array(log.days, dtype=np.int32)
+        self._columns = {metric: np.array(log.columns[field], dtype=np.float64) for metric, field in _METRIC_FIELDS.items()}
+        self.length = len(self.days)
+
+
+    def column(self, metric: str) -> np.ndarray:
+        return self._columns[metric]
+
+
+    def dated(self) -> np.ndarray:
+        """Mask of the entries with a valid date."""
+        return self.days != UNDATED_DAY
+
+
+    def daily(self, metric: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(day ordinals from first to last entry, per-day sums, per-day value counts)."""
+
+        dated = self.dated()
+        days = self.days[dated]
+        values = self.column(metric)[dated]
+        first = int(days.min())
+        span = int(days.max()) - first + 1
+
+        present = ~np.isnan(values)
+        offsets = days[present] - first
+        sums = np.bincount(offsets, weights=values[present], minlength=span)
+        counts = np.bincount(offsets, minlength=span)
+        return np.arange(first, first + span), sums, counts
+
+
+    def rolling_average(self, metric: str, window_days: int = 7) -> Dict[str, Optional[float]]:
+        """Mean of the metric over the trailing `window_days` days, for every day with a value."""
+
+        if not self.dated().any():
+            return {}
+
+        days, sums, counts = self.daily(metric)
+        sum_windows = np.cumsum(sums)
+        count_windows = np.cumsum(counts)
+        sum_windows[window_days:] -= sum_windows[:-window_days].copy()
+        count_windows[window_days:] -= count_windows[:-window_days].copy()
+
+        has_value = counts > 0
+        means = sum_windows[has_value] / count_windows[has_value]
+        return {
+            date.fromordinal(int(day)).isoformat(): round(float(mean), 3)
+            for day, mean in zip(days[has_value], means)
+        }
+
+
+    def weekly_rollup(self) -> List[Dict[str, object]]:
+        """Per calendar week (Monday start): totals of workouts and meals, means of the rest."""
+
+        dated = self.dated()
+        if not dated.any():
+            return []
+
+        # Ordinal 1 (0001-01-01) is a Monday
+        weeks = (self.days[dated] - 1) // 7
+        first_week = int(weeks.min())
+        offsets = weeks - first_week
+        span = int(offsets.max()) + 1
+        entries = np.bincount(offsets, minlength=span)
+
+        rollup: Dict[str, np.ndarray] = {}
+        for metric in METRICS:
+            values = self.column(metric)[dated]
+            present = ~np.isnan(values)
+            sums = np.bincount(offsets[present], weights=values[present], minlength=span)
+            if metric in _WEEKLY_TOTALS:
+                rollup[metric] = sums
+            else:
+                counts = np.bincount(offsets[present], minlength=span)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    rollup[metric] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+        result = []
+        for index in np.flatnonzero(entries):
+            week_start = date.fromordinal(int(first_week + index) * 7 + 1)
+            row: Dict[str, object] = {"week_start": week_start.isoformat(), "entries": int(entries[index])}
+            for metric in METRICS:
+                value = rollup[metric][index]
+                row[metric] = None if np.isnan(value) else round(float(value), 3)
+            result.append(row)
+        return result
+
+
+    def weight_trend(self) -> Optional["WeightTrend"]:
+        """Least-squares line through the weight entries, or None with fewer than two distinct days."""
+
+        weights = self.column("weight")
+        present = ~np.isnan(weights) & self.dated()
+        # Logs may be out of order: the baseline is the earliest day, the current weight the latest
+        order = np.argsort(self.days[present], kind="stable")
+        days = self.days[present][order].astype(np.float64)
+        weights = weights[present][order]
+        if len(np.unique(days)) < 2:
+            return None
+
+        origin = days[0]
+        x = days - origin
+        slope, intercept = np.polyfit(x, weights, 1)
+        fitted = slope * x + intercept
+        total = np.sum((weights - weights.mean()) ** 2)
+        r_squared = 1.0 - np.sum((weights - fitted) ** 2) / total if total else 1.0
+
+        return WeightTrend(
+            slope_per_day=float(slope),
+            start_day=int(origin),
+            end_day=int(days[-1]),
+            start_weight=float(weights[0]),
+            fitted_current=float(slope * x[-1] + intercept),
+            r_squared=float(r_squared),
+            points=int(len(weights)),
+        )
+
+
+@dataclass
+class WeightTrend:
+    slope_per_day: float
+    start_day: int
+    end_day: int
+    start_weight: float
+    """First logged weight, the baseline for the goal."""
+    fitted_current: float
+    """Trend-line weight on the last logged day."""
+    r_squared: float
+    points: int
+
+
+    def project(self, goal: Goal) -> Dict[str, object]:
+        """Projected goal completion against the goal's timeframe, counted from the first weigh-in."""
+
+        deadline = date.fromordinal(self.start_day) + timedelta(days=goal.duration * _TIMEFRAME_DAYS[goal.timeframe_unit])
+        projection: Dict[str, object] = {"deadline": deadline.isoformat()}
+
+        if goal.unit == "%" or goal.action == "maintain":
+            # Body-fat goals aren't measured by weight; maintaining is judged by drift
+            if goal.action == "maintain":
+                drift = self.slope_per_day * (deadline.toordinal() - self.start_day)
+                projection.update(projected_change_by_deadline=round(drift, 2), on_track=abs(drift) <= 1.0)
+            return projection
+
+        direction = -1.0 if goal.action == "lose" else 1.0
+        target = self.start_weight + direction * goal.quantity
+        remaining = target - self.fitted_current
+        projection["target_weight"] = round(target, 2)
+
+        if remaining * direction <= 0:
+            projection.update(projected_date=date.fromordinal(self.end_day).isoformat(), on_track=True, reached=True)
+        elif self.slope_per_day * direction <= 0:
+            # Trend is flat or heading the wrong way
+            projection.update(projected_date=None, on_track=False)
+        else:
+            days_left = math.ceil(remaining / self.slope_per_day)
+            projected = date.fromordinal(self.end_day + days_left)
+            projection.update(projected_date=projected.isoformat(), on_track=projected <= deadline)
+        return projection
+
+
+def progress_series(context: UserSessionContext) -> ProgressSeries:
+    """Analytics arrays of the context's progress log."""
+
+    logs = context.progress_logs
+    # A plain list assigned to the field isn't validated into a ProgressLog
+    return ProgressSeries(logs if isinstance(logs, ProgressLog) else ProgressLog(logs))
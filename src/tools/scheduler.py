@@ -1,18 +1,18 @@
-import os
-from typing import Literal, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Optional, Sequence
 
 from agents import RunContextWrapper, function_tool
-from datetime import date, datetime, timedelta
-from ics import Calendar, Event
+from datetime import date, timedelta
 from pydantic import BaseModel
-from uuid import uuid4
 
-from src.context import UserSessionContext
+from src.context import CheckinSchedule, UserSessionContext
+from src.tools.google_calendar import checkin_event_body, get_calendar_client
+from src.tools.ics_calendar import checkin_calendar_writer, checkin_event_id
 
 
 class ScheduleConfirmation(BaseModel):
     event_id: str
-    user_id: int
+    user_id: Optional[int] = None
     frequency: str
     next_occurrence: date
     calendar_file: Optional[str] = None
@@ -21,23 +21,24 @@ class ScheduleConfirmation(BaseModel):
 
 # Function to get timedelta for frequency
 def get_timedelta(frequency: Literal["DAILY", "WEEKLY", "MONTHLY"]):
-    match frequency:
-        case "daily": return timedelta(days=1) 
-        case "weekly": return timedelta(weeks=1) 
-        case "monthly": return timedelta(days=30) 
+    match frequency.upper():
+        case "DAILY": return timedelta(days=1) 
+        case "WEEKLY": return timedelta(weeks=1) 
+        case "MONTHLY": return timedelta(days=30) 
     
     raise ValueError("Invalid frequency") 
 
 
 @function_tool(strict_mode=False)
-def checkin_scheduler_local(
+async def checkin_scheduler_local(
     ctx: RunContextWrapper[UserSessionContext],
     user_id: int,
     frequency: Literal["DAILY", "WEEKLY", "MONTHLY"],
     start_date: Optional[date] = None
 ) -> ScheduleConfirmation:
     """
-    Create local iCal file for recurring progress check-ins.
+    Add recurring progress check-ins to the user's local iCal calendar.
+    Scheduling a frequency that already exists moves that series to the new start date.
     
     Args:
         user_id: User identifier
@@ -54,64 +55,62 @@ def checkin_scheduler_local(
     if start_date is None:
         start_date = date.today()
     
-    event_id = str(uuid4())
-    next_occurrence = start_date + get_timedelta(frequency)
-    
-    
-    cal = Calendar()
-    event = Event(
-        name=f"Progress Check-in for {user.name}",
-        begin=datetime(start_date.year, start_date.month, start_date.day),
-        uid=event_id,
-        description=f"",
-        duration=timedelta(minutes=15),
+    event_id = checkin_event_id(user.uid, frequency)
+    existing = next((schedule for schedule in user.checkin_schedules if schedule.event_id == event_id), None)
+    schedule = CheckinSchedule(
+        event_id=event_id,
+        frequency=frequency,
+        start_date=start_date.isoformat(),
+        sequence=existing.sequence + 1 if existing else 0,
     )
-    cal.events.add(event)
     
-    filename = f"user_{user.uid}_{frequency}_checkin.ics"
+    if existing is None:
+        user.checkin_schedules.append(schedule)
+    else:
+        # New list so the session store rewrites the section
+        user.checkin_schedules = [schedule if item is existing else item for item in user.checkin_schedules]
     
-    with open(filename, "w") as file:
-        file.writelines(cal.serialize_iter())
+    path = await checkin_calendar_writer.upsert(user.uid, user.name, schedule, update=existing is not None)
     
     return ScheduleConfirmation(
         user_id=user_id,
         event_id=event_id,
         frequency=frequency,
-        next_occurrence=next_occurrence,
-        calendar_file=os.path.abspath(filename)
+        next_occurrence=start_date + get_timedelta(frequency),
+        calendar_file=str(path.resolve()),
     )
-    
 
 
+@dataclass
+class CheckinRequest:
+    user_name: str
+    frequency: Literal["DAILY", "WEEKLY", "MONTHLY"]
+    start_date: date
+    user_uid: Optional[str] = None
 
-import os.path
 
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+@dataclass
+class CheckinResult:
+    request: CheckinRequest
+    confirmation: Optional[ScheduleConfirmation] = None
+    error: Optional[str] = None
 
-SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
-def authenticate_google():
-    flow = InstalledAppFlow.from_client_secrets_file(
-        "credentials.json", SCOPES
+def _google_confirmation(event: Dict[str, Any], frequency: str, start_date: date) -> ScheduleConfirmation:
+    return ScheduleConfirmation(
+        event_id=event["id"],
+        frequency=frequency,
+        next_occurrence=start_date + get_timedelta(frequency),
+        confirmation_link=event.get("htmlLink"),
     )
-    creds = flow.run_local_server(port=0)
-    # url, _ = flow.authorization_url()
-    # print(url)
-    # print(_)
-    # webbrowser.open(url, )
-    # creds = flow.fetch_token(authorization_response=url)
-    
-    print(creds)
-    return creds
 
 
 @function_tool(strict_mode=False)
-def checkin_scheduler_google(
+async def checkin_scheduler_google(
     ctx: RunContextWrapper[UserSessionContext],
     frequency: Literal["DAILY", "WEEKLY", "MONTHLY"],
     start_date: Optional[date] = None
-):
+) -> ScheduleConfirmation:
     """
     Schedule recurring progress check-ins using Google Calendar.
     
@@ -120,36 +119,35 @@ def checkin_scheduler_google(
         start_date: Start date for the recurring events (optional, defaults to current date)
     
     Returns:
-        Google Calendar event details with recurrence rules
+        ScheduleConfirmation with the Google Calendar event id and link
     """
 
-    creds = authenticate_google()
-    print(creds)
-    service = build("calendar", "v3", credentials=creds)
-    print("Service", service)
-    
     user = ctx.context
     
     # Use current date if no start_date provided
     if start_date is None:
         start_date = date.today()
     
-    start_datetime = datetime.combine(start_date, datetime.min.time())
-    end_datetime = start_datetime + timedelta(minutes=30)
+    # Credentials, service and the HTTP call all run in a worker thread
+    calendar = get_calendar_client()
+    event = await calendar.ainsert_event(checkin_event_body(user.name, frequency, start_date))
     
+    return _google_confirmation(event, frequency, start_date)
 
-    event_info = {
-        "summary": f"Progess Check-in for {user.name.title()}",
-        "description": "",
-        "start": {"dateTime": start_datetime.isoformat(), "timeZone": "UTC" },
-        "end": {"dateTime": end_datetime.isoformat(), "timeZone": "UTC" },
-        "recurrence": [f"RRULE:FREQ={frequency};COUNT=10"],
-    }
 
-    event = service.events().insert(calendarId="primary", body=event_info).execute()
-    
-    print(event)
-    print(dict(event))
+async def schedule_checkins_google(requests: Sequence[CheckinRequest]) -> List[CheckinResult]:
+    """Schedule many users' recurring check-ins with batched Google Calendar requests."""
+
+    bodies = [checkin_event_body(request.user_name, request.frequency, request.start_date) for request in requests]
+    events = await get_calendar_client().ainsert_events(bodies)
+
+    results = []
+    for request, event in zip(requests, events):
+        if isinstance(event, Exception):
+            results.append(CheckinResult(request=request, error=str(event)))
+        else:
+            results.append(CheckinResult(request=request, confirmation=_google_confirmation(event, request.frequency, request.start_date)))
+    return results
     
     
 # def main():
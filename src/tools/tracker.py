@@ -3,7 +3,7 @@ from typing import Dict, Any, Optional, List
 from agents import RunContextWrapper, function_tool
 from pydantic import BaseModel
 
-from src.context import Goal, ProgressUpdate, UserSessionContext
+from src.context import Goal, ProgressAggregates, ProgressUpdate, UserSessionContext
 
 
 # Progress summary model for tracking overall progress
@@ -60,10 +60,9 @@ async def progress_tracker(
     if not progress_update.date:
         progress_update.date = datetime.now().strftime("%Y-%m-%d")
     
-    ctx.context.progress_logs.append(progress_update)
-    
-    # Calculate progress summary
-    summary = calculate_progress_summary(ctx.context.progress_logs, ctx.context.goal)
+    # Updates the running aggregates, so the summary doesn't re-read the history
+    record_progress(ctx.context, progress_update)
+    summary = summarize_progress(ctx.context.progress_aggregates, ctx.context.goal)
     
     # Prepare response
     response = {
@@ -76,12 +75,91 @@ async def progress_tracker(
     return response
 
 
+def add_progress_update(aggregates: ProgressAggregates, update: ProgressUpdate) -> ProgressAggregates:
+    """
+    Aggregates including one more update, in constant time.
+    Returns a new object: the session store detects changed fields by identity.
+    """
+
+    changes: Dict[str, Any] = {"count": aggregates.count + 1}
+
+    if update.weight is not None:
+        changes["weight_count"] = aggregates.weight_count + 1
+        changes["last_weight"] = update.weight
+        if aggregates.first_weight is None:
+            changes["first_weight"] = update.weight
+    if update.workouts_completed is not None:
+        changes["workouts_total"] = aggregates.workouts_total + update.workouts_completed
+    if update.meals_followed is not None:
+        changes["meals_total"] = aggregates.meals_total + update.meals_followed
+    if update.sleep_hours is not None:
+        changes["sleep_count"] = aggregates.sleep_count + 1
+        changes["sleep_total"] = aggregates.sleep_total + update.sleep_hours
+    if update.water_intake is not None:
+        changes["water_count"] = aggregates.water_count + 1
+        changes["water_total"] = aggregates.water_total + update.water_intake
+    if update.mood:
+        mood = update.mood.strip().lower()
+        changes["mood_counts"] = {**aggregates.mood_counts, mood: aggregates.mood_counts.get(mood, 0) + 1}
+
+    return aggregates.model_copy(update=changes)
+
+
+def aggregate_progress(progress_logs: List[ProgressUpdate]) -> ProgressAggregates:
+    """Aggregates recomputed from the full history."""
+
+    aggregates = ProgressAggregates()
+    for update in progress_logs:
+        aggregates = add_progress_update(aggregates, update)
+    return aggregates
+
+
+def record_progress(context: UserSessionContext, update: ProgressUpdate):
+    """Append a progress update and fold it into the running aggregates."""
+
+    # Sessions saved before aggregates existed, or logs changed elsewhere: rebuild once
+    if context.progress_aggregates.count != len(context.progress_logs):
+        context.progress_aggregates = aggregate_progress(context.progress_logs)
+
+    context.progress_logs.append(update)
+    context.progress_aggregates = add_progress_update(context.progress_aggregates, update)
+
+
+def summarize_progress(aggregates: ProgressAggregates, goal: Optional[Goal] = None) -> ProgressSummary:
+    """Progress summary from the running aggregates, in constant time."""
+
+    weight_change = None
+    if aggregates.weight_count >= 2:
+        weight_change = aggregates.last_weight - aggregates.first_weight
+
+    average_sleep = aggregates.sleep_total / aggregates.sleep_count if aggregates.sleep_count else None
+    average_mood = max(aggregates.mood_counts, key=aggregates.mood_counts.get) if aggregates.mood_counts else None
+
+    # Progress towards the goal quantity, in the direction of the goal
+    progress_percentage = None
+    if goal and weight_change and goal.quantity:
+        if goal.action == "lose":
+            progress_percentage = min(100, max(0, (-weight_change / goal.quantity) * 100))
+        elif goal.action == "gain":
+            progress_percentage = min(100, max(0, (weight_change / goal.quantity) * 100))
+
+    return ProgressSummary(
+        total_updates=aggregates.count,
+        weight_change=weight_change,
+        workouts_completed_total=aggregates.workouts_total,
+        meals_followed_total=aggregates.meals_total,
+        average_mood=average_mood,
+        average_sleep=average_sleep,
+        progress_percentage=progress_percentage
+    )
+
+
 def calculate_progress_summary(
     progress_logs: List[ProgressUpdate], 
     goal: Optional[Goal] = None
 ) -> ProgressSummary:
     """
-    Calculate progress summary from accumulated progress logs.
+    Calculate progress summary from the full progress logs (reference for the running aggregates).
     
     Args:
         progress_logs: List of progress update dictionaries
@@ -91,42 +169,4 @@ def calculate_progress_summary(
         ProgressSummary: Calculated progress metrics
     """
     
-    if not progress_logs:
-        return ProgressSummary(
-            total_updates=0,
-            workouts_completed_total=0,
-            meals_followed_total=0
-        )
-    
-    # Extract numeric values
-    weights = [log.weight for log in progress_logs if log.weight is not None]
-    workouts = [log.workouts_completed for log in progress_logs if log.workouts_completed is not None]
-    meals = [log.meals_followed for log in progress_logs if log.meals_followed is not None]
-    sleep_hours = [log.sleep_hours for log in progress_logs if log.sleep_hours is not None]
-
-    
-    # Calculate weight change
-    weight_change = None
-    if len(weights) >= 2:
-        weight_change = weights[-1] - weights[0]
-    
-    # Calculate averages
-    average_sleep = sum(sleep_hours) / len(sleep_hours) if sleep_hours else None
-    
-    # Calculate progress percentage based on goal
-    progress_percentage = None
-    if goal and weights:
-        if goal.action == "lose" and weight_change:
-            progress_percentage = min(100, max(0, (weight_change / goal.quantity) * 100))
-        elif goal.action == "gain" and weight_change:
-            progress_percentage = min(100, max(0, (weight_change / goal.quantity) * 100))
-    
-    return ProgressSummary(
-        total_updates=len(progress_logs),
-        weight_change=weight_change,
-        workouts_completed_total=sum(workouts),
-        meals_followed_total=sum(meals),
-        average_sleep=average_sleep,
-        progress_percentage=progress_percentage
-    )
-
+    return summarize_progress(aggregate_progress(progress_logs), goal)
@@ -0,0 +1,342 @@
+"""
+Deterministic workout plan engine.
+
+Assembles a `WorkoutPlan` from an exercise catalog indexed by muscle group,
+equipment and contraindicated body part, using weekly templates per experience
+level and set/rep schemes per goal. Returns None for profiles it cannot cover
+safely (severe injuries, unknown body parts or restrictions) so the caller can
+fall back to the workout recommender agent.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Literal, Optional, Set, Tuple
+
+from src.context import Goal, InjuryNote, WorkoutPlan
+
+
+Experience = Literal["beginner", "intermediate", "advance"]
+
+
+@dataclass(frozen=True, slots=True)
+class Exercise:
+    name: str
+    muscle_groups: Tuple[str, ...]
+    equipment: str
+    contraindicated: Tuple[str, ...]
+    tags: Tuple[str, ...] = ()
+    kind: Literal["strength", "cardio", "mobility"] = "strength"
+    min_level: int = 0  # 0 beginner, 1 intermediate, 2 advance
+    timed: bool = False  # Isometric holds are prescribed in seconds, not reps
+
+
+EXERCISE_CATALOG: Tuple[Exercise, ...] = (
+    # Legs
+    Exercise("Bodyweight Squat", ("legs", "glutes"), "bodyweight", ("knee",)),
+    Exercise("Goblet Squat", ("legs", "glutes"), "dumbbell", ("knee", "back")),
+    Exercise("Barbell Back Squat", ("legs", "glutes"), "barbell", ("knee", "back", "shoulder"), ("heavy",), min_level=1),
+    Exercise("Glute Bridge", ("glutes", "legs"), "bodyweight", ()),
+    Exercise("Romanian Deadlift", ("hamstrings", "glutes"), "dumbbell", ("back",), ("heavy",)),
+    Exercise("Walking Lunges", ("legs", "glutes"), "bodyweight", ("knee", "ankle")),
+    Exercise("Step-ups", ("legs", "glutes"), "bench", ("knee", "ankle")),
+    Exercise("Leg Press", ("legs", "glutes"), "machine", ("knee",)),
+    Exercise("Seated Leg Curl", ("hamstrings",), "machine", ()),
+    Exercise("Calf Raises", ("calves",), "bodyweight", ("ankle",)),
+    Exercise("Wall Sit", ("legs",), "bodyweight", ("knee",), timed=True),
+    Exercise("Side-lying Leg Raise", ("glutes",), "bodyweight", ("hip",)),
+    # Push
+    Exercise("Push-ups", ("chest", "triceps", "shoulders"), "bodyweight", ("wrist", "shoulder")),
+    Exercise("Incline Push-ups", ("chest", "triceps"), "bench", ("wrist",)),
+    Exercise("Dumbbell Bench Press", ("chest", "triceps"), "dumbbell", ("shoulder", "elbow")),
+    Exercise("Barbell Bench Press", ("chest", "triceps"), "barbell", ("shoulder", "elbow", "wrist"), ("heavy",), min_level=1),
+    Exercise("Seated Dumbbell Shoulder Press", ("shoulders", "triceps"), "dumbbell", ("shoulder", "elbow", "neck"), ("overhead",)),
+    Exercise("Lateral Raises", ("shoulders",), "dumbbell", ("shoulder",)),
+    Exercise("Chest Press Machine", ("chest", "triceps"), "machine", ("shoulder",)),
+    Exercise("Triceps Dips", ("triceps", "chest"), "bench", ("shoulder", "wrist", "elbow"), min_level=1),
+    # Pull
+    Exercise("Dumbbell Row", ("back", "biceps"), "dumbbell", ("back", "elbow")),
+    Exercise("Seated Cable Row", ("back", "biceps"), "machine", ("elbow",)),
+    Exercise("Lat Pulldown", ("back", "biceps"), "machine", ("shoulder", "elbow")),
+    Exercise("Pull-ups", ("back", "biceps"), "bar", ("shoulder", "elbow", "wrist"), ("overhead",), min_level=1),
+    Exercise("Band Pull-aparts", ("back", "shoulders"), "band", ()),
+    Exercise("Face Pulls", ("shoulders", "back"), "machine", ("elbow",)),
+    Exercise("Dumbbell Biceps Curl", ("biceps",), "dumbbell", ("elbow", "wrist")),
+    Exercise("Deadlift", ("back", "hamstrings", "glutes"), "barbell", ("back", "knee", "hip"), ("heavy",), min_level=2),
+    # Core
+    Exercise("Plank", ("core",), "bodyweight", ("wrist", "shoulder"), timed=True),
+    Exercise("Dead Bug", ("core",), "bodyweight", ()),
+    Exercise("Bird Dog", ("core", "back"), "bodyweight", ("wrist",)),
+    Exercise("Side Plank", ("core",), "bodyweight", ("shoulder",), timed=True),
+    Exercise("Hanging Knee Raise", ("core",), "bar", ("shoulder", "wrist"), min_level=1),
+    Exercise("Mountain Climbers", ("core",), "bodyweight", ("wrist", "shoulder"), ("impact",), min_level=1),
+    # Cardio
+    Exercise("Brisk Walking", ("cardio",), "none", (), kind="cardio"),
+    Exercise("Stationary Cycling", ("cardio",), "machine", (), kind="cardio"),
+    Exercise("Swimming", ("cardio",), "pool", ("shoulder",), kind="cardio"),
+    Exercise("Elliptical Trainer", ("cardio",), "machine", (), kind="cardio"),
+    Exercise("Jogging", ("cardio",), "none", ("knee", "ankle", "hip"), ("impact", "running"), kind="cardio"),
+    Exercise("Rowing Machine", ("cardio",), "machine", ("back",), kind="cardio"),
+    Exercise("Jump Rope", ("cardio",), "rope", ("knee", "ankle"), ("impact", "jumping"), kind="cardio", min_level=1),
+    Exercise("Interval Sprints", ("cardio",), "none", ("knee", "ankle", "hip", "hamstrings"), ("impact", "running"), kind="cardio", min_level=2),
+    # Mobility
+    Exercise("Full-body Stretching", ("mobility",), "none", (), kind="mobility"),
+    Exercise("Yoga Flow", ("mobility",), "mat", ("wrist",), kind="mobility"),
+    Exercise("Foam Rolling", ("mobility",), "foam roller", (), kind="mobility"),
+)
+
+
+# Indexes over the catalog
+EXERCISES_BY_MUSCLE: Dict[str, List[Exercise]] = {}
+EXERCISES_BY_EQUIPMENT: Dict[str, List[Exercise]] = {}
+EXERCISES_BY_CONTRAINDICATION: Dict[str, List[Exercise]] = {}
+
+for _exercise in EXERCISE_CATALOG:
+    for _muscle in _exercise.muscle_groups:
+        EXERCISES_BY_MUSCLE.setdefault(_muscle, []).append(_exercise)
+    EXERCISES_BY_EQUIPMENT.setdefault(_exercise.equipment, []).append(_exercise)
+    for _part in _exercise.contraindicated:
+        EXERCISES_BY_CONTRAINDICATION.setdefault(_part, []).append(_exercise)
+
+
+# Map free-text body parts to the catalog's contraindication vocabulary
+BODY_PART_ALIASES: Dict[str, str] = {
+    "knee": "knee", "knees": "knee", "acl": "knee", "meniscus": "knee", "patella": "knee",
+    "ankle": "ankle", "ankles": "ankle", "achilles": "ankle", "foot": "ankle", "feet": "ankle",
+    "hip": "hip", "hips": "hip",
+    "back": "back", "lower back": "back", "upper back": "back", "spine": "back", "lumbar": "back",
+    "shoulder": "shoulder", "shoulders": "shoulder", "rotator cuff": "shoulder",
+    "elbow": "elbow", "elbows": "elbow", "tennis elbow": "elbow",
+    "wrist": "wrist", "wrists": "wrist", "hand": "wrist", "hands": "wrist",
+    "neck": "neck",
+    "hamstring": "hamstrings", "hamstrings": "hamstrings",
+}
+
+# Map restriction keywords to exercise tags
+RESTRICTION_TAGS: Dict[str, str] = {
+    "jump": "jumping", "jumping": "jumping",
+    "impact": "impact", "high impact": "impact", "high-impact": "impact",
+    "run": "running", "running": "running", "sprint": "running", "sprinting": "running",
+    "overhead": "overhead", "over head": "overhead",
+    "heavy": "heavy", "heavy lifting": "heavy", "heavy weights": "heavy",
+}
+
+# Restriction phrases that only restate the injury and don't need a tag
+_NEUTRAL_RESTRICTION_WORDS = {"avoid", "no", "not", "any", "exercises", "exercise", "movements", "that", "the", "strain", "stress", "on", "load", "loading", "pressure"}
+
+LEVELS: Dict[str, int] = {"beginner": 0, "intermediate": 1, "advance": 2}
+
+# Weekly templates: day -> movement slots. "cardio"/"mobility" slots pick by kind.
+WEEKLY_TEMPLATES: Dict[str, Dict[str, List[str]]] = {
+    "beginner": {
+        "Monday": ["legs", "chest", "back", "core"],
+        "Tuesday": ["cardio", "mobility"],
+        "Wednesday": ["glutes", "shoulders", "back", "core"],
+        "Thursday": ["mobility"],
+        "Friday": ["legs", "chest", "back", "core"],
+        "Saturday": ["cardio"],
+        "Sunday": [],
+    },
+    "intermediate": {
+        "Monday": ["chest", "back", "shoulders", "biceps", "triceps"],
+        "Tuesday": ["legs", "hamstrings", "glutes", "calves", "core"],
+        "Wednesday": ["cardio", "mobility"],
+        "Thursday": ["back", "chest", "shoulders", "triceps", "biceps"],
+        "Friday": ["legs", "glutes", "hamstrings", "core"],
+        "Saturday": ["cardio"],
+        "Sunday": [],
+    },
+    "advance": {
+        "Monday": ["chest", "shoulders", "triceps", "chest", "core"],
+        "Tuesday": ["back", "back", "biceps", "shoulders", "core"],
+        "Wednesday": ["legs", "hamstrings", "glutes", "calves"],
+        "Thursday": ["cardio", "mobility"],
+        "Friday": ["chest", "back", "shoulders", "triceps", "biceps"],
+        "Saturday": ["legs", "glutes", "hamstrings", "core", "cardio"],
+        "Sunday": [],
+    },
+}
+
+# (sets, reps) per experience and goal action
+STRENGTH_SCHEMES: Dict[str, Dict[str, Tuple[int, str]]] = {
+    "beginner": {"lose": (2, "12-15"), "gain": (3, "8-10"), "maintain": (2, "10-12")},
+    "intermediate": {"lose": (3, "12-15"), "gain": (4, "6-10"), "maintain": (3, "10-12")},
+    "advance": {"lose": (4, "12-15"), "gain": (5, "5-8"), "maintain": (3, "8-12")},
+}
+
+# Cardio minutes per experience and goal action
+CARDIO_MINUTES: Dict[str, Dict[str, int]] = {
+    "beginner": {"lose": 30, "gain": 15, "maintain": 20},
+    "intermediate": {"lose": 40, "gain": 20, "maintain": 30},
+    "advance": {"lose": 45, "gain": 20, "maintain": 30},
+}
+
+CARDIO_INTENSITY: Dict[str, str] = {"beginner": "easy", "intermediate": "moderate", "advance": "moderate to hard"}
+
+HOLD_SECONDS: Dict[str, str] = {"beginner": "20-30 seconds", "intermediate": "30-45 seconds", "advance": "45-60 seconds"}
+
+# Equipment that is always available
+BASE_EQUIPMENT = frozenset({"bodyweight", "none"})
+
+# Map free-text equipment to the catalog's equipment names
+EQUIPMENT_ALIASES: Dict[str, str] = {
+    "dumbbell": "dumbbell", "dumbbells": "dumbbell", "dumb bell": "dumbbell", "dumb bells": "dumbbell",
+    "barbell": "barbell", "barbells": "barbell", "squat rack": "barbell", "power rack": "barbell",
+    "bench": "bench", "benches": "bench", "weight bench": "bench", "box": "bench", "step": "bench",
+    "machine": "machine", "machines": "machine", "cable": "machine", "cables": "machine",
+    "cable machine": "machine", "leg press": "machine", "stationary bike": "machine", "exercise bike": "machine",
+    "treadmill": "machine", "elliptical": "machine", "rower": "machine", "rowing machine": "machine",
+    "bar": "bar", "pull-up bar": "bar", "pullup bar": "bar", "pull up bar": "bar", "chin-up bar": "bar", "chinup bar": "bar",
+    "band": "band", "bands": "band", "resistance band": "band", "resistance bands": "band",
+    "pool": "pool", "swimming pool": "pool",
+    "rope": "rope", "jump rope": "rope", "skipping rope": "rope",
+    "mat": "mat", "mats": "mat", "yoga mat": "mat", "exercise mat": "mat",
+    "foam roller": "foam roller", "foam rollers": "foam roller", "roller": "foam roller",
+    "bodyweight": "bodyweight", "body weight": "bodyweight", "none": "none", "no equipment": "none",
+}
+
+# Phrases meaning every piece of catalog equipment is at hand
+FULL_GYM_PHRASES: Dict[str, str] = {"full gym": "gym", "gym access": "gym", "gym membership": "gym", "commercial gym": "gym"}
+
+
+def _match_aliases(text: str, aliases: Dict[str, str]) -> Set[str]:
+    text = text.lower()
+    return {value for phrase, value in aliases.items() if re.search(rf"\b{re.escape(phrase)}\b", text)}
+
+
+def resolve_injury_restrictions(injury_notes: List[InjuryNote]) -> Optional[Tuple[FrozenSet[str], FrozenSet[str]]]:
+    """
+    Translate injury notes into contraindicated body parts and excluded exercise tags.
+
+    Returns:
+        (body parts, tags), or None if any note is severe or mentions a body part or
+        restriction the catalog has no vocabulary for.
+    """
+
+    body_parts: Set[str] = set()
+    tags: Set[str] = set()
+
+    for note in injury_notes:
+        if note.severity_level.strip().lower() == "severe":
+            return None
+
+        for part in note.affected_body_parts:
+            matched = _match_aliases(part, BODY_PART_ALIASES)
+            if not matched:
+                return None
+            body_parts |= matched
+
+        for restriction in note.restrictions:
+            matched_tags = _match_aliases(restriction, RESTRICTION_TAGS)
+            matched_parts = _match_aliases(restriction, BODY_PART_ALIASES)
+            if not matched_tags and not matched_parts:
+                words = set(re.findall(r"[a-z]+", restriction.lower()))
+                if not words or not words <= _NEUTRAL_RESTRICTION_WORDS:
+                    return None
+            tags |= matched_tags
+            body_parts |= matched_parts
+
+    return frozenset(body_parts), frozenset(tags)
+
+
+def normalize_equipment(equipment: List[str]) -> FrozenSet[str]:
+    """Catalog equipment names for free-text items ("Dumbbells", "pull-up bar"); unknown items are dropped."""
+
+    names: Set[str] = set()
+    for item in equipment:
+        if _match_aliases(item, FULL_GYM_PHRASES):
+            return frozenset(EXERCISES_BY_EQUIPMENT)
+        names |= _match_aliases(item, EQUIPMENT_ALIASES)
+    return frozenset(names)
+
+
+def _excluded_exercises(body_parts: FrozenSet[str], equipment: Optional[FrozenSet[str]]) -> Set[str]:
+    excluded = {exercise.name for part in body_parts for exercise in EXERCISES_BY_CONTRAINDICATION.get(part, [])}
+    if equipment is not None:
+        allowed = equipment | BASE_EQUIPMENT
+        excluded |= {
+            exercise.name
+            for name, exercises in EXERCISES_BY_EQUIPMENT.items() if name not in allowed
+            for exercise in exercises
+        }
+    return excluded
+
+
+def _candidates(slot: str, level: int, excluded: Set[str], tags: FrozenSet[str]) -> List[Exercise]:
+    # Cardio and mobility are indexed as their own "muscle groups"
+    return [
+        exercise
+        for exercise in EXERCISES_BY_MUSCLE.get(slot, [])
+        if exercise.min_level <= level
+        and exercise.name not in excluded
+        and not tags.intersection(exercise.tags)
+        and (exercise.kind == "strength" or slot in ("cardio", "mobility"))
+    ]
+
+
+def build_workout_plan(
+    experience: Experience,
+    goal: Optional[Goal],
+    injury_notes: List[InjuryNote],
+    equipment: Optional[List[str]] = None,
+) -> Optional[WorkoutPlan]:
+    """
+    Assemble a weekly workout plan from the exercise catalog.
+
+    Args:
+        experience: The user's workout experience level
+        goal: The user's fitness goal, used to choose set/rep and cardio schemes
+        injury_notes: Injuries whose affected body parts and restrictions are excluded
+        equipment: Available equipment (bodyweight is always assumed), None for a full gym
+
+    Returns:
+        WorkoutPlan, or None if the profile needs the workout recommender agent
+    """
+
+    if experience not in WEEKLY_TEMPLATES:
+        return None
+
+    restrictions = resolve_injury_restrictions(injury_notes)
+    if restrictions is None:
+        return None
+    body_parts, tags = restrictions
+    excluded = _excluded_exercises(body_parts, normalize_equipment(equipment) if equipment is not None else None)
+
+    level = LEVELS[experience]
+    action = goal.action if goal else "maintain"
+    sets, reps = STRENGTH_SCHEMES[experience][action]
+    cardio_minutes = CARDIO_MINUTES[experience][action]
+
+    days: Dict[str, List[Dict[str, object]]] = {}
+    # Prefer the least used candidate so repeated slots across the week vary
+    usage: Dict[str, int] = {}
+
+    for day, slots in WEEKLY_TEMPLATES[experience].items():
+        used: Set[str] = set()
+        exercises: List[Dict[str, object]] = []
+
+        for slot in slots:
+            candidates = [exercise for exercise in _candidates(slot, level, excluded, tags) if exercise.name not in used]
+            if not candidates:
+                # Every option for this slot is contraindicated, let the agent handle it
+                return None
+
+            exercise = min(candidates, key=lambda candidate: usage.get(candidate.name, 0))
+            usage[exercise.name] = usage.get(exercise.name, 0) + 1
+            used.add(exercise.name)
+
+            if exercise.kind == "cardio":
+                exercises.append({
+                    "exercise": exercise.name,
+                    "duration": f"{cardio_minutes} minutes",
+                    "intensity": CARDIO_INTENSITY[experience],
+                })
+            elif exercise.kind == "mobility":
+                exercises.append({"exercise": exercise.name, "duration": "15 minutes", "intensity": "easy"})
+            elif exercise.timed:
+                exercises.append({"exercise": exercise.name, "sets": sets, "duration": HOLD_SECONDS[experience]})
+            else:
+                exercises.append({"exercise": exercise.name, "sets": sets, "reps": reps})
+
+        days[day] = exercises or [{"exercise": "Rest", "notes": "Active recovery or complete rest"}]
+
+    return WorkoutPlan(days=days)
@@ -1,7 +1,9 @@
-from typing import Literal
+from typing import List, Literal, Optional
 from agents import Agent, RunContextWrapper, Runner, function_tool
 
 from src.context import UserSessionContext, WorkoutPlan
+from src.tools.plan_cache import workout_plan_cache, workout_plan_fingerprint
+from src.tools.workout_engine import build_workout_plan
 
 
 workout_recommender_agent = Agent(
@@ -24,12 +26,19 @@ workout_recommender_agent = Agent(
 async def workout_recommender(
     ctx: RunContextWrapper[UserSessionContext],
     experience: Literal["beginner", "intermediate", "advance"],
+    equipment: Optional[List[str]] = None,
+    personalization_notes: Optional[str] = None,
 ) -> WorkoutPlan:
 
     """
     Generates a personalized weekly workout plan for a user based on their experience level, goals, dietary preferences, and injury notes.
+    Standard profiles are planned instantly from the exercise catalog; the AI planner is only used for
+    personalization requests or profiles the catalog can't cover safely.
     Args:
         experience (Literal["beginner", "intermediate", "advance"]): The user's workout experience level.
+        equipment (Optional[List[str]]): Available equipment, e.g. ["dumbbell", "bench"]. Omit for a full gym.
+        personalization_notes (Optional[str]): Specific user requests the plan must follow (favourite sports,
+            schedule constraints, ...). Only pass this when the user asked for something specific.
     Returns:
         WorkoutPlan: A structured workout plan mapping days of the week to lists of exercises, including sets and reps, tailored to the user's profile and restrictions.
     Raises:
@@ -37,6 +46,24 @@ async def workout_recommender(
     """
 
     user = ctx.context
+    
+    # Standard profiles are assembled locally without a model call
+    if not personalization_notes:
+        workout_plan = build_workout_plan(experience, user.goal, user.injury_notes, equipment)
+        if workout_plan is not None:
+            ctx.context.workout_plan = workout_plan
+            return workout_plan
+    
+    # Same profile, same plan: serve model-generated plans from the cache
+    cache_key = workout_plan_fingerprint(
+        experience, user.goal, user.diet_preferences, user.injury_notes, equipment, personalization_notes
+    )
+    cached_plan = workout_plan_cache.get(cache_key)
+    if cached_plan is not None:
+        workout_plan = WorkoutPlan.model_validate(cached_plan)
+        ctx.context.workout_plan = workout_plan
+        return workout_plan
+    
     prompt = f"""
         Create a personalized weekly workout plan for the following user:  
         Name: {user.name}  
@@ -44,6 +71,8 @@ async def workout_recommender(
         Goal: {user.goal}  
         Diet preferences: {user.diet_preferences}  
         Injury notes: {user.injury_notes}  
+        Available equipment: {equipment or 'Full gym'}  
+        Personalization notes: {personalization_notes or 'None'}  
         Please provide a workout plan as a dictionary mapping days of the week to a list of exercises, 
         including sets and reps for each exercise. Ensure the plan is safe and aligns with the user's goals and restrictions.
     """
@@ -63,6 +92,7 @@ async def workout_recommender(
         workout_plan = result.final_output_as(WorkoutPlan)
         print(f"Generated workout plan: {workout_plan}")
         ctx.context.workout_plan = workout_plan
+        workout_plan_cache.set(cache_key, workout_plan.model_dump())
         
         print("Workout plan saved to context successfully")
         return workout_plan
@@ -0,0 +1,248 @@
+"""
+Pooled HTTP transport for the shared OpenAI-compatible client.
+
+Builds the httpx client with configurable pool limits, keep-alive expiry,
+optional HTTP/2 and per-phase timeouts, and instruments the connection pool
+through the httpcore `trace` extension: how long each request waited for a
+connection, whether it opened a new one (and the TLS handshake time), and how
+many requests were in flight against the pool.
+"""
+
+import asyncio
+import importlib.util
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from src.admission import AdmissionTransport, FairAdmissionController
+
+
+# Trace events that mark the point a request got hold of a connection
+_CONNECTION_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+# A request counts as having waited for the pool beyond this
+POOL_WAIT_THRESHOLD_SECONDS = 0.001
+
+
+@dataclass
+class TransportStats:
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    pool_wait_seconds: float = 0.0
+    max_pool_wait_seconds: float = 0.0
+    tls_handshake_seconds: float = 0.0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    waiting: int = 0
+    """Requests queued in the pool for a free connection."""
+    peak_waiting: int = 0
+    waited_requests: int = 0
+    max_connections: int = 0
+    warmed_connections: int = 0
+
+
+    @property
+    def saturation(self) -> float:
+        """Share of the pool's connection limit currently in use."""
+        if not self.max_connections:
+            return 0.0
+        return min(self.in_flight - self.waiting, self.max_connections) / self.max_connections
+
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "avg_pool_wait_ms": round(self.pool_wait_seconds / self.requests * 1000, 3) if self.requests else 0.0,
+            "max_pool_wait_ms": round(self.max_pool_wait_seconds * 1000, 3),
+            "avg_tls_handshake_ms": round(self.tls_handshake_seconds / self.new_connections * 1000, 3) if self.new_connections else 0.0,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": round(self.saturation, 4),
+            "peak_saturation": round(min(self.peak_in_flight, self.max_connections) / self.max_connections, 4) if self.max_connections else 0.0,
+            "waiting_for_connection": self.waiting,
+            "peak_waiting_for_connection": self.peak_waiting,
+            "waited_requests": self.waited_requests,
+            "warmed_connections": self.warmed_connections,
+        }
+
+
+transport_stats = TransportStats()
+
+
+class _InFlightStream(httpx.AsyncByteStream):
+    """Response body that counts its request as in flight until it is consumed or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, done):
+        self._stream = stream
+        self._done = done
+
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._done()
+
+
+class PoolMetricsTransport(httpx.AsyncBaseTransport):
+    """Records connection pool wait, reuse and saturation for every request."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: TransportStats = transport_stats):
+        self._transport = transport
+        self._stats = stats
+
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        outer_trace = request.extensions.get("trace")
+        acquired = False
+        finished = False
+
+        def acquire():
+            nonlocal acquired
+            acquired = True
+            stats.waiting -= 1
+
+        def finish():
+            # The connection stays busy until the (possibly streamed) body is closed
+            nonlocal finished
+            if not finished:
+                finished = True
+                stats.in_flight -= 1
+
+        async def trace(event: str, info: Dict[str, Any]):
+            if event not in timings:
+                timings[event] = time.perf_counter()
+                if event in _CONNECTION_ACQUIRED_EVENTS and not acquired:
+                    acquire()
+            if outer_trace is not None:
+                await outer_trace(event, info)
+
+        request.extensions["trace"] = trace
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        stats.waiting += 1
+        stats.peak_waiting = max(stats.peak_waiting, stats.waiting)
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            finish()
+            raise
+        else:
+            if response.is_closed:
+                # Body already read in full (e.g. a prebuilt response)
+                finish()
+            else:
+                response.stream = _InFlightStream(response.stream, finish)
+            return response
+        finally:
+            if not acquired:
+                acquire()
+
+            if "connection.connect_tcp.started" in timings:
+                stats.new_connections += 1
+                if "connection.start_tls.started" in timings and "connection.start_tls.complete" in timings:
+                    stats.tls_handshake_seconds += timings["connection.start_tls.complete"] - timings["connection.start_tls.started"]
+            else:
+                stats.reused_connections += 1
+
+            # Time until the request started connecting or sending is the wait for a free connection
+            acquired_at = min((timings[event] for event in _CONNECTION_ACQUIRED_EVENTS if event in timings), default=started)
+            waited = acquired_at - started
+            stats.pool_wait_seconds += waited
+            stats.max_pool_wait_seconds = max(stats.max_pool_wait_seconds, waited)
+            if waited > POOL_WAIT_THRESHOLD_SECONDS:
+                stats.waited_requests += 1
+
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(
+    admission_controller: FairAdmissionController,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+    http2: bool,
+    connect_timeout: float,
+    read_timeout: float,
+    write_timeout: float,
+    pool_timeout: float,
+) -> httpx.AsyncClient:
+    """httpx client for the OpenAI SDK: admission control over an instrumented connection pool."""
+
+    if http2 and not http2_available():
+        warnings.warn("HTTP_HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1.")
+        http2 = False
+
+    transport_stats.max_connections = max_connections
+    pool = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        http2=http2,
+    )
+
+    return DefaultAsyncHttpxClient(
+        transport=AdmissionTransport(PoolMetricsTransport(pool), admission_controller),
+        timeout=httpx.Timeout(connect=connect_timeout, read=read_timeout, write=write_timeout, pool=pool_timeout),
+    )
+
+
+_warm_up_task: Optional["asyncio.Task[int]"] = None
+
+
+async def warm_up_connections(client: AsyncOpenAI, connections: int, timeout: float = 10.0) -> int:
+    """
+    Open `connections` pooled connections ahead of the first turn with cheap concurrent
+    `GET /models` requests, so user requests don't pay TCP and TLS handshakes.
+
+    Safe to call from several entry points; the warm-up only runs once per process.
+    Returns the number of requests that succeeded.
+    """
+
+    global _warm_up_task
+    if _warm_up_task is None:
+        _warm_up_task = asyncio.ensure_future(_warm_up(client, connections, timeout))
+    return await asyncio.shield(_warm_up_task)
+
+
+async def _warm_up(client: AsyncOpenAI, connections: int, timeout: float) -> int:
+    if connections <= 0:
+        return 0
+
+    warm_client = client.with_options(max_retries=0, timeout=timeout)
+    results = await asyncio.gather(
+        *(warm_client.models.list() for _ in range(connections)),
+        return_exceptions=True,
+    )
+    warmed = sum(not isinstance(result, BaseException) for result in results)
+    transport_stats.warmed_connections += warmed
+    return warmed
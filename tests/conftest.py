@@ -0,0 +1,16 @@
+"""
+Shared test setup.
+
+`src.config` reads the environment when it is first imported, so the settings
+the tests rely on are set here, before any test module imports `src`: no real
+credentials, no session database and no console telemetry.
+"""
+
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("LOGFIRE_TOKEN", "test")
+os.environ.setdefault("LOGFIRE_SEND_TO_LOGFIRE", "false")
+os.environ.setdefault("LOGFIRE_CONSOLE", "false")
+os.environ.setdefault("TELEMETRY_CONSOLE", "false")
+os.environ.setdefault("SESSION_STORE_ENABLED", "false")
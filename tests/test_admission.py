@@ -0,0 +1,144 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.admission import AdmissionTransport, FairAdmissionController, current_uid
+
+
+def test_queued_calls_are_granted_round_robin_across_users():
+    async def scenario():
+        controller = FairAdmissionController(max_concurrency=1, max_queue=10)
+        await controller.acquire("holder")
+        granted = []
+
+        async def call(uid):
+            await controller.acquire(uid)
+            granted.append(uid)
+
+        # One user queues three calls before another user queues one
+        tasks = [asyncio.create_task(call(uid)) for uid in ("heavy", "heavy", "heavy", "light")]
+        await asyncio.sleep(0)
+        assert controller.waiting == 4
+
+        for _ in tasks:
+            controller.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return controller, granted
+
+    controller, granted = asyncio.run(scenario())
+
+    assert granted == ["heavy", "light", "heavy", "heavy"]
+    assert controller.active == 1
+    assert controller.waiting == 0
+    assert controller.stats.admitted == 5
+    assert controller.stats.queued == 4
+
+
+def test_cancelled_waiters_leave_the_queue():
+    async def scenario():
+        controller = FairAdmissionController(max_concurrency=1, max_queue=10)
+        await controller.acquire("holder")
+        waiter = asyncio.create_task(controller.acquire("impatient"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return controller
+
+    controller = asyncio.run(scenario())
+
+    assert controller.waiting == 0
+    assert not controller._queues
+    controller.release()
+    assert controller.active == 0
+
+
+def test_saturation_and_retry_hint():
+    async def scenario():
+        controller = FairAdmissionController(max_concurrency=2, max_queue=2)
+        await controller.acquire("a")
+        await controller.acquire("b")
+        assert not controller.saturated
+
+        waiters = [asyncio.create_task(controller.acquire(uid)) for uid in ("c", "d")]
+        await asyncio.sleep(0)
+        saturated, retry_after = controller.saturated, controller.retry_after()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        return controller, saturated, retry_after
+
+    controller, saturated, retry_after = asyncio.run(scenario())
+
+    assert saturated
+    # Three calls ahead at two at a time, one second each
+    assert retry_after == 2
+    controller.record_call(6.0)
+    assert controller._avg_call_seconds == pytest.approx(2.0)
+    controller.reject()
+    assert controller.stats.as_dict()["rejected"] == 1
+
+
+def test_transport_holds_the_slot_until_the_body_is_closed():
+    seen_uids = []
+
+    async def body():
+        yield b"streamed "
+        yield b"body"
+
+    def handler(request):
+        seen_uids.append(current_uid.get())
+        return httpx.Response(200, content=body())
+
+    async def scenario():
+        controller = FairAdmissionController(max_concurrency=1, max_queue=10)
+        transport = AdmissionTransport(httpx.MockTransport(handler), controller)
+        async with httpx.AsyncClient(transport=transport) as client:
+            token = current_uid.set("alice")
+            try:
+                async with client.stream("GET", "https://model.test/v1/chat") as response:
+                    active_while_streaming = controller.active
+                    content = await response.aread()
+            finally:
+                current_uid.reset(token)
+        return controller, active_while_streaming, content
+
+    controller, active_while_streaming, content = asyncio.run(scenario())
+
+    assert content == b"streamed body"
+    assert seen_uids == ["alice"]
+    assert active_while_streaming == 1
+    assert controller.active == 0
+
+
+def test_transport_releases_the_slot_of_a_prebuilt_response():
+    async def scenario():
+        controller = FairAdmissionController(max_concurrency=1, max_queue=10)
+        transport = AdmissionTransport(httpx.MockTransport(lambda request: httpx.Response(200, content=b"{}")), controller)
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://model.test/v1/models")
+        return controller, response
+
+    controller, response = asyncio.run(scenario())
+
+    assert response.content == b"{}"
+    assert controller.active == 0
+
+
+def test_transport_releases_the_slot_when_the_request_fails():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def scenario():
+        controller = FairAdmissionController(max_concurrency=1, max_queue=10)
+        transport = AdmissionTransport(httpx.MockTransport(handler), controller)
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://model.test/v1/chat")
+        return controller
+
+    controller = asyncio.run(scenario())
+
+    assert controller.active == 0
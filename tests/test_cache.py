@@ -0,0 +1,85 @@
+import os
+import time
+
+import pytest
+
+from src.cache import DiskCache, LRUCache
+from src.guardrails.verdict_cache import guardrail_cache_key
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_lru_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUCache(max_size=4, ttl_seconds=10)
+    cache.set("a", 1)
+
+    now[0] += 11
+
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1 and cache.stats.misses == 1
+    assert len(cache) == 0
+
+
+def test_lru_cache_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        LRUCache(max_size=0)
+
+
+def test_disk_cache_round_trips_and_survives_restart(tmp_path):
+    cache = DiskCache(tmp_path, max_entries=4)
+    cache.set("plan", {"days": [1, 2, 3]})
+
+    reopened = DiskCache(tmp_path, max_entries=4)
+
+    assert reopened.get("plan") == {"days": [1, 2, 3]}
+    assert reopened.stats.hits == 1
+
+
+def test_disk_cache_evicts_oldest_files(tmp_path):
+    cache = DiskCache(tmp_path, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".json")]) == 2
+
+
+def test_disk_cache_treats_corrupt_files_as_misses(tmp_path):
+    cache = DiskCache(tmp_path, max_entries=2)
+    cache.set("a", 1)
+    (tmp_path / DiskCache._filename("a")).write_text("{not json")
+
+    assert cache.get("a") is None
+    assert cache.stats.misses == 1
+
+
+def test_guardrail_key_ignores_case_spacing_and_trailing_punctuation():
+    assert guardrail_cache_key("health", "I want to lose weight!") == guardrail_cache_key("health", "  i want  to lose WEIGHT ")
+    assert guardrail_cache_key("health", "hi") == guardrail_cache_key("health", [{"role": "user", "content": "Hi."}])
+    assert guardrail_cache_key("health", "hi") != guardrail_cache_key("nutrition", "hi")
+
+
+def test_guardrail_key_covers_the_whole_conversation():
+    first = [{"role": "user", "content": "I have diabetes"}, {"role": "assistant", "content": "Noted."}, {"role": "user", "content": "yes"}]
+    second = [{"role": "user", "content": "Tell me a joke"}, {"role": "assistant", "content": "Sure."}, {"role": "user", "content": "yes"}]
+
+    assert guardrail_cache_key("nutrition", first) != guardrail_cache_key("nutrition", second)
+
+
+def test_guardrail_key_is_none_without_text():
+    assert guardrail_cache_key("health", "") is None
+    assert guardrail_cache_key("health", [{"role": "user", "content": "  "}]) is None
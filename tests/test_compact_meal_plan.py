@@ -0,0 +1,64 @@
+from src.context import CompactMealPlan, Meal, MealDay, UserSessionContext
+from src.tools.context_sections import summarize_section
+
+
+def week_of_meals():
+    oats = Meal(name="Oatmeal", calories=350, type="breakfast")
+    salad = Meal(name="Chicken Salad", calories=500, type="lunch")
+    return [
+        MealDay(day=1, meals=[oats, salad, Meal(name="Salmon", calories=600, type="dinner")]),
+        MealDay(day=2, meals=[oats, salad, Meal(name="Lentil Curry", calories=550, type="dinner")]),
+        MealDay(day=3, meals=[oats.model_copy(), salad, Meal(name="Salmon", calories=600, type="dinner")]),
+    ]
+
+
+def test_repeated_meals_are_stored_once():
+    plan = CompactMealPlan.from_days(week_of_meals())
+
+    assert [meal.name for meal in plan.meals] == ["Oatmeal", "Chicken Salad", "Salmon", "Lentil Curry"]
+    assert [day.meals for day in plan.days] == [[0, 1, 2], [0, 1, 3], [0, 1, 2]]
+
+
+def test_round_trip_restores_the_days():
+    days = week_of_meals()
+    plan = CompactMealPlan.from_days(days)
+
+    assert plan.to_days() == days
+    assert CompactMealPlan.model_validate(plan.model_dump()) == plan
+
+
+def test_expanded_days_do_not_share_meals():
+    expanded = CompactMealPlan.from_days(week_of_meals()).to_days()
+
+    expanded[0].meals[0].calories = 400
+
+    assert expanded[1].meals[0].calories == 350
+
+
+def test_meals_differing_in_type_or_calories_stay_distinct():
+    days = [MealDay(day=1, meals=[
+        Meal(name="Yogurt", calories=150, type="breakfast"),
+        Meal(name="Yogurt", calories=150, type="snacks"),
+        Meal(name="Yogurt", calories=200, type="snacks"),
+    ])]
+
+    assert len(CompactMealPlan.from_days(days).meals) == 3
+
+
+def test_sessions_stored_with_a_list_of_days_still_load():
+    legacy = [day.model_dump() for day in week_of_meals()]
+
+    context = UserSessionContext.model_validate({"name": "Alice", "uid": "legacy", "meal_plan": legacy})
+
+    assert context.meal_plan == CompactMealPlan.from_days(week_of_meals())
+    assert context.meal_plan.to_days() == week_of_meals()
+
+
+def test_summary_counts_days_and_distinct_meals():
+    context = UserSessionContext(name="Alice", uid="summary", meal_plan=CompactMealPlan.from_days(week_of_meals()))
+
+    summary = summarize_section(context, "meal_plan")
+
+    assert summary["days"] == 3
+    assert summary["distinct_meals"] == 4
+    assert summary["average_daily_calories"] == round((1450 + 1400 + 1450) / 3)
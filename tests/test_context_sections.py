@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import pytest
+from agents.tool_context import ToolContext
+
+from src.context import InjuryNote, ProgressUpdate, UserSessionContext
+from src.tools.common_tools import read_context_data
+from src.tools.context_sections import section_items, window
+from src.tools.tracker import record_progress
+
+
+def new_context(days: int = 5) -> UserSessionContext:
+    context = UserSessionContext(name="Alice", uid="sections-test")
+    for day in range(1, days + 1):
+        record_progress(context, ProgressUpdate(date=f"2025-01-{day:02d}", weight=80 - day * 0.5, mood="ok"))
+    return context
+
+
+def read(context: UserSessionContext, **arguments) -> dict:
+    return asyncio.run(read_context_data.on_invoke_tool(ToolContext(context=context, tool_call_id="call-1"), json.dumps(arguments)))
+
+
+def test_progress_logs_page_from_the_newest_entry():
+    context = new_context()
+
+    first = read(context, data_type="progress_logs", limit=2, fields=["date"])
+    second = read(context, data_type="progress_logs", limit=2, offset=2, fields=["date"])
+
+    # Pages keep stored order, newest page first
+    assert first["progress_logs"] == [{"date": "2025-01-04"}, {"date": "2025-01-05"}]
+    assert second["progress_logs"] == [{"date": "2025-01-02"}, {"date": "2025-01-03"}]
+    assert first["total"] == 5
+    assert first["message"] == "Retrieved 2 of 5 progress_logs entries"
+
+
+def test_date_window_is_inclusive():
+    context = new_context()
+
+    result = read(context, data_type="progress_logs", start_date="2025-01-02", end_date="2025-01-04", fields=["date", "weight"])
+
+    assert result["progress_logs"] == [
+        {"date": "2025-01-02", "weight": 79.0},
+        {"date": "2025-01-03", "weight": 78.5},
+        {"date": "2025-01-04", "weight": 78.0},
+    ]
+    assert result["total"] == 3
+
+
+def test_other_list_sections_page_from_the_start():
+    items = [{"position": position} for position in range(5)]
+
+    assert window("injury_notes", items, limit=2) == (items[:2], 5)
+    assert window("injury_notes", items, limit=2, offset=4) == (items[4:], 5)
+    assert window("progress_logs", items, limit=10, offset=3) == (items[:2], 5)
+    assert window("progress_logs", items, limit=0) == ([], 5)
+
+
+def test_summaries_describe_instead_of_returning_entries():
+    context = new_context()
+
+    result = read(context, data_type="progress_logs", summary_only=True)
+    summary = result["progress_logs"]
+
+    assert summary["entries"] == 5
+    assert (summary["first_date"], summary["last_date"]) == ("2025-01-01", "2025-01-05")
+    assert "summary" in summary
+
+
+def test_all_summarizes_lists_unless_a_limit_is_given():
+    context = new_context()
+
+    summarized = read(context, data_type="all", fields=["name", "progress_logs"])
+    limited = read(context, data_type="all", fields=["progress_logs"], limit=1)
+
+    assert set(summarized) == {"name", "progress_logs", "message"}
+    assert summarized["name"] == "Alice"
+    assert summarized["progress_logs"]["entries"] == 5
+    assert [entry["date"] for entry in limited["progress_logs"]] == ["2025-01-05"]
+
+
+def test_only_new_list_items_are_dumped_again():
+    context = new_context(days=2)
+    first = section_items(context, "progress_logs")
+
+    record_progress(context, ProgressUpdate(date="2025-01-03", weight=78.5))
+    second = section_items(context, "progress_logs")
+
+    assert second is first
+    assert [entry["date"] for entry in second] == ["2025-01-01", "2025-01-02", "2025-01-03"]
+
+
+def test_reassigned_sections_are_dumped_afresh():
+    context = new_context(days=0)
+    context.injury_notes.append(InjuryNote(injury_description="sore knee", severity_level="mild", affected_body_parts=["knee"], restrictions=[]))
+    assert [note["injury_description"] for note in section_items(context, "injury_notes")] == ["sore knee"]
+
+    context.injury_notes = [InjuryNote(injury_description="tight back", severity_level="mild", affected_body_parts=["back"], restrictions=[])]
+
+    assert [note["injury_description"] for note in section_items(context, "injury_notes")] == ["tight back"]
+
+
+@pytest.mark.parametrize("data_type", ["goal", "meal_plan"])
+def test_unset_fields_read_as_none(data_type):
+    result = read(new_context(days=0), data_type=data_type)
+
+    assert result[data_type] is None
@@ -0,0 +1,59 @@
+import pytest
+
+from src.context import Goal
+from src.tools.goal_parser import parse_goal
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I want to lose 5 kg in 8 weeks", ("lose", 5, "kg", 8, "weeks")),
+    ("My goal is to lose 5 kg in 2 months", ("lose", 5, "kg", 2, "months")),
+    ("gain 10 lbs over 3 months", ("gain", 10, "lbs", 3, "months")),
+    ("drop 4% body fat in 60 days", ("lose", 4, "%", 60, "days")),
+    ("Lose 5kg of weight within two months.", ("lose", 5, "kg", 2, "months")),
+    ("reduce by 3% body fat in 12 weeks", ("lose", 3, "%", 12, "weeks")),
+    ("gain 3 kg of muscle in 6 months", ("gain", 3, "kg", 6, "months")),
+    ("I want to maintain my weight for 3 months", ("maintain", 0, "kg", 3, "months")),
+])
+def test_parses_common_phrasings(text, expected):
+    action, quantity, unit, duration, timeframe_unit = expected
+    assert parse_goal(text) == Goal(
+        action=action, quantity=quantity, unit=unit, duration=duration, timeframe_unit=timeframe_unit,
+    )
+
+
+@pytest.mark.parametrize("text", [
+    # A current weight, not an amount to lose
+    "I weigh 80 kg and want to lose weight in 3 months",
+    "I'm currently 90 kg, I want to lose 5 kg in 2 months",
+    # A target weight
+    "lose weight to 70 kg in 3 months",
+    "get from 80 kg to 75 kg in 10 weeks",
+    # Not body weight
+    "add 50 kg to my deadlift in 6 months",
+    "lower my blood pressure by 10% in 3 months",
+    "keep my blood pressure stable for 3 months",
+    # Implausible amount, rate or duration
+    "lose 200 lbs in 2 weeks",
+    "lose 2 kg in 3 days",
+    "gain 30% body fat in 2 months",
+    "lose 5 kg in 30 months",
+    # Negated
+    "I don't want to lose 5 kg in 8 weeks",
+    "I do not want to gain 3 kg in 2 months",
+    "I never want to lose 5 kg in 8 weeks again",
+    "stop me from gaining 5 kg over 3 months",
+    # Someone else's goal
+    "my friend wants to lose 5 kg in 8 weeks",
+    "My wife wants to lose 5 kg in 8 weeks",
+    "he needs to lose 5 kg in 10 weeks",
+    "we want to lose 5 kg in 8 weeks",
+    "help my son gain 3 kg in 6 months",
+    # Ambiguous or incomplete
+    "lose 5 kg and gain 2 kg in 3 months",
+    "lose 5 kg in 2 months or in 8 weeks",
+    "lose 5 in 2 months",
+    "lose 5 kg",
+    "I want to get fit",
+])
+def test_leaves_other_sentences_to_the_model(text):
+    assert parse_goal(text) is None
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+from datetime import date, timedelta
+
+import pytest
+from agents.tool_context import ToolContext
+
+from src.context import UserSessionContext
+from src.tools import google_calendar
+from src.tools.google_calendar import CalendarClient, CalendarStats, set_calendar_client
+from src.tools.scheduler import CheckinRequest, checkin_scheduler_google, schedule_checkins_google
+
+
+class FakeInsert:
+    def __init__(self, service, body):
+        self.service = service
+        self.body = body
+
+
+    def execute(self):
+        self.service.threads.add(threading.get_ident())
+        if self.body["summary"] in self.service.failing:
+            raise RuntimeError(f"Calendar rejected {self.body['summary']}")
+        self.service.inserted.append(self.body)
+        event_id = f"event-{len(self.service.inserted)}"
+        return {"id": event_id, "htmlLink": f"https://calendar.example/{event_id}"}
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+
+    def execute(self):
+        self.service.batches.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except Exception as error:
+                self.callback(request_id, None, error)
+
+
+class FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+
+    def insert(self, calendarId, body):
+        return FakeInsert(self.service, body)
+
+
+class FakeCalendarService:
+    """Just enough of the Calendar v3 discovery service for inserts and batches."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.inserted = []
+        self.batches = []
+        self.threads = set()
+
+
+    def events(self):
+        return FakeEvents(self)
+
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = FakeCalendarService(failing={"Progress Check-in for Bob"})
+    monkeypatch.setattr(google_calendar, "calendar_stats", CalendarStats())
+    set_calendar_client(CalendarClient(service=service, batch_size=2))
+    yield service
+    set_calendar_client(None)
+
+
+def test_single_insert_through_the_tool(service):
+    context = UserSessionContext(name="alice", uid="calendar-test")
+    arguments = json.dumps({"frequency": "WEEKLY", "start_date": "2025-04-08"})
+
+    confirmation = asyncio.run(checkin_scheduler_google.on_invoke_tool(ToolContext(context=context, tool_call_id="call-1"), arguments))
+
+    assert confirmation.event_id == "event-1"
+    assert confirmation.confirmation_link == "https://calendar.example/event-1"
+    assert confirmation.next_occurrence == date(2025, 4, 15)
+    assert service.inserted[0]["summary"] == "Progress Check-in for Alice"
+    assert service.inserted[0]["recurrence"] == ["RRULE:FREQ=WEEKLY;COUNT=10"]
+    assert google_calendar.calendar_stats.events_inserted == 1
+
+
+def test_batch_reports_each_failure_in_place(service):
+    start = date(2025, 4, 8)
+    requests = [CheckinRequest(name, "DAILY", start) for name in ("alice", "bob", "carol")]
+
+    results = asyncio.run(schedule_checkins_google(requests))
+
+    assert [result.request for result in results] == requests
+    assert results[0].confirmation.event_id == "event-1" and results[0].error is None
+    assert results[1].confirmation is None and "Bob" in results[1].error
+    assert results[2].confirmation.event_id == "event-2"
+    assert results[2].confirmation.next_occurrence == start + timedelta(days=1)
+    # One batch request per batch_size events
+    assert service.batches == [2, 1]
+    stats = google_calendar.calendar_stats
+    assert (stats.batch_requests, stats.events_inserted, stats.failures) == (2, 2, 1)
+
+
+def test_single_insert_failure_is_counted_and_raised(service):
+    client = google_calendar.get_calendar_client()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(client.ainsert_event({"summary": "Progress Check-in for Bob"}))
+
+    assert google_calendar.calendar_stats.failures == 1
+
+
+def test_sync_client_runs_off_the_event_loop(service):
+    client = google_calendar.get_calendar_client()
+
+    async def insert_both():
+        loop_thread = threading.get_ident()
+        await client.ainsert_event({"summary": "Progress Check-in for Alice"})
+        await client.ainsert_events([{"summary": "Progress Check-in for Carol"}])
+        return loop_thread
+
+    loop_thread = asyncio.run(insert_both())
+
+    assert service.threads
+    assert loop_thread not in service.threads
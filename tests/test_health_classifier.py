@@ -0,0 +1,102 @@
+import asyncio
+import importlib
+
+import pytest
+from agents import RunContextWrapper
+
+from src.context import UserSessionContext
+from src.guardrails import health_classifier
+from src.guardrails.health_classifier import FastPathStats, classify_health_query
+from src.guardrails.verdict_cache import guardrail_cache
+
+
+# src.guardrails re-exports the guardrail under the module's name
+health_guardrail = importlib.import_module("src.guardrails.health_guardrail")
+
+
+@pytest.mark.parametrize("text, category", [
+    ("Can you make me a workout plan for the gym?", "fitness"),
+    ("I need a vegan meal plan with 2000 calories", "nutrition"),
+    ("I can't sleep and my stress is through the roof", "wellness"),
+    ("What should I eat with type 2 diabetes and high blood pressure?", "medical"),
+    ("I want to lose 5kg", "general_health"),
+])
+def test_clear_health_queries_are_classified_locally(text, category):
+    verdict, _ = classify_health_query(text)
+
+    assert verdict.is_health_related and verdict.query_category == category
+
+
+def test_clear_off_topic_queries_are_classified_locally():
+    verdict, _ = classify_health_query("Write a python function to parse SQL for my bitcoin tracker")
+
+    assert not verdict.is_health_related
+    assert verdict.query_category == "not_health_related" and verdict.confidence_score > 0.8
+
+
+@pytest.mark.parametrize("text", [
+    "hi",
+    "what do you think?",
+    # Off-topic terms alongside health terms need the model
+    "Should I invest in stocks or a gym membership?",
+    # Weak off-topic evidence must not trip the wire locally
+    "what a movie",
+])
+def test_ambiguous_queries_fall_back_to_the_model(text):
+    verdict, _ = classify_health_query(text)
+
+    assert verdict is None
+
+
+class FakeResult:
+    def __init__(self, output):
+        self.output = output
+
+
+    def final_output_as(self, output_type):
+        return self.output
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+
+    async def run(agent, input, context):
+        calls.append(input)
+        return FakeResult(health_guardrail.HealthQueryValidation(
+            is_health_related=True, query_category="general_health", confidence_score=0.9, reasoning="model",
+        ))
+
+    monkeypatch.setattr(health_guardrail.Runner, "run", run)
+    monkeypatch.setattr(health_classifier, "fast_path_stats", FastPathStats())
+    guardrail_cache.clear()
+    yield calls
+    guardrail_cache.clear()
+
+
+def check(text: str):
+    context = RunContextWrapper(context=UserSessionContext(name="Test", uid="classifier-test"))
+    return asyncio.run(health_guardrail.health_input_guardrail.guardrail_function(context, None, text))
+
+
+def test_guardrail_skips_the_model_on_the_fast_path(model_calls):
+    output = check("Give me a workout plan for building muscle")
+
+    assert model_calls == []
+    assert not output.tripwire_triggered
+    assert health_classifier.fast_path_stats.short_circuited == 1
+
+
+def test_guardrail_trips_on_a_local_off_topic_verdict(model_calls):
+    output = check("What are the lyrics of the song about bitcoin and crypto?")
+
+    assert model_calls == []
+    assert output.tripwire_triggered
+
+
+def test_guardrail_asks_the_model_when_the_classifier_abstains(model_calls):
+    output = check("hello there")
+
+    assert model_calls == ["hello there"]
+    assert not output.tripwire_triggered
+    assert health_classifier.fast_path_stats.llm_fallbacks == 1
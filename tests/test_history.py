@@ -0,0 +1,127 @@
+import asyncio
+import importlib
+
+import pytest
+
+from src.history import CHARS_PER_TOKEN, FALLBACK_SUMMARY_SHARE, ConversationHistory
+
+
+history_module = importlib.import_module("src.history")
+
+
+class FakeResult:
+    def __init__(self, final_output):
+        self.final_output = final_output
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    prompts = []
+
+    async def run(agent, prompt):
+        prompts.append(prompt)
+        return FakeResult("- wants to lose 5 kg")
+
+    monkeypatch.setattr(history_module.Runner, "run", run)
+    return prompts
+
+
+def reply(text: str):
+    return [{"role": "assistant", "content": text}]
+
+
+def filled_history(turns: int, budget: int = 200, keep_recent_turns: int = 2) -> ConversationHistory:
+    history = ConversationHistory(token_budget=budget, keep_recent_turns=keep_recent_turns)
+    for index in range(turns):
+        history.record_turn(f"question {index} " + "x" * 80, reply(f"answer {index} " + "y" * 80))
+    return history
+
+
+def test_input_is_summary_then_turns_then_prompt():
+    history = ConversationHistory(token_budget=1000)
+    history.summary = "- vegan"
+    history.record_turn("hi", reply("hello"))
+
+    items = history.build_input("plan my meals")
+
+    assert items[0]["role"] == "system" and "- vegan" in items[0]["content"]
+    assert items[1:] == [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}, {"role": "user", "content": "plan my meals"}]
+    assert history.stats.last_request_tokens == history.tokens + 4
+
+
+def test_no_compaction_within_budget(summarizer):
+    history = filled_history(2, budget=10_000)
+
+    asyncio.run(history.compact_if_needed())
+
+    assert summarizer == [] and len(history.turns) == 2
+
+
+def test_compaction_folds_the_oldest_turns_into_the_summary(summarizer):
+    history = filled_history(8)
+    assert history.tokens > history.token_budget
+
+    asyncio.run(history.compact_if_needed())
+
+    assert history.summary == "- wants to lose 5 kg"
+    assert history.tokens <= history.token_budget
+    assert len(history.turns) >= history.keep_recent_turns
+    assert history.turns[-1].items[0]["content"].startswith("question 7")
+    assert "question 0" in summarizer[0] and "question 7" not in summarizer[0]
+    assert history.stats.compacted_turns == 8 - len(history.turns) and history.stats.compactions == 1
+
+
+def test_recent_turns_are_kept_even_over_budget(summarizer):
+    history = filled_history(3, budget=50, keep_recent_turns=3)
+
+    asyncio.run(history.compact_if_needed())
+
+    assert summarizer == [] and len(history.turns) == 3
+
+
+def test_background_compaction_keeps_turns_recorded_meanwhile(monkeypatch):
+    async def scenario():
+        started, done = asyncio.Event(), asyncio.Event()
+
+        async def run(agent, prompt):
+            started.set()
+            await done.wait()
+            return FakeResult("summary")
+
+        monkeypatch.setattr(history_module.Runner, "run", run)
+        history = filled_history(8)
+        history.schedule_compaction()
+        first = history._compaction
+        await started.wait()
+
+        # A second turn finishes while the summarizer is still running
+        history.record_turn("late question", reply("late answer"))
+        history.schedule_compaction()
+        assert history._compaction is first
+
+        done.set()
+        await history.wait_for_compaction()
+        return history
+
+    history = asyncio.run(scenario())
+
+    assert history.summary == "summary"
+    assert history.turns[-1].items[0]["content"] == "late question"
+    assert history.stats.compactions == 1
+
+
+def test_failed_summarizer_keeps_the_latest_user_lines_within_a_cap(monkeypatch):
+    async def run(agent, prompt):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(history_module.Runner, "run", run)
+    history = filled_history(8)
+
+    asyncio.run(history.compact_if_needed())
+
+    assert history.stats.summarizer_failures == 1
+    assert len(history.summary) <= int(history.token_budget * FALLBACK_SUMMARY_SHARE) * CHARS_PER_TOKEN
+    assert "answer" not in history.summary
+    # The newest archived question survives the cut
+    archived = history.stats.compacted_turns
+    assert f"question {archived - 1}" in history.summary
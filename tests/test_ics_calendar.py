@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+
+from src.context import CheckinSchedule
+from src.tools.ics_calendar import (
+    MAX_LINE_OCTETS,
+    CheckinCalendarWriter,
+    append_event,
+    calendar_path,
+    checkin_event_id,
+    render_event,
+    replace_event,
+)
+
+
+def schedule_for(uid: str, frequency: str = "WEEKLY", start_date: str = "2025-04-08", sequence: int = 0) -> CheckinSchedule:
+    return CheckinSchedule(event_id=checkin_event_id(uid, frequency), frequency=frequency, start_date=start_date, sequence=sequence)
+
+
+def read_calendar(path) -> str:
+    # read_text() would translate the CRLF line endings
+    return path.read_bytes().decode()
+
+
+def read_events(path) -> int:
+    return read_calendar(path).count("BEGIN:VEVENT")
+
+
+def test_replace_finds_a_folded_uid(tmp_path):
+    uid = str(uuid.uuid4())
+    path = calendar_path(uid, tmp_path)
+    schedule = schedule_for(uid)
+    # A uuid4 uid makes the UID line longer than one content line
+    assert len(f"UID:{schedule.event_id}".encode()) > MAX_LINE_OCTETS
+
+    append_event(path, "Alice", render_event(schedule, "Alice"))
+    moved = schedule_for(uid, start_date="2025-05-01", sequence=1)
+    replace_event(path, "Alice", moved.event_id, render_event(moved, "Alice"))
+
+    text = read_calendar(path)
+    assert read_events(path) == 1
+    assert "DTSTART:20250501T000000" in text and "SEQUENCE:1" in text
+    assert "DTSTART:20250408" not in text
+
+
+def test_replace_keeps_the_other_series(tmp_path):
+    uid = str(uuid.uuid4())
+    path = calendar_path(uid, tmp_path)
+    append_event(path, "Alice", render_event(schedule_for(uid, "WEEKLY"), "Alice"))
+    append_event(path, "Alice", render_event(schedule_for(uid, "DAILY"), "Alice"))
+
+    moved = schedule_for(uid, "DAILY", start_date="2025-06-01", sequence=1)
+    replace_event(path, "Alice", moved.event_id, render_event(moved, "Alice"))
+
+    text = read_calendar(path)
+    assert read_events(path) == 2
+    assert "FREQ=WEEKLY" in text and "DTSTART:20250601T000000" in text
+    assert text.endswith("END:VCALENDAR\r\n") and text.count("END:VCALENDAR") == 1
+
+
+def test_replace_appends_a_missing_event(tmp_path):
+    uid = str(uuid.uuid4())
+    path = calendar_path(uid, tmp_path)
+    append_event(path, "Alice", render_event(schedule_for(uid, "WEEKLY"), "Alice"))
+
+    monthly = schedule_for(uid, "MONTHLY")
+    replace_event(path, "Alice", monthly.event_id, render_event(monthly, "Alice"))
+
+    assert read_events(path) == 2
+
+
+def test_every_written_line_fits_the_fold_limit(tmp_path):
+    uid = str(uuid.uuid4())
+    path = calendar_path(uid, tmp_path)
+    append_event(path, "Ålice Ünicode " * 4, render_event(schedule_for(uid), "Ålice Ünicode " * 4))
+
+    assert all(len(line) <= MAX_LINE_OCTETS for line in path.read_bytes().split(b"\r\n"))
+
+
+def test_writer_upserts_one_event_per_series(tmp_path):
+    writer = CheckinCalendarWriter(tmp_path)
+    uid = str(uuid.uuid4())
+
+    async def schedule_twice():
+        await writer.upsert(uid, "Alice", schedule_for(uid), update=False)
+        return await writer.upsert(uid, "Alice", schedule_for(uid, start_date="2025-04-15", sequence=1), update=True)
+
+    path = asyncio.run(schedule_twice())
+
+    assert read_events(path) == 1
+    assert "SEQUENCE:1" in read_calendar(path)
@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import pytest
+from agents import GuardrailFunctionOutput, InputGuardrail
+from agents.exceptions import InputGuardrailTripwireTriggered
+from agents.guardrail import InputGuardrailResult
+
+from src.context import UserSessionContext
+from src.latency import BUCKETS, LatencyHistogram, SpanMetrics, StreamMetrics
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "perf_counter", lambda: now[0])
+    return now
+
+
+def test_stream_metrics_time_the_first_token_and_the_gaps(clock):
+    metrics = StreamMetrics(started_at=clock[0])
+    for delay, chunk in [(0.4, "Hello"), (0.05, " wor"), (0.15, "ld ✓")]:
+        clock[0] += delay
+        metrics.record_chunk(chunk)
+    clock[0] += 0.1
+    metrics.finish("completed")
+
+    assert metrics.time_to_first_token == pytest.approx(0.4)
+    assert metrics.gaps.count == 2 and metrics.gaps.max == pytest.approx(0.15)
+    assert metrics.duration == pytest.approx(0.7)
+    assert (metrics.chunks, metrics.bytes) == (3, len("Hello world ✓".encode()))
+    summary = metrics.as_dict()
+    assert summary["avg_inter_chunk_gap_seconds"] == pytest.approx(0.1)
+    assert summary["outcome"] == "completed"
+
+
+def test_stream_metrics_keep_the_first_outcome(clock):
+    metrics = StreamMetrics(started_at=clock[0])
+    clock[0] += 1
+    metrics.finish("cancelled")
+    clock[0] += 1
+    metrics.finish("completed")
+
+    assert metrics.outcome == "cancelled"
+    assert metrics.duration == pytest.approx(1)
+    assert metrics.time_to_first_token is None
+    assert metrics.as_dict()["avg_inter_chunk_gap_seconds"] is None
+
+
+class TrippedRun:
+    final_output = None
+
+    async def stream_events(self):
+        output = GuardrailFunctionOutput(output_info="off topic", tripwire_triggered=True)
+        guardrail = InputGuardrail(guardrail_function=lambda *args: output, name="health_input_guardrail")
+        raise InputGuardrailTripwireTriggered(InputGuardrailResult(guardrail=guardrail, output=output))
+        yield
+
+
+def test_guardrail_refusals_are_not_timed_as_model_output(monkeypatch):
+    from src import agent as agent_module
+
+    monkeypatch.setattr(agent_module.Runner, "run_streamed", lambda **kwargs: TrippedRun())
+    agent = agent_module.HealthWellnessPlannerAgent(UserSessionContext(name="Test", uid="stream-test"), speculative=False)
+
+    async def consume(stream):
+        return "".join([chunk async for chunk in stream.chunks()])
+
+    stream = agent.streaming("tell me a joke")
+    refusal = asyncio.run(consume(stream))
+
+    assert refusal.strip()
+    assert stream.metrics.outcome == "guardrail"
+    assert stream.metrics.time_to_first_token is None
+    assert (stream.metrics.chunks, stream.metrics.gaps.count) == (0, 0)
+    histograms = agent.hooks.span_metrics.histograms
+    assert ("stream", "time_to_first_token") not in histograms
+    assert histograms[("stream", "inter_chunk_gap")].count == 0
+
+
+def histogram_of(*seconds: float) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    for value in seconds:
+        histogram.observe(value)
+    return histogram
+
+
+def test_percentiles_interpolate_within_the_bucket():
+    histogram = histogram_of(0.03, 0.04, 0.07, 0.2)
+
+    # Both of the two lowest observations fall in (0.025, 0.05]
+    assert histogram.percentile(50) == pytest.approx(0.05)
+    assert histogram.percentile(25) == pytest.approx(0.0375)
+    # Never above the largest observation
+    assert histogram.percentile(99) == pytest.approx(0.2)
+    assert LatencyHistogram().percentile(95) == 0.0
+
+
+def test_percentiles_above_the_largest_bucket_use_the_maximum():
+    histogram = histogram_of(1.0, BUCKETS[-1] * 2)
+
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(100) == pytest.approx(BUCKETS[-1] * 2)
+    assert BUCKETS[-1] < histogram.percentile(75) < BUCKETS[-1] * 2
+
+
+def test_merged_histograms_match_observing_everything_once():
+    merged = histogram_of(0.03, 0.2)
+    merged.merge(histogram_of(0.07, 3.0))
+
+    assert merged == histogram_of(0.03, 0.2, 0.07, 3.0)
+    assert merged.as_dict()["p50_seconds"] == round(histogram_of(0.03, 0.07, 0.2, 3.0).percentile(50), 4)
+
+
+def test_prometheus_buckets_are_cumulative():
+    metrics = SpanMetrics()
+    for seconds in (0.03, 0.07, 0.2):
+        metrics.observe("tool", "meal_planner", seconds, tokens=10)
+    metrics.observe("tool", "meal_planner", 500.0)
+
+    lines = metrics.render_prometheus().splitlines()
+    buckets = [line for line in lines if line.startswith("health_wellness_span_duration_seconds_bucket")]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+
+    assert len(buckets) == len(BUCKETS) + 1
+    assert counts == sorted(counts)
+    assert 'le="0.05"} 1' in buckets[BUCKETS.index(0.05)]
+    assert buckets[-1] == 'health_wellness_span_duration_seconds_bucket{kind="tool",name="meal_planner",le="+Inf"} 4'
+    assert 'health_wellness_span_duration_seconds_count{kind="tool",name="meal_planner"} 4' in lines
+    assert 'health_wellness_span_tokens_total{kind="tool",name="meal_planner"} 30' in lines
+    assert "# TYPE health_wellness_span_duration_seconds histogram" in lines
+
+
+def test_prometheus_labels_are_escaped():
+    metrics = SpanMetrics()
+    metrics.observe("agent", 'Coach "Max"\\\nTriage', 0.1)
+
+    rendered = metrics.render_prometheus()
+
+    assert 'name="Coach \\"Max\\"\\\\\\nTriage"' in rendered
+    assert len(rendered.splitlines()) == len(BUCKETS) + 8
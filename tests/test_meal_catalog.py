@@ -0,0 +1,44 @@
+import pytest
+
+from src.tools.meal_catalog import DIETS, MEAL_CATALOG, MEAL_TYPES, meals_in_calorie_range, solve_weekly_meal_plan, _fits_diet
+
+
+CATALOG_BY_NAME = {meal.name: meal for meal in MEAL_CATALOG}
+
+
+@pytest.mark.parametrize("diet", DIETS)
+@pytest.mark.parametrize("calories_per_day", [1400, 1800, 2200, 2800])
+def test_weekly_plan_fits_the_diet_and_calorie_target(diet, calories_per_day):
+    plan = solve_weekly_meal_plan(diet, calories_per_day)
+
+    assert [day.day for day in plan] == list(range(1, 8))
+    for day in plan:
+        assert [meal.type for meal in day.meals] == list(MEAL_TYPES)
+        assert all(_fits_diet(CATALOG_BY_NAME[meal.name], diet) for meal in day.meals)
+        # Portions are scaled onto the target when no combination is close enough
+        assert sum(meal.calories for meal in day.meals) == pytest.approx(calories_per_day, rel=0.06)
+
+
+def test_weekly_plan_varies_across_days():
+    plan = solve_weekly_meal_plan("vegetarian", 1800)
+
+    combinations = {tuple(meal.name for meal in day.meals) for day in plan}
+    assert len(combinations) == len(plan)
+
+
+def test_weekly_plan_is_deterministic():
+    assert solve_weekly_meal_plan("pescatarian", 2000) == solve_weekly_meal_plan("pescatarian", 2000)
+
+
+@pytest.mark.parametrize("diet, calories_per_day", [("paleo", 1800), ("vegan", 0), ("vegan", -500)])
+def test_unknown_diets_and_non_positive_targets_have_no_plan(diet, calories_per_day):
+    assert solve_weekly_meal_plan(diet, calories_per_day) is None
+
+
+def test_calorie_range_lookup_returns_the_overlapping_bands():
+    found = {MEAL_CATALOG[int(index)].name for index in meals_in_calorie_range("vegan", "lunch", 420, 550)}
+    vegan_lunches = [meal for meal in MEAL_CATALOG if meal.type == "lunch" and _fits_diet(meal, "vegan")]
+
+    # Every meal in range, plus the rest of the 100-calorie bands the range touches
+    assert {meal.name for meal in vegan_lunches if 420 <= meal.calories <= 550} <= found
+    assert found == {meal.name for meal in vegan_lunches if 400 <= meal.calories < 600}
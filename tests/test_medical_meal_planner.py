@@ -0,0 +1,60 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+from agents.tool_context import ToolContext
+
+from src.cache import LRUCache
+from src.context import Meal, MealDay, MedicalMealPlan, UserSessionContext
+from src.tools.plan_cache import medical_plan_fingerprint
+
+
+# src.tools re-exports the tool under the module's name
+planner = importlib.import_module("src.tools.medical_meal_planner")
+
+
+class FakeResult:
+    def __init__(self, plan):
+        self.plan = plan
+
+
+    def final_output_as(self, output_type):
+        return self.plan
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    prompts = []
+
+    async def run(agent, input, context):
+        prompts.append(input)
+        meals = [Meal(name="Plain Rice", type=meal_type, calories=450) for meal_type in ("breakfast", "lunch", "dinner", "snacks")]
+        return FakeResult(MedicalMealPlan(days=[MealDay(day=1, meals=meals)], condition="crohn's disease"))
+
+    monkeypatch.setattr(planner.Runner, "run", run)
+    monkeypatch.setattr(planner, "medical_plan_cache", LRUCache(max_size=8))
+    monkeypatch.setattr(planner, "pending_medical_plans", LRUCache(max_size=8))
+    return prompts
+
+
+def plan_for(context: UserSessionContext, request: dict) -> dict:
+    arguments = json.dumps({"request": request})
+    return asyncio.run(planner.medical_meal_planner.on_invoke_tool(ToolContext(context=context, tool_call_id="call-1"), arguments))
+
+
+@pytest.mark.parametrize("preferences, requested, expected", [
+    ({"diet": "omnivore", "calories_per_day": 1600}, None, 1600),
+    (None, None, planner.DEFAULT_CALORIES_PER_DAY),
+    ({"diet": "omnivore", "calories_per_day": 1600}, 2400, 2400),
+])
+def test_model_plans_are_built_for_the_calories_they_are_cached_under(prompts, preferences, requested, expected):
+    context = UserSessionContext(name="Test", uid="medical-test", diet_preferences=preferences)
+    request = {"condition": "Crohn's disease", "severity": "mild", "restrictions": [], "requirements": {}, "calories_per_day": requested}
+
+    response = plan_for(context, request)
+
+    assert response["plan_source"] == "model"
+    assert f"Target Calories: {expected}\n" in prompts[0]
+    assert context.meal_plan_fingerprint == medical_plan_fingerprint("Crohn's disease", "mild", [], expected)
+    assert planner.pending_medical_plans.get(context.meal_plan_fingerprint) is not None
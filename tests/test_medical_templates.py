@@ -0,0 +1,56 @@
+import pytest
+
+from src.tools.medical_templates import CONDITION_TEMPLATES, build_template_plan, normalize_condition
+
+
+TEMPLATE_MEALS = {meal.name: meal for meals in CONDITION_TEMPLATES.values() for meal in meals}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Type 2 Diabetes", "diabetes"),
+    ("pre-diabetes", "diabetes"),
+    ("Diabetes mellitus type II", "diabetes"),
+    ("Celiac disease", "celiac"),
+    ("gluten intolerance", "celiac"),
+    ("High blood pressure", "hypertension"),
+    ("essential hypertension", "hypertension"),
+])
+def test_normalize_condition_names_one_template(text, expected):
+    assert normalize_condition(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    # Several conditions
+    "Type 2 diabetes and celiac disease",
+    "diabetes with high blood pressure",
+    # A condition the template was not vetted for
+    "hypertension with chronic kidney disease",
+    "diabetes insipidus",
+    "gestational diabetes",
+    "type 1 diabetes",
+    # Only a substring of an alias
+    "diabetesinsipidus",
+    "Crohn's disease",
+])
+def test_normalize_condition_leaves_other_conditions_to_the_agent(text):
+    assert normalize_condition(text) is None
+
+
+@pytest.mark.parametrize("condition", ["Type 2 diabetes and celiac disease", "hypertension with chronic kidney disease"])
+def test_no_template_for_combined_conditions(condition):
+    assert build_template_plan(condition, "mild", [], 2000) is None
+
+
+def test_template_plan_follows_restrictions_and_calories():
+    plan = build_template_plan("celiac disease", "moderate", ["dairy free", "no nuts"], 1800)
+
+    assert plan.condition == "celiac" and len(plan.days) == 7
+    for day in plan.days:
+        assert [meal.type for meal in day.meals] == ["breakfast", "lunch", "dinner", "snacks"]
+        assert not any({"dairy", "nuts", "gluten"} & set(TEMPLATE_MEALS[meal.name].tags) for meal in day.meals)
+        assert sum(meal.calories for meal in day.meals) == pytest.approx(1800, abs=4)
+
+
+@pytest.mark.parametrize("severity, restrictions", [("severe", []), ("mild", ["low FODMAP"])])
+def test_severe_cases_and_unknown_restrictions_go_to_the_agent(severity, restrictions):
+    assert build_template_plan("diabetes", severity, restrictions, 2000) is None
@@ -0,0 +1,106 @@
+from datetime import date
+
+import pytest
+
+from src.context import Goal, ProgressLog, ProgressUpdate, UserSessionContext
+from src.tools.progress_series import progress_series
+
+
+def day(iso: str) -> int:
+    return date.fromisoformat(iso).toordinal()
+
+
+def context_with(*updates: ProgressUpdate) -> UserSessionContext:
+    context = UserSessionContext(name="Test", uid="series-test")
+    for update in updates:
+        context.progress_logs.append(update)
+    return context
+
+
+def test_progress_log_round_trips_every_field():
+    updates = [
+        ProgressUpdate(date="2025-01-06", weight=80.4, workouts_completed=2, meals_followed=3, mood="happy", notes="felt good", sleep_hours=7.5, water_intake=2.25),
+        ProgressUpdate(date="2025-01-07"),
+        ProgressUpdate(date="last monday", weight=79.9, mood=""),
+        ProgressUpdate(date="2025-01-08T07:30:00", meals_followed=0),
+    ]
+    log = ProgressLog(updates)
+
+    assert list(log) == updates
+    assert log[-1] == updates[-1] and log[1:3] == updates[1:3]
+    assert isinstance(log[0].workouts_completed, int)
+    assert UserSessionContext.model_validate({"name": "Test", "uid": "x", "progress_logs": [update.model_dump() for update in updates]}).progress_logs[2] == updates[2]
+
+
+def test_context_dump_and_validate_keep_the_log():
+    context = context_with(ProgressUpdate(date="2025-01-06", weight=80))
+
+    restored = UserSessionContext.model_validate(context.model_dump())
+
+    assert isinstance(restored.progress_logs, ProgressLog)
+    assert restored.model_dump()["progress_logs"] == [ProgressUpdate(date="2025-01-06", weight=80).model_dump()]
+
+
+def test_weekly_rollup_totals_counts_and_averages_measurements():
+    context = context_with(
+        # Monday and Wednesday of one week, Monday of the next
+        ProgressUpdate(date="2025-01-06", workouts_completed=1, meals_followed=3, sleep_hours=7),
+        ProgressUpdate(date="2025-01-08", workouts_completed=2, sleep_hours=8),
+        ProgressUpdate(date="2025-01-13", workouts_completed=1, weight=80),
+    )
+
+    rollup = progress_series(context).weekly_rollup()
+
+    assert [row["week_start"] for row in rollup] == ["2025-01-06", "2025-01-13"]
+    assert rollup[0] == {"week_start": "2025-01-06", "entries": 2, "weight": None, "workouts": 3.0, "meals": 3.0, "sleep": 7.5, "water": None}
+    assert rollup[1]["weight"] == 80.0 and rollup[1]["workouts"] == 1.0
+
+
+def test_rolling_average_covers_the_trailing_window():
+    context = context_with(*[ProgressUpdate(date=f"2025-01-{index:02d}", sleep_hours=float(index)) for index in range(1, 11)])
+
+    averages = progress_series(context).rolling_average("sleep", window_days=3)
+
+    assert averages["2025-01-01"] == 1.0
+    assert averages["2025-01-10"] == pytest.approx((8 + 9 + 10) / 3, abs=1e-3)
+
+
+def test_weight_trend_is_fitted_in_day_order_and_skips_undated_entries():
+    context = context_with(
+        ProgressUpdate(date="2025-01-15", weight=78),
+        ProgressUpdate(date="not a date", weight=120),
+        ProgressUpdate(date="2025-01-01", weight=80),
+        ProgressUpdate(date="2025-01-08", weight=79),
+    )
+
+    trend = progress_series(context).weight_trend()
+
+    assert trend.points == 3
+    assert trend.start_day == day("2025-01-01") and trend.start_weight == 80
+    assert trend.slope_per_day == pytest.approx(-1 / 7)
+    assert trend.r_squared == pytest.approx(1)
+
+
+def test_weight_trend_needs_two_days():
+    context = context_with(ProgressUpdate(date="2025-01-01", weight=80), ProgressUpdate(date="2025-01-01", weight=79))
+
+    assert progress_series(context).weight_trend() is None
+
+
+def test_projection_against_the_goal_deadline():
+    context = context_with(*[ProgressUpdate(date=f"2025-01-{1 + 7 * week:02d}", weight=80 - 0.5 * week) for week in range(4)])
+    trend = progress_series(context).weight_trend()
+
+    on_pace = trend.project(Goal(action="lose", quantity=5, unit="kg", duration=3, timeframe_unit="months"))
+    too_fast = trend.project(Goal(action="lose", quantity=10, unit="kg", duration=4, timeframe_unit="weeks"))
+
+    assert on_pace["target_weight"] == 75 and on_pace["on_track"] is True
+    assert on_pace["projected_date"] == date.fromordinal(day("2025-01-22") + 49).isoformat()
+    assert too_fast["on_track"] is False
+
+
+def test_series_accepts_an_assigned_plain_list():
+    context = UserSessionContext(name="Test", uid="series-test")
+    context.progress_logs = [ProgressUpdate(date="2025-01-01", weight=80), ProgressUpdate(date="2025-01-02", weight=79)]
+
+    assert progress_series(context).weight_trend().points == 2
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from src.admission import FairAdmissionController, current_uid
+from src.api import server
+from src.context import UserSessionContext
+
+
+class FakeAgent:
+    def __init__(self, user: UserSessionContext):
+        self.user = user
+
+
+    async def chat(self, message: str) -> str:
+        return f"{self.user.name}: {message}"
+
+
+    def streaming(self, message: str) -> "FakeStream":
+        return FakeStream([self.user.name, message])
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+
+    async def chunks(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = server.SessionRegistry(max_sessions=2, max_waiting_turns=1)
+    monkeypatch.setattr(server, "get_session_store", lambda: None)
+    monkeypatch.setattr(server, "HealthWellnessPlannerAgent", lambda user, session_store=None: FakeAgent(user))
+    monkeypatch.setattr(server, "registry", registry)
+    return registry
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Without the lifespan, so no connections are warmed up
+    monkeypatch.setattr(server, "admission_controller", FairAdmissionController(1, 1))
+    return TestClient(server.app)
+
+
+def test_turns_run_as_the_user(registry):
+    async def scenario():
+        async with registry.turn("alice", "Alice") as agent:
+            return agent.user.name, current_uid.get()
+
+    assert asyncio.run(scenario()) == ("Alice", "alice")
+    assert current_uid.get() == "anonymous"
+
+
+def test_too_many_waiting_turns_are_rejected(registry):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with registry.turn("alice"):
+                await release.wait()
+
+        async def wait():
+            async with registry.turn("alice"):
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(wait())
+        await asyncio.sleep(0)
+
+        with pytest.raises(server.UserBusy):
+            async with registry.turn("alice"):
+                pass
+        # Other users are unaffected
+        async with registry.turn("bob"):
+            pass
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+    asyncio.run(scenario())
+
+    assert not registry._waiting
+
+
+def test_eviction_skips_users_with_a_turn_in_progress(registry):
+    async def scenario():
+        async with registry.turn("alice"):
+            async with registry.turn("bob"):
+                pass
+            async with registry.turn("carol"):
+                pass
+
+    asyncio.run(scenario())
+
+    # alice was least recently used but busy, so bob went instead
+    assert list(registry._agents) == ["alice", "carol"]
+
+
+def test_chat_replies(registry, client):
+    response = client.post("/chat", json={"uid": "alice", "message": "hi", "name": "Alice"})
+
+    assert response.status_code == 200
+    assert response.json() == {"uid": "alice", "response": "Alice: hi"}
+
+
+def test_chat_is_rejected_when_the_model_queue_is_full(registry, client):
+    server.admission_controller.waiting = 1
+
+    response = client.post("/chat", json={"uid": "alice", "message": "hi"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert server.admission_controller.stats.rejected == 1
+    assert "alice" not in registry._agents
+
+
+def test_chat_is_rejected_when_the_user_is_busy(registry, client, monkeypatch):
+    def busy(uid, name=None):
+        raise server.UserBusy(uid)
+
+    monkeypatch.setattr(registry, "turn", busy)
+
+    response = client.post("/chat", json={"uid": "alice", "message": "hi"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(server.USER_BUSY_RETRY_AFTER_SECONDS)
+
+
+def test_websocket_reports_rejections_and_keeps_the_connection(registry, client):
+    server.admission_controller.waiting = 1
+
+    with client.websocket_connect("/ws/alice") as websocket:
+        websocket.send_json({"message": "hi"})
+        first = websocket.receive_json()
+        server.admission_controller.waiting = 0
+        websocket.send_json({"message": "hi again"})
+        replies = [websocket.receive_json() for _ in range(3)]
+
+    assert first["type"] == "error" and first["status"] == 429
+    assert replies == [
+        {"type": "chunk", "text": "Friend"},
+        {"type": "chunk", "text": "hi again"},
+        {"type": "done"},
+    ]
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from src.context import UserSessionContext
+from src.session_logs import HandoffEvent, HandoffLog, RingLog
+
+
+def test_ring_log_keeps_the_tail_and_counts_everything():
+    log = RingLog(3, range(5))
+
+    assert list(log) == [2, 3, 4]
+    assert log.total == 5 and log.dropped == 2
+
+
+def test_ring_log_since_skips_evicted_entries():
+    log = RingLog(3, range(5))
+
+    assert list(log.since(0)) == [2, 3, 4]
+    assert list(log.since(3)) == [3, 4]
+    assert list(log.since(5)) == []
+
+
+def test_handoff_event_reads_legacy_strings():
+    stamp = "2025-01-02T10:30:00"
+    timestamp = int(datetime.fromisoformat(stamp).timestamp())
+
+    handoff = HandoffEvent.from_legacy("TriageAgent → NutritionExpertAgent")
+    assert (handoff.event, handoff.source, handoff.target, handoff.timestamp) == ("handoff", "TriageAgent", "NutritionExpertAgent", 0)
+
+    tool = HandoffEvent.from_legacy(f"hand_off_to_injury_support~{stamp}")
+    assert (tool.event, tool.timestamp) == ("hand_off_to_injury_support", timestamp)
+
+    plan = HandoffEvent.from_legacy(f"medical_meal_plan_created_diabetes_{stamp}")
+    assert (plan.event, plan.target, plan.timestamp) == ("medical_meal_plan_created", "diabetes", timestamp)
+
+
+def test_handoff_event_keeps_unparseable_strings_whole():
+    event = HandoffEvent.from_legacy("something~not a date")
+
+    assert (event.event, event.timestamp) == ("something~not a date", 0)
+
+
+def test_handoff_log_round_trips_through_the_context():
+    context = UserSessionContext(name="Test", uid="session-logs-test", handoff_logs=["A → B"])
+    context.handoff_logs.record("hand_off_to_x", "A", "X")
+
+    restored = UserSessionContext.model_validate(context.model_dump())
+
+    assert isinstance(restored.handoff_logs, HandoffLog)
+    assert [entry.as_dict() for entry in restored.handoff_logs] == [entry.as_dict() for entry in context.handoff_logs]
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from src.context import Goal, InjuryNote, ProgressUpdate, UserSessionContext
+from src.session_logs import HandoffLog
+from src.session_store import SessionStore, session_uid
+from src.tools.tracker import record_progress
+
+
+@pytest.fixture
+def store():
+    store = SessionStore(":memory:")
+    yield store
+    store.close()
+
+
+def new_context(uid: str = "store-test") -> UserSessionContext:
+    context = UserSessionContext(name="Alice", uid=uid)
+    context.goal = Goal(action="lose", quantity=5, unit="kg", duration=2, timeframe_unit="months")
+    record_progress(context, ProgressUpdate(date="2025-01-01", weight=80, mood="happy"))
+    context.handoff_logs.record("handoff", "Triage", "Nutrition")
+    return context
+
+
+def test_saved_session_loads_back(store):
+    context = new_context()
+    store.save_sync(context)
+
+    loaded = store.load(context.uid)
+
+    assert loaded.model_dump() == context.model_dump()
+    assert store.load("never-saved") is None
+
+
+def test_saves_only_write_what_changed(store):
+    context = new_context()
+    store.save_sync(context)
+    assert store.collect_changes(context) is None
+
+    record_progress(context, ProgressUpdate(date="2025-01-02", weight=79.5))
+    changes = store.collect_changes(context)
+
+    # The new log entry and the reassigned aggregates, nothing else
+    assert [(section, position) for section, position, _ in changes.items] == [("progress_logs", 1)]
+    assert [name for name, _ in changes.fields] == ["progress_aggregates"]
+    assert not changes.truncate
+
+
+def test_loaded_sessions_continue_incrementally(store):
+    context = new_context()
+    store.save_sync(context)
+
+    loaded = store.load(context.uid)
+    loaded.injury_notes.append(InjuryNote(injury_description="sore knee", severity_level="mild", affected_body_parts=["knee"], restrictions=[]))
+    changes = store.collect_changes(loaded)
+
+    assert [(section, position) for section, position, _ in changes.items] == [("injury_notes", 0)]
+    assert not changes.fields
+
+
+def test_replaced_list_is_rewritten(store):
+    context = new_context()
+    store.save_sync(context)
+
+    context.injury_notes = []
+    changes = store.collect_changes(context)
+
+    assert ("injury_notes", 0) in changes.truncate
+
+
+def test_failed_write_is_collected_again(store, monkeypatch):
+    context = new_context()
+    store.save_sync(context)
+    record_progress(context, ProgressUpdate(date="2025-01-02", weight=79.5))
+
+    def fail(changes):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "write", fail)
+        with pytest.raises(sqlite3.OperationalError):
+            store.save_sync(context)
+
+    changes = store.collect_changes(context)
+    assert [(section, position) for section, position, _ in changes.items] == [("progress_logs", 1)]
+
+
+def test_evicted_handoff_entries_stay_in_the_store(store):
+    context = new_context()
+    context.handoff_logs = HandoffLog(capacity=2)
+    for index in range(3):
+        context.handoff_logs.record(f"event-{index}")
+        store.save_sync(context)
+
+    assert [entry.event for entry in store.load_items(context.uid, "handoff_logs")] == ["event-0", "event-1", "event-2"]
+    loaded = store.load(context.uid)
+    assert loaded.handoff_logs.total == 3
+    assert store.collect_changes(loaded) is None
+
+
+def test_forget_starts_over(store):
+    context = new_context()
+    store.save_sync(context)
+
+    store.forget(context.uid)
+
+    changes = store.collect_changes(context)
+    assert changes is not None and changes.truncate
+
+
+def test_session_uid_is_stable_only_for_identifiers():
+    assert session_uid("alice@example.com") == session_uid(" Alice@example.com ")
+    assert session_uid("alice@example.com") != session_uid("bob@example.com")
+    assert session_uid(None) != session_uid(None)
+    assert session_uid("  ") != session_uid("  ")
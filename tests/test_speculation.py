@@ -0,0 +1,192 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrail,
+    InputGuardrailResult,
+    InputGuardrailTripwireTriggered,
+    ModelResponse,
+    RawResponsesStreamEvent,
+    RunContextWrapper,
+)
+from agents.usage import Usage
+from openai.types.responses import ResponseCompletedEvent, ResponseTextDeltaEvent
+
+from src.speculation import (
+    SpeculationGate,
+    SpeculationMetrics,
+    SpeculativeModelProvider,
+    run_input_guardrails,
+    withhold_until_verdict,
+)
+
+
+def text_delta(text: str) -> ResponseTextDeltaEvent:
+    return ResponseTextDeltaEvent.model_construct(type="response.output_text.delta", delta=text)
+
+
+def completed(total_tokens: int) -> ResponseCompletedEvent:
+    return ResponseCompletedEvent.model_construct(type="response.completed", response=SimpleNamespace(usage=SimpleNamespace(total_tokens=total_tokens)))
+
+
+class FakeModel:
+    async def get_response(self, *args, **kwargs):
+        return ModelResponse(output=[], usage=Usage(requests=1, total_tokens=42), response_id=None)
+
+
+    async def stream_response(self, *args, **kwargs):
+        for event in (text_delta("Hi"), text_delta(" there"), completed(12)):
+            yield event
+
+
+class FakeProvider:
+    def get_model(self, model_name):
+        return FakeModel()
+
+
+def gated_model(gate: SpeculationGate):
+    return SpeculativeModelProvider(gate, base_provider=FakeProvider()).get_model("fake")
+
+
+def test_response_is_held_until_the_gate_opens():
+    async def scenario():
+        gate = SpeculationGate()
+        response = asyncio.create_task(gated_model(gate).get_response())
+        await asyncio.sleep(0.01)
+        held = response.done()
+        gate.open()
+        await response
+        return gate, held
+
+    gate, held = asyncio.run(scenario())
+
+    assert not held
+    assert gate.held_tokens == 42
+    assert gate.first_output_at is not None and gate.ttft_saved > 0
+
+
+def test_open_gate_passes_responses_straight_through():
+    async def scenario():
+        gate = SpeculationGate()
+        gate.open()
+        await gated_model(gate).get_response()
+        return gate
+
+    gate = asyncio.run(scenario())
+
+    assert gate.held_tokens == 0 and gate.first_output_at is None
+
+
+def test_stream_is_held_at_the_completed_event():
+    async def scenario():
+        gate = SpeculationGate()
+        received = []
+
+        async def consume():
+            async for event in gated_model(gate).stream_response():
+                received.append(event)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        before_verdict = len(received)
+        gate.open()
+        await task
+        return gate, before_verdict, len(received)
+
+    gate, before_verdict, total = asyncio.run(scenario())
+
+    # Text deltas flow, tools and handoffs only run after the completed event
+    assert (before_verdict, total) == (2, 3)
+    assert gate.held_tokens == 12
+
+
+def guardrail(name: str, tripwire: bool, delay: float = 0.0) -> InputGuardrail:
+    async def check(context, agent, input):
+        await asyncio.sleep(delay)
+        return GuardrailFunctionOutput(output_info=name, tripwire_triggered=tripwire)
+
+    return InputGuardrail(guardrail_function=check, name=name)
+
+
+def test_run_input_guardrails_raises_on_the_first_tripwire():
+    agent = Agent(name="main", input_guardrails=[guardrail("slow", False, delay=1), guardrail("trip", True)])
+
+    async def scenario():
+        started = asyncio.get_running_loop().time()
+        with pytest.raises(InputGuardrailTripwireTriggered) as raised:
+            await run_input_guardrails(agent, "hi", RunContextWrapper(context=None))
+        return raised.value, asyncio.get_running_loop().time() - started
+
+    error, elapsed = asyncio.run(scenario())
+
+    assert error.guardrail_result.output.output_info == "trip"
+    # The slow guardrail is cancelled, not awaited
+    assert elapsed < 0.5
+
+
+def test_run_input_guardrails_returns_every_passing_result():
+    agent = Agent(name="main", input_guardrails=[guardrail("a", False), guardrail("b", False)])
+
+    results = asyncio.run(run_input_guardrails(agent, "hi", RunContextWrapper(context=None)))
+
+    assert sorted(result.output.output_info for result in results) == ["a", "b"]
+
+
+class FakeStreamedRun:
+    def __init__(self, events):
+        self.events = events
+        self.cancelled = False
+
+
+    async def stream_events(self):
+        for event in self.events:
+            await asyncio.sleep(0)
+            yield event
+
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def streamed_run() -> FakeStreamedRun:
+    return FakeStreamedRun([RawResponsesStreamEvent(data=text_delta(text)) for text in ("Hel", "lo", "!")])
+
+
+async def verdict_after(delay: float, tripwire: bool):
+    await asyncio.sleep(delay)
+    if tripwire:
+        output = GuardrailFunctionOutput(output_info="off topic", tripwire_triggered=True)
+        raise InputGuardrailTripwireTriggered(InputGuardrailResult(guardrail=guardrail("health", True), output=output))
+    return []
+
+
+def test_withheld_events_are_flushed_on_a_pass():
+    run, gate, metrics = streamed_run(), SpeculationGate(), SpeculationMetrics()
+
+    async def scenario():
+        verdict = asyncio.create_task(verdict_after(0.01, tripwire=False))
+        return [event.data.delta async for event in withhold_until_verdict(run, verdict, gate, metrics)]
+
+    assert asyncio.run(scenario()) == ["Hel", "lo", "!"]
+    assert gate.is_open and not run.cancelled
+    assert (metrics.committed, metrics.aborted) == (1, 0)
+
+
+def test_withheld_events_are_discarded_on_a_tripwire():
+    run, gate, metrics = streamed_run(), SpeculationGate(), SpeculationMetrics()
+    received = []
+
+    async def scenario():
+        verdict = asyncio.create_task(verdict_after(0.01, tripwire=True))
+        async for event in withhold_until_verdict(run, verdict, gate, metrics):
+            received.append(event)
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        asyncio.run(scenario())
+
+    assert received == []
+    assert run.cancelled and not gate.is_open
+    assert (metrics.committed, metrics.aborted, metrics.discarded_chunks) == (0, 1, 3)
@@ -0,0 +1,140 @@
+import random
+from collections import Counter
+from typing import List, Optional
+
+import pytest
+
+from src.context import Goal, ProgressAggregates, ProgressUpdate, UserSessionContext
+from src.tools.tracker import (
+    ProgressSummary,
+    add_progress_update,
+    aggregate_progress,
+    calculate_progress_summary,
+    record_progress,
+    summarize_progress,
+)
+
+
+MOODS = ["happy", "Happy ", "tired", "TIRED", "motivated", "sad", ""]
+
+
+def random_update(rng: random.Random, day: int) -> ProgressUpdate:
+    maybe = lambda value: value if rng.random() < 0.7 else None
+    return ProgressUpdate(
+        date=f"2025-{1 + day // 28:02d}-{1 + day % 28:02d}",
+        weight=maybe(round(rng.uniform(55, 110), 1)),
+        workouts_completed=maybe(rng.randint(0, 3)),
+        meals_followed=maybe(rng.randint(0, 5)),
+        mood=maybe(rng.choice(MOODS)),
+        sleep_hours=maybe(round(rng.uniform(4, 10), 1)),
+        water_intake=maybe(round(rng.uniform(0.5, 4), 1)),
+    )
+
+
+def naive_summary(logs: List[ProgressUpdate], goal: Optional[Goal]) -> ProgressSummary:
+    """The summary computed straight from the logs, independently of the aggregates."""
+
+    weights = [log.weight for log in logs if log.weight is not None]
+    sleep = [log.sleep_hours for log in logs if log.sleep_hours is not None]
+    moods = Counter(log.mood.strip().lower() for log in logs if log.mood)
+    weight_change = weights[-1] - weights[0] if len(weights) >= 2 else None
+
+    progress = None
+    if goal and weight_change and goal.quantity:
+        direction = -1 if goal.action == "lose" else 1
+        if goal.action != "maintain":
+            progress = min(100, max(0, direction * weight_change / goal.quantity * 100))
+
+    return ProgressSummary(
+        total_updates=len(logs),
+        weight_change=weight_change,
+        workouts_completed_total=sum(log.workouts_completed or 0 for log in logs),
+        meals_followed_total=sum(log.meals_followed or 0 for log in logs),
+        # Counter.most_common keeps first-seen order among ties, like max() over the tallies
+        average_mood=moods.most_common(1)[0][0] if moods else None,
+        average_sleep=sum(sleep) / len(sleep) if sleep else None,
+        progress_percentage=progress,
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("goal", [
+    None,
+    Goal(action="lose", quantity=5, unit="kg", duration=2, timeframe_unit="months"),
+    Goal(action="gain", quantity=3, unit="kg", duration=10, timeframe_unit="weeks"),
+    Goal(action="maintain", quantity=0, unit="kg", duration=3, timeframe_unit="months"),
+])
+def test_running_aggregates_match_full_recompute(seed, goal):
+    rng = random.Random(seed)
+    logs: List[ProgressUpdate] = []
+    aggregates = ProgressAggregates()
+
+    for day in range(rng.randint(0, 60)):
+        update = random_update(rng, day)
+        logs.append(update)
+        aggregates = add_progress_update(aggregates, update)
+
+        incremental = summarize_progress(aggregates, goal)
+        assert incremental == calculate_progress_summary(logs, goal)
+
+        expected = naive_summary(logs, goal)
+        assert incremental.model_dump(exclude={"average_sleep", "weight_change", "progress_percentage"}) == \
+            expected.model_dump(exclude={"average_sleep", "weight_change", "progress_percentage"})
+        assert incremental.average_sleep == pytest.approx(expected.average_sleep)
+        assert incremental.weight_change == pytest.approx(expected.weight_change)
+        assert incremental.progress_percentage == pytest.approx(expected.progress_percentage)
+
+
+def test_add_progress_update_returns_a_new_object():
+    aggregates = ProgressAggregates()
+    updated = add_progress_update(aggregates, ProgressUpdate(date="2025-01-01", weight=80, mood="happy"))
+
+    assert updated is not aggregates
+    assert aggregates.count == 0 and aggregates.mood_counts == {}
+    assert updated.count == 1 and updated.mood_counts == {"happy": 1}
+
+
+def test_record_progress_rebuilds_stale_aggregates_once():
+    context = UserSessionContext(name="Test", uid="tracker-test")
+    context.progress_logs = [ProgressUpdate(date="2025-01-01", weight=80, workouts_completed=2)]
+
+    record_progress(context, ProgressUpdate(date="2025-01-02", weight=79, workouts_completed=1))
+
+    assert context.progress_aggregates == aggregate_progress(context.progress_logs)
+    assert context.progress_aggregates.count == 2
+    assert context.progress_aggregates.workouts_total == 3
+
+
+def test_lose_goal_progress_counts_weight_lost():
+    goal = Goal(action="lose", quantity=5, unit="kg", duration=2, timeframe_unit="months")
+    logs = [ProgressUpdate(date="2025-01-01", weight=80), ProgressUpdate(date="2025-01-15", weight=78)]
+
+    summary = calculate_progress_summary(logs, goal)
+
+    assert summary.weight_change == pytest.approx(-2)
+    assert summary.progress_percentage == pytest.approx(40)
+
+
+def test_progress_against_the_goal_direction_is_zero():
+    lose = Goal(action="lose", quantity=5, unit="kg", duration=2, timeframe_unit="months")
+    gain = Goal(action="gain", quantity=5, unit="kg", duration=2, timeframe_unit="months")
+    gained = [ProgressUpdate(date="2025-01-01", weight=80), ProgressUpdate(date="2025-01-15", weight=82)]
+    lost = [ProgressUpdate(date="2025-01-01", weight=80), ProgressUpdate(date="2025-01-15", weight=70)]
+
+    assert calculate_progress_summary(gained, lose).progress_percentage == 0
+    assert calculate_progress_summary(lost, gain).progress_percentage == 0
+    # Capped once the goal is reached
+    assert calculate_progress_summary(lost, lose).progress_percentage == 100
+
+
+def test_average_mood_is_the_most_frequent_mood():
+    logs = [
+        ProgressUpdate(date="2025-01-01", mood="Happy"),
+        ProgressUpdate(date="2025-01-02", mood="tired "),
+        ProgressUpdate(date="2025-01-03", mood="TIRED"),
+        ProgressUpdate(date="2025-01-04", mood=""),
+    ]
+
+    assert calculate_progress_summary(logs).average_mood == "tired"
+    assert calculate_progress_summary(logs[:1]).average_mood == "happy"
+    assert calculate_progress_summary([]).average_mood is None
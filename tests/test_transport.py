@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src import transport
+from src.transport import PoolMetricsTransport, TransportStats
+
+
+def new_client(handler, stats):
+    return httpx.AsyncClient(transport=PoolMetricsTransport(httpx.MockTransport(handler), stats))
+
+
+def test_streamed_requests_stay_in_flight_until_closed():
+    async def body():
+        yield b"data: one\n\n"
+        yield b"data: two\n\n"
+
+    async def scenario():
+        stats = TransportStats(max_connections=4)
+        async with new_client(lambda request: httpx.Response(200, content=body()), stats) as client:
+            async with client.stream("POST", "https://model.test/v1/chat") as response:
+                in_flight_while_streaming = stats.in_flight
+                saturation_while_streaming = stats.saturation
+                await response.aread()
+        return stats, in_flight_while_streaming, saturation_while_streaming
+
+    stats, in_flight_while_streaming, saturation_while_streaming = asyncio.run(scenario())
+
+    assert in_flight_while_streaming == 1
+    assert saturation_while_streaming == 0.25
+    assert stats.in_flight == 0
+    assert stats.waiting == 0
+    assert stats.peak_in_flight == 1
+
+
+def test_abandoned_streams_are_released_on_close():
+    async def body():
+        yield b"data: one\n\n"
+        yield b"data: two\n\n"
+
+    async def scenario():
+        stats = TransportStats()
+        async with new_client(lambda request: httpx.Response(200, content=body()), stats) as client:
+            async with client.stream("POST", "https://model.test/v1/chat") as response:
+                async for _ in response.aiter_bytes():
+                    break
+        return stats
+
+    assert asyncio.run(scenario()).in_flight == 0
+
+
+def test_prebuilt_and_failed_responses_are_not_left_in_flight():
+    def failing(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    async def scenario():
+        stats = TransportStats()
+        async with new_client(lambda request: httpx.Response(200, content=b"{}"), stats) as client:
+            await client.get("https://model.test/v1/models")
+        async with new_client(failing, stats) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.get("https://model.test/v1/models")
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats.requests == 2
+    assert stats.in_flight == 0
+    assert stats.waiting == 0
+    assert stats.reused_connections == 2
+
+
+def test_trace_events_record_new_connections_and_tls_time():
+    seen_events = []
+
+    async def handler(request):
+        trace = request.extensions["trace"]
+        for event in ("connection.connect_tcp.started", "connection.start_tls.started", "connection.start_tls.complete"):
+            await trace(event, {})
+        return httpx.Response(200, content=b"{}")
+
+    async def outer_trace(event, info):
+        seen_events.append(event)
+
+    async def scenario():
+        stats = TransportStats()
+        async with new_client(handler, stats) as client:
+            await client.get("https://model.test/v1/models", extensions={"trace": outer_trace})
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats.new_connections == 1
+    assert stats.reused_connections == 0
+    assert stats.tls_handshake_seconds >= 0
+    assert stats.as_dict()["requests"] == 1
+    # Callers' own trace hooks still see every event
+    assert seen_events == ["connection.connect_tcp.started", "connection.start_tls.started", "connection.start_tls.complete"]
+
+
+def test_http2_falls_back_without_h2(monkeypatch):
+    monkeypatch.setattr(transport, "http2_available", lambda: False)
+    monkeypatch.setattr(transport, "transport_stats", TransportStats())
+
+    with pytest.warns(UserWarning, match="h2"):
+        client = transport.create_http_client(
+            transport.FairAdmissionController(1, 1),
+            max_connections=8,
+            max_keepalive_connections=4,
+            keepalive_expiry=30.0,
+            http2=True,
+            connect_timeout=1.0,
+            read_timeout=1.0,
+            write_timeout=1.0,
+            pool_timeout=1.0,
+        )
+
+    assert transport.transport_stats.max_connections == 8
+    asyncio.run(client.aclose())
@@ -0,0 +1,64 @@
+import pytest
+
+from src.context import Goal, InjuryNote
+from src.tools.workout_engine import EXERCISE_CATALOG, EXERCISES_BY_EQUIPMENT, build_workout_plan, normalize_equipment
+
+
+EXERCISES_BY_NAME = {exercise.name: exercise for exercise in EXERCISE_CATALOG}
+GOAL = Goal(action="lose", quantity=5, unit="kg", duration=2, timeframe_unit="months")
+
+
+def planned_exercises(plan):
+    return [EXERCISES_BY_NAME[item["exercise"]] for items in plan.days.values() for item in items if item["exercise"] != "Rest"]
+
+
+def knee_note(severity: str = "mild") -> InjuryNote:
+    return InjuryNote(
+        injury_description="Sore knee",
+        severity_level=severity,
+        affected_body_parts=["Knee"],
+        restrictions=["avoid high impact"],
+    )
+
+
+@pytest.mark.parametrize("equipment, expected", [
+    (["Dumbbells"], {"dumbbell"}),
+    (["a pair of dumb bells", "Pull-up bar"], {"dumbbell", "bar"}),
+    (["resistance bands", "yoga mat"], {"band", "mat"}),
+    (["a trampoline"], set()),
+    (["I have a full gym membership"], set(EXERCISES_BY_EQUIPMENT)),
+])
+def test_normalize_equipment(equipment, expected):
+    assert normalize_equipment(equipment) == frozenset(expected)
+
+
+@pytest.mark.parametrize("experience", ["beginner", "intermediate"])
+def test_plan_only_uses_available_equipment(experience):
+    plan = build_workout_plan(experience, GOAL, [], equipment=["Dumbbells"])
+
+    assert plan is not None
+    assert {exercise.equipment for exercise in planned_exercises(plan)} <= {"dumbbell", "bodyweight", "none"}
+
+
+def test_plan_without_equipment_list_can_use_the_whole_catalog():
+    plan = build_workout_plan("advance", GOAL, [])
+
+    assert {exercise.equipment for exercise in planned_exercises(plan)} - {"dumbbell", "bodyweight", "none"}
+
+
+def test_knee_injury_excludes_knee_exercises():
+    plan = build_workout_plan("beginner", GOAL, [knee_note()])
+
+    assert plan is not None
+    assert not any("knee" in exercise.contraindicated for exercise in planned_exercises(plan))
+
+
+def test_severe_injury_is_left_to_the_agent():
+    assert build_workout_plan("beginner", GOAL, [knee_note("Severe")]) is None
+
+
+def test_unknown_body_part_is_left_to_the_agent():
+    note = knee_note()
+    note.affected_body_parts = ["pinky toe nail"]
+
+    assert build_workout_plan("beginner", GOAL, [note]) is None